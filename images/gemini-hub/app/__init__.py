@@ -1,7 +1,8 @@
-from flask import Flask
 from app.config import Config
 
 def create_app():
+    # Imported here so `import app.config` stays cheap (startup profiling hooks in first)
+    from flask import Flask, jsonify
     app = Flask(__name__)
     
     # Initialize Config
@@ -13,5 +14,19 @@ def create_app():
     
     app.register_blueprint(web)
     app.register_blueprint(api, url_prefix='/api')
+
+    # Track client traffic so auto-shutdown never interrupts a user
+    from app.services.traffic import TrafficService
+    app.before_request(TrafficService.begin)
+    app.teardown_request(TrafficService.end)
+
+    # Refuse new work once a shutdown drain has started
+    from app.services.shutdown import ShutdownService
+
+    @app.before_request
+    def reject_while_stopping():
+        if ShutdownService.stopping():
+            return jsonify({"status": "error", "error": "Hub is shutting down."}), 503
+        return None
     
     return app
@@ -1,17 +1,50 @@
-from flask import Blueprint, jsonify, request
+import os
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from app.config import Config
+from app.services.admission import AdmissionService
 from app.services.filesystem import FileSystemService
+from app.services.idempotency import IdempotencyService
+from app.services.image import ImageService
 from app.services.launcher import LauncherService
+from app.services.launch_jobs import LaunchJobService
+from app.services.launch_metrics import LaunchMetricsService, LaunchTrace
+from app.services.readiness import ReadinessService
+from app.services.resources import ResourceService
 from app.services.session import SessionService
+from app.services.snapshot import SnapshotService
+from app.services.startup import StartupService
+from app.services.stop_jobs import StopJobService
+from app.services.tailscale import TailscaleService
 from app.services.discovery import DiscoveryService
+from app.models.session import GeminiSession
+from app.services.worktree import WorktreeService
 
 api = Blueprint('api', __name__)
 
 @api.route('/sessions')
 def get_sessions():
-    """Returns all discovered sessions (Unified)."""
+    """Returns all discovered sessions (Unified), or the snapshot's (`stale: true`) right after a restart."""
+    stale = SnapshotService.stale_sessions()
+    if stale is not None:
+        return jsonify(stale)
     discovery = DiscoveryService()
     return jsonify(discovery.get_sessions())
 
+@api.route('/tailscale')
+def tailscale_state():
+    """Tailnet bring-up state (the Hub serves localhost before the tailnet is up)."""
+    return jsonify(TailscaleService.state())
+
+@api.route('/startup')
+def startup_report():
+    """Boot phase timings (and per-module import times with HUB_STARTUP_PROFILE)."""
+    return jsonify(StartupService.report())
+
+@api.route('/snapshot')
+def snapshot_status():
+    """Whether the dashboard still shows the warm-start snapshot."""
+    return jsonify(SnapshotService.status())
+
 @api.route('/resolve-local-url')
 def resolve_local_url():
     hostname = request.args.get('hostname', '')
@@ -23,6 +56,23 @@ def resolve_local_url():
     session = next((s for s in sessions if s["name"] == hostname), None)
     return jsonify({"url": session.get("local_url") if session else None})
 
+@api.route('/sessions/<name>/readiness')
+def get_session_readiness(name):
+    """
+    Long-poll on the readiness of a session. Returns as soon as the state is newer
+    than `version` (or final), otherwise after `timeout` seconds (max 30).
+    """
+    if not GeminiSession.from_name(name):
+        return jsonify({"error": "Invalid session name"}), 400
+    try:
+        version = int(request.args.get('version', 0))
+        timeout = min(max(float(request.args.get('timeout', 25)), 0), 30)
+    except ValueError:
+        return jsonify({"error": "Invalid version or timeout"}), 400
+
+    ReadinessService.track(name)
+    return jsonify(ReadinessService.wait(name, version, timeout))
+
 @api.route('/roots')
 def get_roots():
     return jsonify({"roots": FileSystemService.get_roots()})
@@ -71,27 +121,86 @@ def create_directory():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@api.route('/worktrees')
+def get_worktrees():
+    """Returns the worktree inventory (served from the incremental cache)."""
+    force = request.args.get('refresh', '').lower() == 'true'
+    try:
+        return jsonify({"worktrees": WorktreeService.get_inventory(force=force)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def _launch_options(data):
+    """Maps a launch request body onto `LauncherService.launch` keyword arguments."""
+    return {
+        "project_path": data.get('project_path'),
+        "config_profile": data.get('config_profile'),
+        "session_type": data.get('session_type', 'cli'),
+        "task": data.get('task'),
+        "interactive": data.get('interactive', True),
+        "image_variant": data.get('image_variant', 'standard'),
+        "docker_enabled": data.get('docker_enabled', True),
+        "worktree_mode": data.get('worktree_mode', False),
+        "worktree_name": data.get('worktree_name'),
+        "ide_enabled": data.get('ide_enabled', True),
+        "custom_image": data.get('custom_image'),
+        "docker_args": data.get('docker_args'),
+        "resources": {k: data[k] for k in ResourceService.FIELDS if data.get(k) not in (None, "")},
+    }
+
+@api.route('/images')
+def get_images():
+    """Returns the images selectable at launch with their presence and pull progress."""
+    return jsonify({"images": ImageService.status()})
+
+@api.route('/images/pull', methods=['POST'])
+def pull_image():
+    data = request.json or {}
+    image = data.get('image')
+
+    if not image:
+        return jsonify({"error": "Image required"}), 400
+
+    ImageService.track(image)
+    started = ImageService.pull(image)
+    return jsonify({"image": image, "status": "pulling", "started": started}), 202
+
+def _idempotency_key(data):
+    """Client-supplied key identifying one launch attempt across retries."""
+    return request.headers.get('Idempotency-Key') or data.get('idempotency_key')
+
 @api.route('/launch', methods=['POST'])
 def launch():
     data = request.json or {}
-    project_path = data.get('project_path')
-    config_profile = data.get('config_profile')
-    session_type = data.get('session_type', 'cli')
-    task = data.get('task')
-    interactive = data.get('interactive', True)
-    image_variant = data.get('image_variant', 'standard')
-    docker_enabled = data.get('docker_enabled', True)
-    ide_enabled = data.get('ide_enabled', True)
-    worktree_mode = data.get('worktree_mode', False)
-    worktree_name = data.get('worktree_name')
-    custom_image = data.get('custom_image')
-    docker_args = data.get('docker_args')
+    options = _launch_options(data)
     
-    if not project_path:
+    if not options["project_path"]:
         return jsonify({"error": "Project path required"}), 400
+
+    def launch_once():
+        trace = LaunchTrace()
+        with AdmissionService.admit(timeout=Config.HUB_ADMISSION_TIMEOUT):
+            trace.mark("admission")
+            return LauncherService.launch(trace=trace, **options)
+
+    # Retries of the same launch share one execution and its result
+    fingerprint = IdempotencyService.fingerprint(options)
+
+    def in_flight():
+        return IdempotencyService.run(("launch-in-flight", fingerprint), launch_once, keep=False)
+
+    def succeeded(value):
+        # A failed launch may be retried with the same key
+        return value[0]["returncode"] == 0
         
     try:
-        result = LauncherService.launch(project_path, config_profile, session_type, task, interactive, image_variant, docker_enabled, worktree_mode, worktree_name, ide_enabled, custom_image, docker_args)
+        key = _idempotency_key(data)
+        if key:
+            (result, deduplicated), replayed = IdempotencyService.run(("launch", key), in_flight, fingerprint,
+                                                                      cache_if=succeeded)
+        else:
+            (result, deduplicated), replayed = in_flight(), False
+        result = dict(result, deduplicated=deduplicated or replayed)
         if result["returncode"] == 0:
             result["status"] = "success"
             return jsonify(result)
@@ -102,9 +211,84 @@ def launch():
             return jsonify(result), 500
     except PermissionError as e:
         return jsonify({"status": "error", "error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"status": "error", "error": str(e)}), 400
+    except TimeoutError as e:
+        return jsonify({"status": "error", "error": str(e)}), 503
     except Exception as e:
         return jsonify({"status": "error", "error": str(e)}), 500
 
+@api.route('/launch/metrics')
+def get_launch_metrics():
+    """Per-phase launch latency percentiles and histograms (successful launches)."""
+    return jsonify({"phases": LaunchMetricsService.summary()})
+
+@api.route('/launch/queue')
+def get_launch_queue():
+    """Admission state: queued and running launches, limits and host capacity."""
+    return jsonify(AdmissionService.status())
+
+@api.route('/launch/jobs', methods=['POST'])
+def start_launch_job():
+    """Starts a launch in the background; output is streamed by the job's events endpoint."""
+    data = request.json or {}
+    options = _launch_options(data)
+
+    if not options["project_path"]:
+        return jsonify({"error": "Project path required"}), 400
+    # Fail fast on the security check instead of inside the job
+    if not FileSystemService.is_safe_path(os.path.abspath(options["project_path"])):
+        return jsonify({"status": "error", "error": f"Access denied to {options['project_path']}"}), 403
+
+    try:
+        ResourceService.resolve(options["config_profile"], options["resources"])
+    except ValueError as e:
+        return jsonify({"status": "error", "error": str(e)}), 400
+
+    # A retried request gets the job of the first attempt, or the job already running the same launch
+    def start():
+        return LaunchJobService.start_once(**options)
+
+    key = _idempotency_key(data)
+    try:
+        if key:
+            (job, deduplicated), replayed = IdempotencyService.run(("job", key), start, IdempotencyService.fingerprint(options))
+        else:
+            (job, deduplicated), replayed = start(), False
+    except ValueError as e:
+        return jsonify({"status": "error", "error": str(e)}), 400
+
+    return jsonify({
+        "job_id": job.id,
+        "events_url": f"/api/launch/jobs/{job.id}/events",
+        "deduplicated": deduplicated or replayed,
+    }), 202
+
+@api.route('/launch/jobs/<job_id>')
+def get_launch_job(job_id):
+    job = LaunchJobService.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@api.route('/launch/jobs/<job_id>/events')
+def launch_job_events(job_id):
+    """Server-Sent Events stream of a launch job (resumable via Last-Event-ID)."""
+    job = LaunchJobService.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.args.get('after') or 0)
+    except ValueError:
+        after = 0
+
+    return Response(
+        stream_with_context(LaunchJobService.events(job, after)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @api.route('/sessions/stop', methods=['POST'])
 def stop_session():
     data = request.json or {}
@@ -123,3 +307,74 @@ def stop_session():
         return jsonify({"status": "error", "error": str(e)}), 403
     except Exception as e:
         return jsonify({"status": "error", "error": str(e)}), 500
+
+def _freeze_route(action):
+    data = request.json or {}
+    session_id = data.get('session_id')
+    if not session_id:
+        return jsonify({"error": "Session ID required"}), 400
+    try:
+        result = action(session_id)
+    except PermissionError as e:
+        return jsonify({"status": "error", "error": str(e)}), 403
+    return jsonify(result), 200 if result["status"] == "success" else 500
+
+@api.route('/sessions/pause', methods=['POST'])
+def pause_session():
+    """Freezes a session (docker pause): no CPU, memory and state kept."""
+    return _freeze_route(SessionService.pause)
+
+@api.route('/sessions/resume', methods=['POST'])
+def resume_session():
+    return _freeze_route(SessionService.resume)
+
+@api.route('/sessions/stop/bulk', methods=['POST'])
+def stop_sessions_bulk():
+    """
+    Stops several sessions concurrently in the background. Takes either a list of
+    `sessions` or a `filter` ({project, type, idle}); returns the job to poll.
+    """
+    data = request.json or {}
+    sessions = data.get('sessions')
+    filters = data.get('filter')
+    try:
+        grace = int(data.get('grace', Config.HUB_STOP_GRACE))
+        if not 0 <= grace <= 300:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({"error": "grace must be between 0 and 300 seconds"}), 400
+
+    if sessions is not None:
+        if not isinstance(sessions, list) or not all(isinstance(s, str) for s in sessions):
+            return jsonify({"error": "sessions must be a list of session IDs"}), 400
+    elif isinstance(filters, dict) and any(filters.get(k) not in (None, "") for k in ("project", "type", "idle")):
+        try:
+            idle = float(filters['idle']) if filters.get('idle') not in (None, "") else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "idle must be a number of seconds"}), 400
+        try:
+            sessions = SessionService.select(filters.get('project') or None, filters.get('type') or None, idle)
+        except OSError as e:
+            return jsonify({"error": f"Docker daemon unreachable: {e}"}), 503
+    else:
+        return jsonify({"error": "sessions or a filter (project, type, idle) required"}), 400
+
+    try:
+        job = StopJobService.start(sessions, grace)
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    return jsonify(dict(job.to_dict(), status_url=f"/api/sessions/stop/jobs/{job.id}")), 202
+
+@api.route('/sessions/stop/jobs/<job_id>')
+def get_stop_job(job_id):
+    """Per-session results of a bulk stop; `wait` (seconds, max 30) blocks until it is done."""
+    job = StopJobService.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown stop job"}), 404
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), 30)
+    except ValueError:
+        return jsonify({"error": "Invalid wait"}), 400
+    if wait:
+        job.wait(wait)
+    return jsonify(job.to_dict())
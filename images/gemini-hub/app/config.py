@@ -28,6 +28,15 @@ class Config:
 
     # Lifecycle
     HUB_AUTO_SHUTDOWN = os.environ.get("HUB_AUTO_SHUTDOWN", "true").lower() == "true"
+    # Idle seconds (no session, launch or client request) before the Hub exits
+    HUB_SHUTDOWN_TIMEOUT = int(os.environ.get("HUB_SHUTDOWN_TIMEOUT", "60"))
+    # Seconds a shutdown waits for requests, launches and cleanups to finish
+    HUB_SHUTDOWN_DRAIN_TIMEOUT = int(os.environ.get("HUB_SHUTDOWN_DRAIN_TIMEOUT", "30"))
+    # Warm-start snapshot in the state volume (empty = disabled)
+    HUB_SNAPSHOT_PATH = os.environ.get("HUB_SNAPSHOT_PATH", "/var/lib/tailscale/hub/snapshot.json")
+    # Auto-shutdown activity checks back off between these bounds (seconds)
+    HUB_MONITOR_MIN_INTERVAL = int(os.environ.get("HUB_MONITOR_MIN_INTERVAL", "2"))
+    HUB_MONITOR_MAX_INTERVAL = int(os.environ.get("HUB_MONITOR_MAX_INTERVAL", "30"))
     HUB_WORKTREE_PRUNE_ENABLED = os.environ.get("HUB_WORKTREE_PRUNE_ENABLED", "true").lower() == "true"
     
     # Expiry settings (days)
@@ -35,13 +44,98 @@ class Config:
     WORKTREE_EXPIRY_BRANCH = int(os.environ.get("GEMINI_WORKTREE_BRANCH_EXPIRY_DAYS", "90"))
     WORKTREE_EXPIRY_ORPHAN = int(os.environ.get("GEMINI_WORKTREE_ORPHAN_EXPIRY_DAYS", "90"))
 
+    # Prune Scheduling (seconds / percent)
+    HUB_PRUNE_INTERVAL = int(os.environ.get("HUB_PRUNE_INTERVAL", "3600"))
+    HUB_PRUNE_INITIAL_DELAY = int(os.environ.get("HUB_PRUNE_INITIAL_DELAY", "300"))
+    HUB_PRUNE_JITTER = int(os.environ.get("HUB_PRUNE_JITTER", "300"))
+    HUB_PRUNE_BUSY_RETRY = int(os.environ.get("HUB_PRUNE_BUSY_RETRY", "60"))
+    HUB_PRUNE_DISK_CHECK_INTERVAL = int(os.environ.get("HUB_PRUNE_DISK_CHECK_INTERVAL", "300"))
+    HUB_PRUNE_DISK_PRESSURE_PERCENT = int(os.environ.get("HUB_PRUNE_DISK_PRESSURE_PERCENT", "90"))
+
+    # Worktree Provisioning (off | reflink | hardlink | copy)
+    HUB_WORKTREE_PROVISION = os.environ.get("GEMINI_WORKTREE_PROVISION", "off").lower()
+
+    # Worktree Pool (entries per project / number of projects / seconds)
+    HUB_WORKTREE_POOL_SIZE = int(os.environ.get("HUB_WORKTREE_POOL_SIZE", "0"))
+    HUB_WORKTREE_POOL_PROJECTS = int(os.environ.get("HUB_WORKTREE_POOL_PROJECTS", "3"))
+    HUB_WORKTREE_POOL_REFRESH_INTERVAL = int(os.environ.get("HUB_WORKTREE_POOL_REFRESH_INTERVAL", "300"))
+
+    # Worktree Inventory (seconds)
+    HUB_WORKTREE_INVENTORY_TTL = int(os.environ.get("HUB_WORKTREE_INVENTORY_TTL", "30"))
+    HUB_WORKTREE_SIZE_TTL = int(os.environ.get("HUB_WORKTREE_SIZE_TTL", "900"))
+    HUB_SESSION_INDEX_TTL = int(os.environ.get("HUB_SESSION_INDEX_TTL", "5"))
+
     # Compatibility aliases
     WORKTREE_ROOT = _worktree_root
     
+    # Launch Engine (toolbox | native)
+    HUB_LAUNCH_ENGINE = os.environ.get("HUB_LAUNCH_ENGINE", "toolbox").lower()
+    DOCKER_SOCKET = os.environ.get("DOCKER_SOCKET", "/var/run/docker.sock")
+    HUB_LAUNCH_PLAN_TTL = int(os.environ.get("HUB_LAUNCH_PLAN_TTL", "300"))
+    HUB_LAUNCH_PLAN_CACHE_SIZE = int(os.environ.get("HUB_LAUNCH_PLAN_CACHE_SIZE", "64"))
+
+    # Streaming Launch Jobs
+    HUB_LAUNCH_OUTPUT_LINES = int(os.environ.get("HUB_LAUNCH_OUTPUT_LINES", "500"))
+    HUB_LAUNCH_JOB_TTL = int(os.environ.get("HUB_LAUNCH_JOB_TTL", "600"))
+    HUB_LAUNCH_METRICS_SAMPLES = int(os.environ.get("HUB_LAUNCH_METRICS_SAMPLES", "200"))
+
+    # Session Readiness Probing (seconds)
+    HUB_READINESS_INITIAL_DELAY = float(os.environ.get("HUB_READINESS_INITIAL_DELAY", "0.25"))
+    HUB_READINESS_MAX_DELAY = float(os.environ.get("HUB_READINESS_MAX_DELAY", "5"))
+    HUB_READINESS_TIMEOUT = int(os.environ.get("HUB_READINESS_TIMEOUT", "120"))
+    HUB_READINESS_TTL = int(os.environ.get("HUB_READINESS_TTL", "600"))
+
+    # Launch Deduplication
+    HUB_IDEMPOTENCY_TTL = int(os.environ.get("HUB_IDEMPOTENCY_TTL", "600"))
+    HUB_IDEMPOTENCY_MAX_ENTRIES = int(os.environ.get("HUB_IDEMPOTENCY_MAX_ENTRIES", "256"))
+
+    # Launch Admission (0 disables a limit)
+    HUB_MAX_CONCURRENT_LAUNCHES = int(os.environ.get("HUB_MAX_CONCURRENT_LAUNCHES", "2"))
+    HUB_MAX_SESSIONS = int(os.environ.get("HUB_MAX_SESSIONS", "0"))
+    HUB_SESSION_MEMORY_MB = int(os.environ.get("HUB_SESSION_MEMORY_MB", "1024"))
+    HUB_ADMISSION_POLL_INTERVAL = int(os.environ.get("HUB_ADMISSION_POLL_INTERVAL", "5"))
+    HUB_ADMISSION_CAPACITY_TTL = int(os.environ.get("HUB_ADMISSION_CAPACITY_TTL", "2"))
+    HUB_ADMISSION_TIMEOUT = int(os.environ.get("HUB_ADMISSION_TIMEOUT", "300"))
+
+    # Session Stop (seconds before the container is killed / parallel stops)
+    HUB_STOP_GRACE = int(os.environ.get("HUB_STOP_GRACE", "10"))
+    HUB_STOP_CONCURRENCY = int(os.environ.get("HUB_STOP_CONCURRENCY", "8"))
+
+    # Session Telemetry (live stats subscriptions; seconds between new-session scans)
+    HUB_TELEMETRY = os.environ.get("HUB_TELEMETRY", "true").lower() == "true"
+    HUB_TELEMETRY_SYNC_INTERVAL = int(os.environ.get("HUB_TELEMETRY_SYNC_INTERVAL", "10"))
+
+    # Session Activity (above either threshold between two samples = active)
+    HUB_ACTIVITY_CPU_PERCENT = float(os.environ.get("HUB_ACTIVITY_CPU_PERCENT", "5"))
+    HUB_ACTIVITY_NET_BYTES = int(os.environ.get("HUB_ACTIVITY_NET_BYTES", "2048"))
+
+    # Idle Session Policy (idle seconds before a stop per category, 0 = never)
+    HUB_IDLE_STOP_CLI = int(os.environ.get("HUB_IDLE_STOP_CLI", "0"))
+    HUB_IDLE_STOP_BASH = int(os.environ.get("HUB_IDLE_STOP_BASH", "0"))
+    HUB_IDLE_STOP_TASK = int(os.environ.get("HUB_IDLE_STOP_TASK", "0"))
+    HUB_IDLE_POLICY_INTERVAL = int(os.environ.get("HUB_IDLE_POLICY_INTERVAL", "60"))
+    # What happens to an idle session (stop | pause)
+    HUB_IDLE_ACTION = os.environ.get("HUB_IDLE_ACTION", "stop").lower()
+
+    # Image Pre-Pull
+    HUB_IMAGE_PREPULL = os.environ.get("HUB_IMAGE_PREPULL", "true").lower() == "true"
+    HUB_IMAGE_PREPULL_PREVIEW = os.environ.get("HUB_IMAGE_PREPULL_PREVIEW", "true").lower() == "true"
+    HUB_IMAGE_PULL_CONCURRENCY = int(os.environ.get("HUB_IMAGE_PULL_CONCURRENCY", "2"))
+    HUB_IMAGE_PULL_TIMEOUT = int(os.environ.get("HUB_IMAGE_PULL_TIMEOUT", "1800"))
+    HUB_IMAGE_REFRESH_INTERVAL = int(os.environ.get("HUB_IMAGE_REFRESH_INTERVAL", "1800"))
+    HUB_IMAGE_CUSTOM_MAX = int(os.environ.get("HUB_IMAGE_CUSTOM_MAX", "5"))
+
     # Security & Paths
     HOST_CONFIG_ROOT = os.environ.get("HOST_CONFIG_ROOT", "/home/gemini/.gemini")
     HOST_HOME = os.environ.get("HOST_HOME", "/home/gemini")
+
+    # Resource policies per profile (Default: HOST_CONFIG_ROOT/hub-resources.json)
+    HUB_RESOURCE_POLICIES_FILE = os.environ.get("HUB_RESOURCE_POLICIES_FILE", "")
     
+    # Startup (profile hub module imports / seconds between the server answering and background services starting)
+    HUB_STARTUP_PROFILE = os.environ.get("HUB_STARTUP_PROFILE", "false").lower() == "true"
+    HUB_BACKGROUND_START_DELAY = float(os.environ.get("HUB_BACKGROUND_START_DELAY", "1"))
+
     # Feature Flags
     HUB_NO_VPN = os.environ.get("GEMINI_HUB_NO_VPN", "false").lower() == "true"
 
@@ -16,11 +16,20 @@ class GeminiSession:
         # State (Non-exclusive)
         self.is_running = False    # Local process exists
         self.is_reachable = False  # VPN link active (remote)
+        self.is_paused = False     # Frozen locally (docker pause)
         
         # Details
         self.ip: Optional[str] = None
         self.local_url: Optional[str] = None
 
+        # Live usage (local sessions with a stats subscription)
+        self.cpu_percent: Optional[float] = None
+        self.memory_usage: Optional[int] = None
+        self.memory_limit: Optional[int] = None
+        self.net_rx_bytes: Optional[int] = None
+        self.net_tx_bytes: Optional[int] = None
+        self.uptime: Optional[int] = None
+
     @property
     def online(self) -> bool:
         """Unified status: session is active either locally or via VPN."""
@@ -34,9 +43,16 @@ class GeminiSession:
             "uid": self.uid,
             "is_running": self.is_running,
             "is_reachable": self.is_reachable,
+            "is_paused": self.is_paused,
             "online": self.is_running or self.is_reachable, # Legacy compat
             "ip": self.ip,
-            "local_url": self.local_url
+            "local_url": self.local_url,
+            "cpu_percent": self.cpu_percent,
+            "memory_usage": self.memory_usage,
+            "memory_limit": self.memory_limit,
+            "net_rx_bytes": self.net_rx_bytes,
+            "net_tx_bytes": self.net_tx_bytes,
+            "uptime": self.uptime
         }
 
     @staticmethod
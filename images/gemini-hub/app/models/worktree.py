@@ -0,0 +1,35 @@
+from typing import Dict, Any, List, Optional
+
+class Worktree:
+    """Standardized representation of an ephemeral worktree."""
+
+    def __init__(self, project: str, name: str, path: str):
+        self.project = project
+        self.name = name
+        self.path = path
+
+        # Git State: branch | headless | orphan
+        self.state = "orphan"
+        self.branch: Optional[str] = None
+        # mtime of the worktree's gitdir HEAD when the state was read (checkouts rewrite it)
+        self.head_mtime: Optional[float] = None
+
+        # Activity & Footprint
+        self.mtime: float = 0.0
+        self.size_bytes: Optional[int] = None
+        self.size_checked_at: float = 0.0
+
+        # Linked running sessions (gem-* container names)
+        self.sessions: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "project": self.project,
+            "name": self.name,
+            "path": self.path,
+            "state": self.state,
+            "branch": self.branch,
+            "last_activity": self.mtime,
+            "size_bytes": self.size_bytes,
+            "sessions": list(self.sessions)
+        }
@@ -0,0 +1,103 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import Config
+from app.services.docker_api import DockerAPI
+from app.services.telemetry import TelemetryService
+
+logger = logging.getLogger(__name__)
+
+class ActivityService:
+    """
+    Per-session activity from Docker stats samples. A session is active between
+    two samples when its CPU use or network traffic exceeds the thresholds;
+    idle time counts from the last active sample (or the first one seen). The
+    clock holds while a session is paused, so a resumed session starts fresh.
+    """
+
+    _lock = threading.Lock()
+    # name -> (sampled_at, cpu_ns, net_bytes, last_active)
+    _state: Dict[str, Tuple[float, int, int, float]] = {}
+
+    @staticmethod
+    def session_name(container: Dict[str, Any]) -> Optional[str]:
+        """The gem-* name of a /containers/json entry."""
+        return next((n.lstrip("/") for n in container.get("Names", []) if n.lstrip("/").startswith("gem-")), None)
+
+    @staticmethod
+    def _counters(stats: Dict[str, Any]) -> Tuple[int, int]:
+        """Cumulative CPU time (ns) and network bytes (rx + tx) of a stats sample."""
+        cpu = ((stats.get("cpu_stats") or {}).get("cpu_usage") or {}).get("total_usage", 0)
+        net = sum(n.get("rx_bytes", 0) + n.get("tx_bytes", 0) for n in (stats.get("networks") or {}).values())
+        return cpu, net
+
+    @staticmethod
+    def observe(name: str, stats: Dict[str, Any], now: Optional[float] = None) -> float:
+        """Records one stats sample and returns the session's idle seconds."""
+        now = time.time() if now is None else now
+        cpu, net = ActivityService._counters(stats)
+        with ActivityService._lock:
+            previous = ActivityService._state.get(name)
+            if previous is None:
+                last_active = now
+            else:
+                sampled_at, prev_cpu, prev_net, last_active = previous
+                elapsed = max(now - sampled_at, 1e-3)
+                cpu_percent = (cpu - prev_cpu) / (elapsed * 1e9) * 100
+                net_rate = (net - prev_net) / elapsed
+                if cpu_percent > Config.HUB_ACTIVITY_CPU_PERCENT or net_rate > Config.HUB_ACTIVITY_NET_BYTES:
+                    last_active = now
+            ActivityService._state[name] = (now, cpu, net, last_active)
+        return now - last_active
+
+    @staticmethod
+    def sample(containers: Optional[List[Dict[str, Any]]] = None) -> Dict[str, float]:
+        """
+        Samples every running session (`containers` is the full /containers/json
+        listing when the caller already has it) in one round and returns
+        idle seconds per name. Sessions with a live telemetry sample cost nothing;
+        the Engine API has no multi-container stats call, so the one-shot
+        requests for the others run in parallel. Paused sessions are not sampled
+        but keep their state, with the idle clock held at the listing time.
+        """
+        containers = DockerAPI.list_sessions() if containers is None else containers
+        listed = [(ActivityService.session_name(c), c) for c in containers]
+        listed = [(name, c) for name, c in listed if name]
+        named = [(name, c["Id"]) for name, c in listed if c.get("State") != "paused"]
+
+        idle: Dict[str, float] = {}
+        if named:
+            with ThreadPoolExecutor(max_workers=min(len(named), 8), thread_name_prefix="activity") as pool:
+                samples = list(pool.map(
+                    lambda item: TelemetryService.latest(item[0]) or DockerAPI.container_stats(item[1]), named))
+            now = time.time()
+            for (name, _), stats in zip(named, samples):
+                if stats:
+                    idle[name] = ActivityService.observe(name, stats, now)
+
+        now = time.time()
+        present = {name for name, _ in listed}
+        with ActivityService._lock:
+            # A frozen session uses no CPU: hold its clock instead of counting idle time
+            for name in present.difference(n for n, _ in named):
+                if name in ActivityService._state:
+                    sampled_at, cpu, net, _ = ActivityService._state[name]
+                    ActivityService._state[name] = (sampled_at, cpu, net, now)
+            # Forget sessions that are gone (a failed sample keeps the previous state)
+            for name in [n for n in ActivityService._state if n not in present]:
+                del ActivityService._state[name]
+        return idle
+
+    @staticmethod
+    def idle_seconds(name: str) -> Optional[float]:
+        """Idle time as of the last sample, None if the session was never sampled."""
+        with ActivityService._lock:
+            state = ActivityService._state.get(name)
+        return None if state is None else max(state[0] - state[3], 0.0)
+
+    @staticmethod
+    def clear() -> None:
+        with ActivityService._lock:
+            ActivityService._state.clear()
@@ -0,0 +1,188 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from app.config import Config
+from app.services.docker_api import DockerAPI
+from app.services.telemetry import TelemetryService
+
+logger = logging.getLogger(__name__)
+
+class AdmissionService:
+    """
+    Launch scheduler in front of `LauncherService`. Launches are admitted in
+    FIFO order while the host has capacity (concurrent launches, session
+    count, memory); the others wait in a queue and are re-evaluated as
+    launches finish or every HUB_ADMISSION_POLL_INTERVAL seconds.
+    """
+
+    _cond = threading.Condition()
+    _queue: deque = deque()
+    _launching = 0
+    _capacity: Optional[Dict[str, Any]] = None
+    _capacity_at = 0.0
+
+    @staticmethod
+    def _read_meminfo() -> Dict[str, int]:
+        """MemTotal/MemAvailable in bytes from /proc/meminfo."""
+        values = {}
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    key, _, rest = line.partition(":")
+                    if key in ("MemTotal", "MemAvailable"):
+                        values[key] = int(rest.split()[0]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return values
+
+    @staticmethod
+    def _read_cgroup_limit() -> Optional[int]:
+        """Remaining memory under a cgroup v2 limit, if the Hub runs inside one."""
+        try:
+            with open("/sys/fs/cgroup/memory.max") as f:
+                limit = f.read().strip()
+            if limit == "max":
+                return None
+            with open("/sys/fs/cgroup/memory.current") as f:
+                return max(0, int(limit) - int(f.read().strip()))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _sessions() -> Dict[str, Any]:
+        """Running gem-* containers and their current memory usage."""
+        containers = DockerAPI.list_sessions()
+        memory = 0
+        for container in containers:
+            name = next((n.lstrip("/") for n in container.get("Names", [])), "")
+            stats = TelemetryService.latest(name) or DockerAPI.container_stats(container["Id"])
+            if stats:
+                memory += (stats.get("memory_stats") or {}).get("usage", 0)
+        return {"count": len(containers), "memory": memory}
+
+    @staticmethod
+    def capacity(force: bool = False) -> Dict[str, Any]:
+        """Host capacity snapshot, cached for HUB_ADMISSION_CAPACITY_TTL seconds."""
+        now = time.time()
+        if not force and AdmissionService._capacity and now - AdmissionService._capacity_at < Config.HUB_ADMISSION_CAPACITY_TTL:
+            return AdmissionService._capacity
+
+        meminfo = AdmissionService._read_meminfo()
+        available = meminfo.get("MemAvailable")
+        cgroup_available = AdmissionService._read_cgroup_limit()
+        if cgroup_available is not None:
+            available = cgroup_available if available is None else min(available, cgroup_available)
+
+        try:
+            sessions = AdmissionService._sessions()
+        except OSError as e:
+            logger.debug(f"Docker daemon unreachable, session usage unknown: {e}")
+            sessions = {"count": 0, "memory": 0}
+
+        try:
+            load = os.getloadavg()[0]
+        except OSError:
+            load = None
+
+        snapshot = {
+            "cpus": os.cpu_count(),
+            "load": load,
+            "memory_total": meminfo.get("MemTotal"),
+            "memory_available": available,
+            "sessions": sessions["count"],
+            "session_memory": sessions["memory"],
+        }
+        AdmissionService._capacity, AdmissionService._capacity_at = snapshot, now
+        return snapshot
+
+    @staticmethod
+    def blocked_by(capacity: Dict[str, Any], launching: int) -> Optional[str]:
+        """Reason the next launch cannot start yet, or None if it fits."""
+        if Config.HUB_MAX_CONCURRENT_LAUNCHES > 0 and launching >= Config.HUB_MAX_CONCURRENT_LAUNCHES:
+            return "concurrent launches"
+        if Config.HUB_MAX_SESSIONS > 0 and capacity["sessions"] + launching >= Config.HUB_MAX_SESSIONS:
+            return "session limit"
+
+        reserve = Config.HUB_SESSION_MEMORY_MB * 1024 * 1024
+        available = capacity["memory_available"]
+        # Launches in flight do not show up in the host memory yet. With nothing
+        # running there is nothing to wait for, so the launch is not held back.
+        busy = launching > 0 or capacity["sessions"] > 0
+        if reserve > 0 and available is not None and busy and available - reserve * launching < reserve:
+            return "memory"
+        return None
+
+    @staticmethod
+    @contextmanager
+    def admit(on_position: Optional[Callable[[int], None]] = None, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Waits for a launch slot. `on_position` receives the 1-based queue position
+        whenever it changes, then 0 once admitted. Raises TimeoutError after `timeout`.
+        """
+        ticket = object()
+        deadline = time.time() + timeout if timeout is not None else None
+        reported = None
+        cond = AdmissionService._cond
+
+        with cond:
+            AdmissionService._queue.append(ticket)
+        try:
+            while True:
+                capacity = AdmissionService.capacity()
+                with cond:
+                    position = AdmissionService._queue.index(ticket) + 1
+                    reason = AdmissionService.blocked_by(capacity, AdmissionService._launching) if position == 1 else "queue"
+                    if reason is None:
+                        AdmissionService._queue.remove(ticket)
+                        AdmissionService._launching += 1
+                        cond.notify_all()
+                        break
+
+                    if position != reported:
+                        reported = position
+                        logger.info(f"Launch queued at position {position} ({reason}).")
+                        if on_position:
+                            on_position(position)
+
+                    wait = Config.HUB_ADMISSION_POLL_INTERVAL
+                    if deadline is not None:
+                        wait = min(wait, deadline - time.time())
+                        if wait <= 0:
+                            raise TimeoutError("Timed out waiting for host capacity")
+                    cond.wait(wait)
+        except BaseException:
+            with cond:
+                if ticket in AdmissionService._queue:
+                    AdmissionService._queue.remove(ticket)
+                    cond.notify_all()
+            raise
+
+        if on_position and reported is not None:
+            on_position(0)
+        try:
+            yield
+        finally:
+            with cond:
+                AdmissionService._launching -= 1
+                # The finished launch changed the host: next check must re-read it
+                AdmissionService._capacity = None
+                cond.notify_all()
+
+    @staticmethod
+    def status() -> Dict[str, Any]:
+        with AdmissionService._cond:
+            queued, launching = len(AdmissionService._queue), AdmissionService._launching
+        return {
+            "queued": queued,
+            "launching": launching,
+            "limits": {
+                "max_concurrent_launches": Config.HUB_MAX_CONCURRENT_LAUNCHES,
+                "max_sessions": Config.HUB_MAX_SESSIONS,
+                "session_memory_mb": Config.HUB_SESSION_MEMORY_MB,
+            },
+            "capacity": AdmissionService.capacity(),
+        }
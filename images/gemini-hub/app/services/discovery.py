@@ -47,6 +47,8 @@ class DiscoveryService:
                             existing["is_running"] = True
                         if session.is_reachable:
                             existing["is_reachable"] = True
+                        if session.is_paused:
+                            existing["is_paused"] = True
                         
                         # Recalculate online status
                         existing["online"] = existing["is_running"] or existing["is_reachable"]
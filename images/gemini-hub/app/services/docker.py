@@ -3,6 +3,7 @@ import logging
 from typing import Dict
 from app.models.session import GeminiSession
 from app.services.base import DiscoveryProvider
+from app.services.telemetry import TelemetryService
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +28,7 @@ class DockerService(DiscoveryProvider):
         sessions = {}
         try:
             # We use "docker ps" to find containers with the gem- prefix.
-            cmd = ["docker", "ps", "--format", "{{.Names}}|{{.Ports}}"]
+            cmd = ["docker", "ps", "--format", "{{.Names}}|{{.Ports}}|{{.Status}}"]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=2)
             
             if result.returncode != 0:
@@ -38,7 +39,7 @@ class DockerService(DiscoveryProvider):
                 if not line or "|" not in line:
                     continue
                 
-                name, ports_str = line.split('|', 1)
+                name, ports_str, *status = line.split('|')
                 if not name.startswith("gem-"):
                     continue
                 
@@ -48,6 +49,8 @@ class DockerService(DiscoveryProvider):
                     
                 # A container in 'docker ps' is running locally
                 session.is_running = True
+                session.is_paused = bool(status) and "(Paused)" in status[0]
+                TelemetryService.apply(session)
                 
                 # Identify port 3000 mapping
                 for part in ports_str.split(','):
@@ -0,0 +1,242 @@
+import os
+import json
+import base64
+import socket
+import logging
+import subprocess
+import http.client
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket (the Docker Engine API)."""
+
+    def __init__(self, socket_path: str, timeout: float = 30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+class DockerAPI:
+    """Minimal Docker Engine API client (stdlib only, no docker CLI process spawns)."""
+
+    @staticmethod
+    def request(method: str, path: str, body: Optional[Dict[str, Any]] = None,
+                query: Optional[Dict[str, str]] = None, timeout: float = 30) -> Tuple[int, Any]:
+        """
+        Performs one API call and returns (status, decoded JSON body or text).
+        Raises OSError if the daemon socket is unreachable.
+        """
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        payload = json.dumps(body) if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+
+        conn = UnixHTTPConnection(Config.DOCKER_SOCKET, timeout=timeout)
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            raw = response.read().decode("utf-8", errors="replace")
+        finally:
+            conn.close()
+
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = raw
+        return response.status, data
+
+    @staticmethod
+    def _error(data: Any) -> str:
+        if isinstance(data, dict):
+            return data.get("message", str(data))
+        return str(data or "").strip()
+
+    @staticmethod
+    def image_exists(image: str) -> bool:
+        status, _ = DockerAPI.request("GET", f"/images/{quote(image, safe='')}/json", timeout=5)
+        return status == 200
+
+    @staticmethod
+    def _registry_auth(name: str) -> Optional[str]:
+        """
+        X-Registry-Auth value for the registry of `name`, from a plain `auths`
+        entry of the Docker client config. None if there is none (credential
+        helpers are only reachable through the CLI).
+        """
+        first = name.split("/")[0]
+        if "/" in name and ("." in first or ":" in first or first == "localhost"):
+            hosts = {first}
+        else:
+            hosts = {"index.docker.io", "docker.io", "registry-1.docker.io"}
+
+        path = os.path.join(os.environ.get("DOCKER_CONFIG") or os.path.expanduser("~/.docker"), "config.json")
+        try:
+            with open(path) as f:
+                auths = json.load(f).get("auths") or {}
+        except (OSError, ValueError, AttributeError):
+            return None
+
+        for server, entry in auths.items():
+            if server.split("://")[-1].split("/")[0] not in hosts or not isinstance(entry, dict):
+                continue
+            if entry.get("identitytoken"):
+                creds = {"identitytoken": entry["identitytoken"], "serveraddress": server}
+            elif entry.get("auth"):
+                try:
+                    username, _, password = base64.b64decode(entry["auth"]).decode().partition(":")
+                except ValueError:
+                    continue
+                creds = {"username": username, "password": password, "serveraddress": server}
+            else:
+                continue
+            return base64.urlsafe_b64encode(json.dumps(creds).encode()).decode()
+        return None
+
+    @staticmethod
+    def _cli_pull(image: str, timeout: float) -> None:
+        """`docker pull` fallback: the CLI resolves credential helpers the API client cannot."""
+        logger.info(f"Registry refused the API pull of {image}. Retrying with the docker CLI.")
+        try:
+            result = subprocess.run(["docker", "pull", "-q", image], capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise RuntimeError(f"Failed to pull image '{image}': {e}")
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to pull image '{image}': {result.stderr.strip()}")
+
+    @staticmethod
+    def pull(image: str, timeout: float = 600, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        """
+        Pulls an image. The API streams one JSON progress event per line and the
+        pull is complete at the end of the stream; each event is passed to
+        `on_progress` as it arrives. Credentials come from the `auths` of the
+        Docker client config; if the registry still refuses (401/404, e.g.
+        credentials held by a credential helper), `docker pull` is used instead,
+        without progress events.
+        """
+        name, _, tag = image.rpartition(":")
+        if not name or "/" in tag:
+            name, tag = image, "latest"
+
+        auth = DockerAPI._registry_auth(name)
+        headers = {"X-Registry-Auth": auth} if auth else {}
+        conn = UnixHTTPConnection(Config.DOCKER_SOCKET, timeout=timeout)
+        try:
+            conn.request("POST", f"/images/create?{urlencode({'fromImage': name, 'tag': tag})}", headers=headers)
+            response = conn.getresponse()
+            if response.status in (401, 404):
+                response.read()
+                DockerAPI._cli_pull(image, timeout)
+                return
+            if response.status != 200:
+                raw = response.read().decode("utf-8", errors="replace")
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = raw
+                raise RuntimeError(f"Failed to pull image '{image}': {DockerAPI._error(data)}")
+
+            # Errors during the pull are reported in-band on the progress stream
+            for line in response:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if "error" in event:
+                    raise RuntimeError(f"Failed to pull image '{image}': {event['error']}")
+                if on_progress:
+                    on_progress(event)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def create_container(name: str, config: Dict[str, Any]) -> str:
+        status, data = DockerAPI.request("POST", "/containers/create", body=config, query={"name": name})
+        if status != 201:
+            raise RuntimeError(f"Failed to create container '{name}': {DockerAPI._error(data)}")
+        return data["Id"]
+
+    @staticmethod
+    def start_container(container_id: str) -> None:
+        status, data = DockerAPI.request("POST", f"/containers/{container_id}/start")
+        if status not in (204, 304):
+            raise RuntimeError(f"Failed to start container: {DockerAPI._error(data)}")
+
+    @staticmethod
+    def inspect_container(container_id: str) -> Optional[Dict[str, Any]]:
+        status, data = DockerAPI.request("GET", f"/containers/{container_id}/json", timeout=5)
+        return data if status == 200 else None
+
+    @staticmethod
+    def remove_container(container_id: str, force: bool = True) -> None:
+        try:
+            DockerAPI.request("DELETE", f"/containers/{container_id}", query={"force": str(force).lower()})
+        except OSError as e:
+            logger.warning(f"Failed to remove container {container_id}: {e}")
+
+    @staticmethod
+    def list_sessions() -> List[Dict[str, Any]]:
+        """Running gem-* containers (the name filter is a substring match, so re-check the prefix)."""
+        status, containers = DockerAPI.request(
+            "GET", "/containers/json", query={"filters": json.dumps({"name": ["gem-"]})}, timeout=5)
+        if status != 200 or not isinstance(containers, list):
+            return []
+        return [c for c in containers if any(n.lstrip("/").startswith("gem-") for n in c.get("Names", []))]
+
+    @staticmethod
+    def container_stats(container_id: str) -> Optional[Dict[str, Any]]:
+        """Single stats sample; one-shot skips the second sample the daemon otherwise waits for."""
+        status, stats = DockerAPI.request(
+            "GET", f"/containers/{container_id}/stats", query={"stream": "false", "one-shot": "true"}, timeout=5)
+        return stats if status == 200 and isinstance(stats, dict) else None
+
+    @staticmethod
+    def stream_stats(container_id: str, on_stats: Callable[[Dict[str, Any]], None], timeout: float = 30) -> None:
+        """
+        Follows the container's stats stream (one JSON sample per second) and
+        passes each sample to `on_stats`. Returns when the container stops.
+        """
+        conn = UnixHTTPConnection(Config.DOCKER_SOCKET, timeout=timeout)
+        try:
+            conn.request("GET", f"/containers/{container_id}/stats?stream=true")
+            response = conn.getresponse()
+            if response.status != 200:
+                raw = response.read().decode("utf-8", errors="replace")
+                raise RuntimeError(f"Failed to stream stats of '{container_id}': {raw.strip()}")
+            for line in response:
+                try:
+                    stats = json.loads(line)
+                except ValueError:
+                    continue
+                on_stats(stats)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def stop_container(container_id: str, grace: int = 10) -> None:
+        """Stops a container, killing it after `grace` seconds. Raises RuntimeError or OSError."""
+        # The daemon answers only once the container is down
+        status, data = DockerAPI.request(
+            "POST", f"/containers/{container_id}/stop", query={"t": str(grace)}, timeout=grace + 15)
+        if status not in (204, 304):
+            raise RuntimeError(f"Failed to stop container '{container_id}': {DockerAPI._error(data)}")
+
+    @staticmethod
+    def pause_container(container_id: str) -> None:
+        """Freezes every process of the container (cgroup freezer). Raises RuntimeError or OSError."""
+        status, data = DockerAPI.request("POST", f"/containers/{container_id}/pause", timeout=10)
+        if status != 204:
+            raise RuntimeError(f"Failed to pause container '{container_id}': {DockerAPI._error(data)}")
+
+    @staticmethod
+    def unpause_container(container_id: str) -> None:
+        status, data = DockerAPI.request("POST", f"/containers/{container_id}/unpause", timeout=10)
+        if status != 204:
+            raise RuntimeError(f"Failed to resume container '{container_id}': {DockerAPI._error(data)}")
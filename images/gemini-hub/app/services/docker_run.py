@@ -0,0 +1,150 @@
+import re
+from typing import Any, Dict, List, Mapping, Tuple
+
+# `docker run` options understood by the translator, by arity.
+# Anything else makes the translation fail so callers can fall back to the CLI.
+VALUE_OPTIONS = {
+    "--name": "name", "--network": "network", "--net": "network",
+    "-v": "volume", "--volume": "volume", "-e": "env", "--env": "env",
+    "-w": "workdir", "--workdir": "workdir", "--cap-add": "cap_add",
+    "--device": "device", "-p": "publish", "--publish": "publish",
+    "--entrypoint": "entrypoint", "-l": "label", "--label": "label",
+    "-u": "user", "--user": "user", "-m": "memory", "--memory": "memory",
+    "--cpus": "cpus", "--cpuset-cpus": "cpuset", "--blkio-weight": "blkio_weight", "--add-host": "add_host", "-h": "hostname", "--hostname": "hostname",
+}
+FLAG_OPTIONS = {
+    "--rm": "rm", "-d": "detach", "--detach": "detach", "-i": "interactive",
+    "--interactive": "interactive", "-t": "tty", "--tty": "tty", "-it": "it",
+    "--init": "init", "--read-only": "read_only",
+}
+
+_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+def parse_memory(value: str) -> int:
+    """Parses a docker memory size ('512m', '2g') into bytes."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([bkmg]?)", value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid memory size: {value}")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+def _publish(spec: str, exposed: Dict[str, Any], bindings: Dict[str, List[Dict[str, str]]]) -> None:
+    """ip:host:container[/proto] | host:container[/proto] | container[/proto]"""
+    spec, _, proto = spec.partition("/")
+    parts = spec.rsplit(":", 2)
+    if len(parts) == 3:
+        host_ip, host_port, container_port = parts
+    elif len(parts) == 2:
+        host_ip, (host_port, container_port) = "", parts
+    else:
+        host_ip, host_port, container_port = "", "", parts[0]
+
+    key = f"{container_port}/{proto or 'tcp'}"
+    exposed[key] = {}
+    bindings.setdefault(key, []).append({"HostIp": host_ip, "HostPort": host_port})
+
+def to_container_config(args: List[str], environ: Mapping[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Translates the arguments of `docker run` (without the `run` verb) into a
+    (container name, Engine API create body) tuple. `--env NAME` without a
+    value is resolved from `environ`, like the docker CLI does.
+    Raises NotImplementedError for options the translator does not support.
+    """
+    options: Dict[str, List[str]] = {}
+    flags = set()
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if not arg.startswith("-") or arg == "-":
+            break
+        if arg == "--":
+            i += 1
+            break
+
+        opt, eq, inline = arg.partition("=") if arg.startswith("--") else (arg, "", "")
+        if opt in FLAG_OPTIONS and not eq:
+            flags.add(FLAG_OPTIONS[opt])
+            i += 1
+        elif opt in VALUE_OPTIONS:
+            if eq:
+                value = inline
+                i += 1
+            else:
+                if i + 1 >= len(args):
+                    raise ValueError(f"Option {opt} requires a value")
+                value = args[i + 1]
+                i += 2
+            options.setdefault(VALUE_OPTIONS[opt], []).append(value)
+        else:
+            raise NotImplementedError(f"Unsupported docker run option: {arg}")
+
+    if i >= len(args):
+        raise ValueError("Image name required")
+    image, command = args[i], args[i + 1:]
+
+    env = []
+    for item in options.get("env", []):
+        if "=" in item:
+            env.append(item)
+        elif item in environ:
+            env.append(f"{item}={environ[item]}")
+
+    labels = {}
+    for item in options.get("label", []):
+        key, _, value = item.partition("=")
+        labels[key] = value
+
+    devices = []
+    for item in options.get("device", []):
+        parts = item.split(":")
+        devices.append({
+            "PathOnHost": parts[0],
+            "PathInContainer": parts[1] if len(parts) > 1 else parts[0],
+            "CgroupPermissions": parts[2] if len(parts) > 2 else "rwm",
+        })
+
+    exposed: Dict[str, Any] = {}
+    bindings: Dict[str, List[Dict[str, str]]] = {}
+    for item in options.get("publish", []):
+        _publish(item, exposed, bindings)
+
+    host_config: Dict[str, Any] = {
+        "Binds": options.get("volume", []),
+        "NetworkMode": options.get("network", ["default"])[-1],
+        "CapAdd": options.get("cap_add", []),
+        "Devices": devices,
+        "PortBindings": bindings,
+        "ExtraHosts": options.get("add_host", []),
+        "AutoRemove": "rm" in flags,
+        "Init": "init" in flags,
+        "ReadonlyRootfs": "read_only" in flags,
+    }
+    if "memory" in options:
+        host_config["Memory"] = parse_memory(options["memory"][-1])
+    if "cpus" in options:
+        host_config["NanoCpus"] = int(float(options["cpus"][-1]) * 1e9)
+    if "cpuset" in options:
+        host_config["CpusetCpus"] = options["cpuset"][-1]
+    if "blkio_weight" in options:
+        host_config["BlkioWeight"] = int(options["blkio_weight"][-1])
+
+    config: Dict[str, Any] = {
+        "Image": image,
+        "Cmd": command or None,
+        "Env": env,
+        "Labels": labels,
+        "ExposedPorts": exposed,
+        "OpenStdin": bool(flags & {"interactive", "it"}),
+        "Tty": bool(flags & {"tty", "it"}),
+        "HostConfig": host_config,
+    }
+    if "entrypoint" in options:
+        config["Entrypoint"] = [options["entrypoint"][-1]]
+    if "workdir" in options:
+        config["WorkingDir"] = options["workdir"][-1]
+    if "user" in options:
+        config["User"] = options["user"][-1]
+    if "hostname" in options:
+        config["Hostname"] = options["hostname"][-1]
+
+    return options.get("name", [""])[-1], config
@@ -0,0 +1,99 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+class _Entry:
+    def __init__(self, fingerprint: Optional[Tuple]):
+        self.fingerprint = fingerprint
+        self.created_at = time.time()
+        self.done = threading.Event()
+        self.failed = False
+        self.value: Any = None
+
+class IdempotencyService:
+    """
+    Bounded TTL store that runs a computation once per key. Concurrent callers
+    with the same key wait for the first one and share its value; later callers
+    get the stored value until it expires. Failed computations are not stored,
+    nor are values the caller's `cache_if` rejects.
+    """
+
+    _lock = threading.Lock()
+    _entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+
+    @staticmethod
+    def fingerprint(options: Dict[str, Any]) -> Tuple:
+        """Identity of a launch: what it runs, where, and in which worktree."""
+        return (
+            os.path.realpath(options.get("project_path") or ""),
+            bool(options.get("worktree_mode")), options.get("worktree_name") or None,
+            options.get("task") or None, options.get("session_type"),
+            options.get("config_profile") or None, options.get("custom_image") or options.get("image_variant"),
+        )
+
+    @staticmethod
+    def _expire() -> None:
+        """Drops expired and excess completed entries. Caller holds the lock."""
+        entries = IdempotencyService._entries
+        cutoff = time.time() - Config.HUB_IDEMPOTENCY_TTL
+        for key in [k for k, e in entries.items() if e.done.is_set() and e.created_at < cutoff]:
+            del entries[key]
+        # Oldest first; in-flight entries are never evicted
+        for key in [k for k, e in entries.items() if e.done.is_set()]:
+            if len(entries) <= Config.HUB_IDEMPOTENCY_MAX_ENTRIES:
+                break
+            del entries[key]
+
+    @staticmethod
+    def run(key: Hashable, compute: Callable[[], Any], fingerprint: Optional[Tuple] = None,
+            keep: bool = True, cache_if: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool]:
+        """
+        Returns (value, reused). With `keep=False`, or if `cache_if(value)` is
+        false, the entry only lives while the computation runs (in-flight
+        deduplication). Raises ValueError if the key was used for a different
+        `fingerprint`.
+        """
+        while True:
+            with IdempotencyService._lock:
+                IdempotencyService._expire()
+                entry = IdempotencyService._entries.get(key)
+                if entry is None:
+                    entry = _Entry(fingerprint)
+                    IdempotencyService._entries[key] = entry
+                    owner = True
+                else:
+                    owner = False
+                    if fingerprint is not None and entry.fingerprint != fingerprint:
+                        raise ValueError("Idempotency key was already used for a different launch")
+
+            if owner:
+                try:
+                    entry.value = compute()
+                except BaseException:
+                    entry.failed = True
+                    with IdempotencyService._lock:
+                        IdempotencyService._entries.pop(key, None)
+                    raise
+                finally:
+                    if not entry.failed and not (keep and (cache_if is None or cache_if(entry.value))):
+                        with IdempotencyService._lock:
+                            IdempotencyService._entries.pop(key, None)
+                    entry.done.set()
+                return entry.value, False
+
+            entry.done.wait()
+            if not entry.failed:
+                logger.info(f"Deduplicated launch request ({key}).")
+                return entry.value, True
+            # The first attempt failed: retry as a fresh request
+
+    @staticmethod
+    def clear() -> None:
+        with IdempotencyService._lock:
+            IdempotencyService._entries.clear()
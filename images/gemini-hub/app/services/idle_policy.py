@@ -0,0 +1,91 @@
+import time
+import logging
+import threading
+from typing import Any, Dict, List
+from app.config import Config
+from app.models.session import GeminiSession
+from app.services.activity import ActivityService
+from app.services.docker_api import DockerAPI
+from app.services.session import SessionService
+from app.services.shutdown import ShutdownService
+from app.services.stop_jobs import StopJobService
+
+logger = logging.getLogger(__name__)
+
+class IdlePolicyService:
+    """
+    Background policy that stops (or pauses, with HUB_IDLE_ACTION=pause) gem-*
+    sessions idle for longer than the threshold of their category: interactive
+    CLI, bash, or autonomous task (`-p`). Paused sessions are left alone.
+    """
+
+    CATEGORIES = ("cli", "bash", "task")
+
+    @staticmethod
+    def thresholds() -> Dict[str, int]:
+        """Idle seconds before a stop, per category (0 = never)."""
+        return {
+            "cli": Config.HUB_IDLE_STOP_CLI,
+            "bash": Config.HUB_IDLE_STOP_BASH,
+            "task": Config.HUB_IDLE_STOP_TASK,
+        }
+
+    @staticmethod
+    def start():
+        """Launch the policy thread if any category has a threshold."""
+        active = {k: v for k, v in IdlePolicyService.thresholds().items() if v > 0}
+        if not active:
+            logger.debug("Idle session policy disabled.")
+            return
+
+        logger.info(f"Idle session policy started (Action: {Config.HUB_IDLE_ACTION}, Thresholds: {active}, Interval: {Config.HUB_IDLE_POLICY_INTERVAL}s).")
+        thread = threading.Thread(target=IdlePolicyService._policy_loop, daemon=True)
+        thread.start()
+
+    @staticmethod
+    def _policy_loop():
+        while True:
+            if ShutdownService.stopping():
+                return
+            try:
+                IdlePolicyService.enforce()
+            except OSError as e:
+                logger.debug(f"Docker daemon unreachable, skipping idle policy: {e}")
+            except Exception as e:
+                logger.error(f"Idle policy error: {e}")
+            time.sleep(Config.HUB_IDLE_POLICY_INTERVAL)
+
+    @staticmethod
+    def category(container: Dict[str, Any]) -> str:
+        """Session category from the container name and command."""
+        session = GeminiSession.from_name(ActivityService.session_name(container) or "")
+        if session and session.session_type == "bash":
+            return "bash"
+        # Autonomous non-interactive tasks run as `gemini ... -p <task>`
+        if {"-p", "--prompt"} & set((container.get("Command") or "").split()):
+            return "task"
+        return "cli"
+
+    @staticmethod
+    def enforce() -> List[str]:
+        """One policy round: samples activity and stops or pauses the sessions past their threshold."""
+        thresholds = IdlePolicyService.thresholds()
+        containers = DockerAPI.list_sessions()
+        # Frozen sessions are left out of the result (they would always look idle)
+        idle = ActivityService.sample(containers)
+
+        expired = []
+        for container in containers:
+            name = ActivityService.session_name(container)
+            category = IdlePolicyService.category(container)
+            limit = thresholds[category]
+            if name in idle and limit > 0 and idle[name] >= limit:
+                logger.warning(f"Idle {category} session {name} ({Config.HUB_IDLE_ACTION}): idle for {idle[name]:.0f}s (limit {limit}s).")
+                expired.append(name)
+
+        if expired and Config.HUB_IDLE_ACTION == "pause":
+            for name in expired:
+                SessionService.pause(name)
+        elif expired:
+            StopJobService.start(expired, Config.HUB_STOP_GRACE)
+        return expired
@@ -0,0 +1,201 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import Config
+from app.services.docker_api import DockerAPI
+from app.services.native_launcher import NativeLauncherService
+
+logger = logging.getLogger(__name__)
+
+class ImageService:
+    """
+    Tracks the images the launch form can select (standard and preview
+    variants, recently used custom images) and pre-pulls the missing ones in
+    the background so launches never pull inline. With
+    HUB_IMAGE_PREPULL_PREVIEW=false the preview variant is only pre-pulled once
+    it has been launched.
+    """
+
+    VARIANTS = ("standard", "preview")
+
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    _custom: "OrderedDict[str, None]" = OrderedDict()
+    _state: Dict[str, Dict[str, Any]] = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+    _preview_used = False
+    # (toolbox HEAD stamp, variant image -> variant), reused until HEAD moves or a refresh
+    _variants: Optional[Tuple[Any, Dict[str, str]]] = None
+
+    @staticmethod
+    def start():
+        """Launch the background pre-pull thread."""
+        if not Config.HUB_IMAGE_PREPULL:
+            logger.debug("Image pre-pull disabled.")
+            return
+
+        logger.info(f"Image pre-pull started (Concurrency: {Config.HUB_IMAGE_PULL_CONCURRENCY}).")
+        thread = threading.Thread(target=ImageService._refresh_loop, daemon=True)
+        thread.start()
+
+    @staticmethod
+    def _refresh_loop():
+        """Checks tracked images at startup, when a new one is tracked and periodically."""
+        while True:
+            try:
+                ImageService.refresh()
+            except Exception as e:
+                logger.error(f"Image pre-pull error: {e}")
+            ImageService._wakeup.wait(Config.HUB_IMAGE_REFRESH_INTERVAL)
+            ImageService._wakeup.clear()
+
+    @staticmethod
+    def _head_stamp() -> Any:
+        """Changes whenever the toolbox checkout switches branch (stat only)."""
+        repo_root = NativeLauncherService.toolbox_checkout(os.environ)
+        if not repo_root:
+            return None
+        try:
+            return os.stat(os.path.join(repo_root, ".git", "HEAD")).st_mtime
+        except OSError:
+            return repo_root
+
+    @staticmethod
+    def _resolve_variants(fresh: bool = False) -> Dict[str, str]:
+        """Variant images as resolved by the native engine (git and daemon lookups), memoised per toolbox HEAD."""
+        stamp = ImageService._head_stamp()
+        with ImageService._lock:
+            cached = ImageService._variants
+        if not fresh and cached and cached[0] == stamp:
+            return dict(cached[1])
+
+        images: Dict[str, str] = {}
+        for variant in ImageService.VARIANTS:
+            try:
+                image = NativeLauncherService.resolve_image(variant, "", os.environ)
+            except Exception as e:
+                logger.debug(f"Could not resolve {variant} image: {e}")
+                continue
+            images.setdefault(image, variant)
+        with ImageService._lock:
+            ImageService._variants = (stamp, images)
+        return dict(images)
+
+    @staticmethod
+    def tracked(fresh: bool = False) -> Dict[str, str]:
+        """
+        Selectable images mapped to their source (variant name or 'custom').
+        `fresh` re-resolves the variants (a local build may have appeared).
+        """
+        images = ImageService._resolve_variants(fresh)
+
+        with ImageService._lock:
+            for image in ImageService._custom:
+                images.setdefault(image, "custom")
+        return images
+
+    @staticmethod
+    def track(image: str) -> None:
+        """Remembers a custom image (most recent HUB_IMAGE_CUSTOM_MAX) and schedules a check."""
+        if not image:
+            return
+        with ImageService._lock:
+            ImageService._custom[image] = None
+            ImageService._custom.move_to_end(image)
+            while len(ImageService._custom) > Config.HUB_IMAGE_CUSTOM_MAX:
+                ImageService._custom.popitem(last=False)
+        ImageService._wakeup.set()
+
+    @staticmethod
+    def track_preview() -> None:
+        """Keeps the preview variant pulled from now on (it has been launched)."""
+        if not ImageService._preview_used:
+            ImageService._preview_used = True
+            ImageService._wakeup.set()
+
+    @staticmethod
+    def _set_state(image: str, **state) -> None:
+        with ImageService._lock:
+            ImageService._state[image] = dict(state, updated_at=time.time())
+
+    @staticmethod
+    def refresh() -> None:
+        """
+        Records the presence of every tracked image and pulls the missing ones
+        (the preview variant with HUB_IMAGE_PREPULL_PREVIEW or once launched).
+        """
+        for image, source in ImageService.tracked(fresh=True).items():
+            with ImageService._lock:
+                if ImageService._state.get(image, {}).get("status") == "pulling":
+                    continue
+            try:
+                present = DockerAPI.image_exists(image)
+            except OSError as e:
+                logger.debug(f"Docker daemon unreachable, skipping image refresh: {e}")
+                return
+
+            if present:
+                ImageService._set_state(image, status="present")
+            elif source != "preview" or Config.HUB_IMAGE_PREPULL_PREVIEW or ImageService._preview_used:
+                ImageService.pull(image)
+
+    @staticmethod
+    def pull(image: str) -> bool:
+        """Schedules a background pull. Returns False if one is already running."""
+        with ImageService._lock:
+            if ImageService._state.get(image, {}).get("status") == "pulling":
+                return False
+            ImageService._state[image] = {"status": "pulling", "progress": {"current": 0, "total": 0}, "updated_at": time.time()}
+            if ImageService._executor is None:
+                ImageService._executor = ThreadPoolExecutor(
+                    max_workers=Config.HUB_IMAGE_PULL_CONCURRENCY, thread_name_prefix="image-pull")
+            executor = ImageService._executor
+
+        executor.submit(ImageService._pull, image)
+        return True
+
+    @staticmethod
+    def _pull(image: str) -> None:
+        logger.info(f"Pre-pulling image {image}...")
+        layers: Dict[str, List[int]] = {}
+
+        def on_progress(event: Dict[str, Any]) -> None:
+            layer = event.get("id")
+            detail = event.get("progressDetail") or {}
+            if not layer or event.get("status", "").startswith("Pulling from"):
+                return
+            current, total = layers.setdefault(layer, [0, 0])
+            if detail.get("total"):
+                current, total = detail.get("current", 0), detail["total"]
+            if event.get("status") in ("Download complete", "Pull complete", "Already exists"):
+                current = total
+            layers[layer] = [current, total]
+            ImageService._set_state(image, status="pulling", progress={
+                "current": sum(c for c, _ in layers.values()),
+                "total": sum(t for _, t in layers.values()),
+                "layers": len(layers),
+            })
+
+        try:
+            DockerAPI.pull(image, timeout=Config.HUB_IMAGE_PULL_TIMEOUT, on_progress=on_progress)
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"Pre-pull of {image} failed: {e}")
+            ImageService._set_state(image, status="error", error=str(e))
+            return
+
+        logger.info(f"Image {image} is ready.")
+        ImageService._set_state(image, status="present")
+
+    @staticmethod
+    def status() -> List[Dict[str, Any]]:
+        """Tracked images with their last known state ('unknown' until first checked)."""
+        images = ImageService.tracked()
+        with ImageService._lock:
+            return [
+                dict(ImageService._state.get(image, {"status": "unknown"}), image=image, source=source)
+                for image, source in images.items()
+            ]
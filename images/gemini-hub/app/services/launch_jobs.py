@@ -0,0 +1,167 @@
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.config import Config
+from app.services.admission import AdmissionService
+from app.services.idempotency import IdempotencyService
+from app.services.launch_metrics import LaunchTrace
+from app.services.launcher import LauncherService
+
+logger = logging.getLogger(__name__)
+
+class LaunchJob:
+    """
+    One asynchronous launch. Output lines are numbered and kept in a bounded
+    ring buffer so late subscribers can catch up on the most recent lines.
+    """
+
+    def __init__(self, job_id: str, fingerprint: Optional[Tuple] = None):
+        self.id = job_id
+        self.fingerprint = fingerprint
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.queue_position = 0
+        self._seq = 0
+        self._lines: deque = deque(maxlen=Config.HUB_LAUNCH_OUTPUT_LINES)
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def append(self, line: str) -> None:
+        with self._cond:
+            self._seq += 1
+            self._lines.append((self._seq, line))
+            self._cond.notify_all()
+
+    def set_position(self, position: int) -> None:
+        """Admission queue position (0 once the launch is running)."""
+        with self._cond:
+            self.queue_position = position
+            self._cond.notify_all()
+
+    def finish(self, result: Dict[str, Any]) -> None:
+        with self._cond:
+            self.result = result
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def wait(self, after: int, timeout: float, position: int = 0) -> Tuple[List[Tuple[int, str]], bool, int]:
+        """
+        Blocks until lines newer than `after` exist, the queue position differs from
+        `position`, the job finishes or the timeout elapses.
+        Returns (new lines still in the buffer, done, queue position).
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._seq > after or self.done or self.queue_position != position, timeout=timeout)
+            return [entry for entry in self._lines if entry[0] > after], self.done, self.queue_position
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.done:
+            status = "done"
+        else:
+            status = "queued" if self.queue_position else "running"
+        return {"job_id": self.id, "status": status, "queue_position": self.queue_position, "result": self.result}
+
+class LaunchJobService:
+    """Runs launches in the background and streams their output to subscribers."""
+
+    _lock = threading.Lock()
+    _start_lock = threading.Lock()
+    _jobs: Dict[str, LaunchJob] = {}
+
+    @staticmethod
+    def _expire() -> None:
+        """Drops finished jobs older than HUB_LAUNCH_JOB_TTL. Caller holds the lock."""
+        cutoff = time.time() - Config.HUB_LAUNCH_JOB_TTL
+        for job_id in [j.id for j in LaunchJobService._jobs.values() if j.done and j.finished_at < cutoff]:
+            del LaunchJobService._jobs[job_id]
+
+    @staticmethod
+    def start(_fingerprint: Optional[Tuple] = None, **launch_args) -> LaunchJob:
+        """Starts `LauncherService.launch(**launch_args)` in a worker thread."""
+        job = LaunchJob(uuid.uuid4().hex, _fingerprint)
+        with LaunchJobService._lock:
+            LaunchJobService._expire()
+            LaunchJobService._jobs[job.id] = job
+
+        def run():
+            try:
+                trace = LaunchTrace()
+                with AdmissionService.admit(on_position=job.set_position, timeout=Config.HUB_ADMISSION_TIMEOUT):
+                    trace.mark("admission")
+                    result = LauncherService.launch(on_output=job.append, trace=trace, **launch_args)
+            except Exception as e:
+                logger.error(f"Launch job {job.id} failed: {e}")
+                result = {"status": "error", "error": str(e), "returncode": -1, "stdout": "", "stderr": str(e)}
+            else:
+                if result["returncode"] == 0:
+                    result["status"] = "success"
+                else:
+                    result["status"] = "error"
+                    result["error"] = result["stderr"] or result["stdout"]
+            job.finish(result)
+
+        threading.Thread(target=run, daemon=True, name=f"launch-{job.id[:8]}").start()
+        return job
+
+    @staticmethod
+    def start_once(**launch_args) -> Tuple[LaunchJob, bool]:
+        """
+        Like `start`, but returns (running job, True) if the same launch (see
+        `IdempotencyService.fingerprint`) is already in flight.
+        """
+        fingerprint = IdempotencyService.fingerprint(launch_args)
+        with LaunchJobService._start_lock:
+            with LaunchJobService._lock:
+                running = next((j for j in LaunchJobService._jobs.values()
+                                if not j.done and j.fingerprint == fingerprint), None)
+            if running:
+                logger.info(f"Deduplicated launch: job {running.id} is already running it.")
+                return running, True
+            return LaunchJobService.start(_fingerprint=fingerprint, **launch_args), False
+
+    @staticmethod
+    def get(job_id: str) -> Optional[LaunchJob]:
+        with LaunchJobService._lock:
+            return LaunchJobService._jobs.get(job_id)
+
+    @staticmethod
+    def pending() -> int:
+        """Number of jobs still queued or launching."""
+        with LaunchJobService._lock:
+            return sum(1 for j in LaunchJobService._jobs.values() if not j.done)
+
+    @staticmethod
+    def events(job: LaunchJob, after: int = 0, heartbeat: float = 15) -> Iterator[str]:
+        """
+        Server-Sent Events for a job: `queued` events while waiting for admission, one
+        `output` event per line (the event id is the line number, so reconnecting
+        clients resume via Last-Event-ID), then a single `done` event carrying the
+        launch result as JSON.
+        """
+        position = 0
+        while True:
+            lines, done, current = job.wait(after, heartbeat, position)
+            moved = current != position
+            if moved:
+                position = current
+                yield f"event: queued\ndata: {json.dumps({'position': position})}\n\n"
+            for seq, line in lines:
+                after = seq
+                # A bare CR would end the SSE field early (progress bars redraw with it)
+                data = line.replace("\r", "")
+                yield f"id: {seq}\nevent: output\ndata: {data}\n\n"
+            if done and not lines:
+                yield f"event: done\ndata: {json.dumps(job.result)}\n\n"
+                return
+            if not lines and not done and not moved:
+                # Keeps proxies from closing an idle stream during long pulls
+                yield ": keep-alive\n\n"
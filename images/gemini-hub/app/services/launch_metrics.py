@@ -0,0 +1,112 @@
+import math
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, List, Tuple
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open
+BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class LaunchTrace:
+    """Per-phase timing of one launch. `mark(phase)` closes the phase that ran since the previous mark."""
+
+    def __init__(self):
+        self._last = time.monotonic()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        now = time.monotonic()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def extend(self, phases: List[Tuple[str, float]]) -> None:
+        """Adds phases measured elsewhere (e.g. by the toolbox script) that ran up to now."""
+        for phase, seconds in phases:
+            self.phases[phase] = self.phases.get(phase, 0.0) + max(0.0, seconds)
+        self._last = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": {phase: round(seconds, 3) for phase, seconds in self.phases.items()},
+            "total": round(sum(self.phases.values()), 3),
+        }
+
+class LaunchMetricsService:
+    """Aggregates the phase breakdowns of successful launches into percentiles and histograms."""
+
+    _lock = threading.Lock()
+    _samples: Dict[str, deque] = {}
+
+    @staticmethod
+    def read_script_trace(path: str, spawned_at: float, exited_at: float) -> List[Tuple[str, float]]:
+        """
+        Converts the toolbox trace file ("<phase> <epoch>" per line, written when a
+        phase ends) into (phase, seconds) pairs, framed by the process spawn and exit
+        wall-clock times.
+        """
+        marks: List[Tuple[str, float]] = []
+        try:
+            with open(path) as f:
+                for line in f:
+                    name, _, stamp = line.strip().partition(" ")
+                    try:
+                        # EPOCHREALTIME follows the locale decimal separator
+                        marks.append((name, float(stamp.replace(",", "."))))
+                    except ValueError:
+                        continue
+        except OSError:
+            return []
+        if not marks:
+            return []
+
+        phases = [("toolbox.init", marks[0][1] - spawned_at)]
+        for (_, previous), (name, stamp) in zip(marks, marks[1:]):
+            phases.append((f"toolbox.{name}", stamp - previous))
+        phases.append(("toolbox.exit", exited_at - marks[-1][1]))
+        return phases
+
+    @staticmethod
+    def record(trace: LaunchTrace) -> None:
+        timings = trace.to_dict()
+        with LaunchMetricsService._lock:
+            for phase, seconds in list(timings["phases"].items()) + [("total", timings["total"])]:
+                samples = LaunchMetricsService._samples.get(phase)
+                if samples is None:
+                    samples = LaunchMetricsService._samples[phase] = deque(maxlen=Config.HUB_LAUNCH_METRICS_SAMPLES)
+                samples.append(seconds)
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> float:
+        """Nearest-rank percentile of sorted values."""
+        index = max(0, math.ceil(q / 100 * len(values)) - 1)
+        return values[index]
+
+    @staticmethod
+    def summary() -> Dict[str, Any]:
+        """Per phase: sample count, p50/p90/p99/max and cumulative histogram buckets."""
+        with LaunchMetricsService._lock:
+            snapshot = {phase: sorted(samples) for phase, samples in LaunchMetricsService._samples.items()}
+
+        summary = {}
+        for phase, values in snapshot.items():
+            if not values:
+                continue
+            pct = LaunchMetricsService._percentile
+            histogram = {str(bound): sum(1 for v in values if v <= bound) for bound in BUCKETS}
+            histogram["+Inf"] = len(values)
+            summary[phase] = {
+                "count": len(values),
+                "p50": pct(values, 50), "p90": pct(values, 90), "p99": pct(values, 99),
+                "max": values[-1],
+                "histogram": histogram,
+            }
+        return summary
+
+    @staticmethod
+    def clear() -> None:
+        with LaunchMetricsService._lock:
+            LaunchMetricsService._samples.clear()
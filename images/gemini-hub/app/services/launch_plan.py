@@ -0,0 +1,105 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+class LaunchPlan:
+    """
+    Memoised launch facts (profile extra-args, image, Git layout) for one
+    (project_path, profile, variant) tuple. Facts are computed on first use.
+    """
+
+    def __init__(self, key: Tuple, stamp: Tuple):
+        self.key = key
+        self.stamp = stamp
+        self.created_at = time.time()
+        self._facts: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def memo(self, name: str, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if name in self._facts:
+                return self._facts[name]
+        value = compute()
+        with self._lock:
+            return self._facts.setdefault(name, value)
+
+class LaunchPlanService:
+    """LRU cache of launch plans, invalidated by profile and repository mtimes."""
+
+    _lock = threading.Lock()
+    _plans: "OrderedDict[Tuple, LaunchPlan]" = OrderedDict()
+
+    @staticmethod
+    def _mtime(path: Optional[str]) -> Optional[float]:
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    @staticmethod
+    def _git_dirs(project_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """Finds the `.git` entry above a project and, for worktrees, the Git dir it points to."""
+        current = project_path
+        while True:
+            candidate = os.path.join(current, ".git")
+            if os.path.isdir(candidate):
+                return candidate, None
+            if os.path.isfile(candidate):
+                try:
+                    with open(candidate) as f:
+                        gitdir = f.read().strip().replace("gitdir: ", "", 1)
+                except OSError:
+                    gitdir = None
+                return candidate, gitdir
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None, None
+            current = parent
+
+    @staticmethod
+    def stamp(project_path: str, profile_path: Optional[str]) -> Tuple:
+        """
+        Cheap fingerprint of everything a plan depends on: stat calls only.
+        Git rewrites HEAD/refs through renames, which bumps the `.git` directory mtime.
+        """
+        mtime = LaunchPlanService._mtime
+        git_entry, worktree_gitdir = LaunchPlanService._git_dirs(project_path)
+        extra_args = os.path.join(profile_path, "extra-args") if profile_path else None
+        return (
+            mtime(profile_path), mtime(extra_args),
+            git_entry, mtime(git_entry), mtime(worktree_gitdir),
+        )
+
+    @staticmethod
+    def get(project_path: str, profile_path: Optional[str], variant: str) -> LaunchPlan:
+        """Returns a valid plan for the tuple, replacing stale or expired ones."""
+        key = (os.path.realpath(project_path), profile_path, variant)
+        stamp = LaunchPlanService.stamp(key[0], profile_path)
+        now = time.time()
+
+        with LaunchPlanService._lock:
+            plan = LaunchPlanService._plans.get(key)
+            if plan and plan.stamp == stamp and now - plan.created_at < Config.HUB_LAUNCH_PLAN_TTL:
+                LaunchPlanService._plans.move_to_end(key)
+                return plan
+
+            if plan:
+                logger.debug(f"Launch plan invalidated: {key}")
+            plan = LaunchPlan(key, stamp)
+            LaunchPlanService._plans[key] = plan
+            while len(LaunchPlanService._plans) > Config.HUB_LAUNCH_PLAN_CACHE_SIZE:
+                LaunchPlanService._plans.popitem(last=False)
+            return plan
+
+    @staticmethod
+    def clear() -> None:
+        with LaunchPlanService._lock:
+            LaunchPlanService._plans.clear()
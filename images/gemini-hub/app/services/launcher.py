@@ -1,18 +1,89 @@
 import os
+import re
+import time
+import tempfile
 import subprocess
 import logging
-from typing import Dict
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
 from app.config import Config
 from app.services.filesystem import FileSystemService
+from app.services.image import ImageService
+from app.services.native_launcher import NativeLauncherService
+from app.services.resources import ResourceService
+from app.services.launch_metrics import LaunchMetricsService, LaunchTrace
+from app.services.launch_plan import LaunchPlanService
+from app.services.readiness import ReadinessService
+from app.services.session_index import SessionIndexService
+from app.services.telemetry import TelemetryService
+from app.services.worktree_pool import WorktreePoolService
 
 logger = logging.getLogger(__name__)
 
+# Both engines log the session name once the container runs
+SESSION_STARTED_REGEX = re.compile(r"Container started: (gem-[a-zA-Z0-9-]+)")
+
 class LauncherService:
     """Manages the execution of gemini-toolbox sessions."""
 
+    _lock = threading.Lock()
+    _in_flight = 0
+
+    @staticmethod
+    def in_flight() -> int:
+        """Number of launches currently executing."""
+        return LauncherService._in_flight
+
+    @staticmethod
+    def _stream(cmd, cwd: str, env: Dict[str, str], on_output: Callable[[str], None], timeout: float = 30) -> Dict[str, str]:
+        """
+        Runs the command with stderr merged into stdout, forwarding lines as they arrive.
+        `timeout` is an inactivity limit: every output line (e.g. pull progress) restarts it.
+        """
+        tail = deque(maxlen=Config.HUB_LAUNCH_OUTPUT_LINES)
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, bufsize=1)
+        deadline = [time.monotonic() + timeout]
+        done = threading.Event()
+        timed_out = threading.Event()
+
+        def watchdog() -> None:
+            # Killing the process ends the read loop
+            while not done.wait(max(deadline[0] - time.monotonic(), 0)):
+                if time.monotonic() >= deadline[0]:
+                    timed_out.set()
+                    proc.kill()
+                    return
+
+        threading.Thread(target=watchdog, daemon=True, name="launch-watchdog").start()
+        try:
+            for line in proc.stdout:
+                deadline[0] = time.monotonic() + timeout
+                line = line.rstrip("\n")
+                tail.append(line)
+                on_output(line)
+            returncode = proc.wait()
+        finally:
+            done.set()
+            proc.stdout.close()
+
+        output = "\n".join(tail) + "\n" if tail else ""
+        if timed_out.is_set():
+            return {"stdout": output, "stderr": "Error: Command timed out", "returncode": -1}
+        return {"stdout": output, "stderr": "", "returncode": returncode}
+
     @staticmethod
-    def launch(project_path: str, config_profile: str = None, session_type: str = 'cli', task: str = None, interactive: bool = True, image_variant: str = 'standard', docker_enabled: bool = True, worktree_mode: bool = False, worktree_name: str = None, ide_enabled: bool = True, custom_image: str = None, docker_args: str = None) -> Dict[str, str]:
-        """Launches gemini-toolbox via subprocess."""
+    def launch(project_path: str, config_profile: str = None, session_type: str = 'cli', task: str = None, interactive: bool = True, image_variant: str = 'standard', docker_enabled: bool = True, worktree_mode: bool = False, worktree_name: str = None, ide_enabled: bool = True, custom_image: str = None, docker_args: str = None, on_output: Optional[Callable[[str], None]] = None, resources: Optional[Dict[str, Any]] = None, trace: Optional[LaunchTrace] = None) -> Dict[str, str]:
+        """
+        Launches gemini-toolbox via subprocess.
+        With `on_output`, output lines are streamed to the callback while the
+        launch runs and only the last HUB_LAUNCH_OUTPUT_LINES lines are kept.
+        `resources` (cpus, cpuset, memory, io_weight) override the profile's resource
+        policy; invalid values raise ValueError before anything runs.
+        The result carries a per-phase `timings` breakdown, continuing `trace` if given.
+        """
+        trace = trace or LaunchTrace()
         
         # Security Check
         abs_path = os.path.abspath(project_path)
@@ -21,6 +92,7 @@ class LauncherService:
 
         # Build Args
         config_args = []
+        profile_path = None
         if config_profile:
             profile_path = os.path.join(Config.HOST_CONFIG_ROOT, config_profile)
             config_args = ["--profile", profile_path]
@@ -30,8 +102,11 @@ class LauncherService:
 
         if custom_image:
             config_args.extend(["--image", custom_image])
+            # Later launches of the same custom image skip the inline pull
+            ImageService.track(custom_image)
         elif image_variant == 'preview':
             config_args.append("--preview")
+            ImageService.track_preview()
 
         if not docker_enabled:
             config_args.append("--no-docker")
@@ -39,6 +114,11 @@ class LauncherService:
         if not ide_enabled:
             config_args.append("--no-ide")
 
+        # Resource limits travel with the other docker options
+        resource_args = ResourceService.to_docker_args(ResourceService.resolve(config_profile, resources))
+        if resource_args:
+            docker_args = " ".join(filter(None, [docker_args, " ".join(resource_args)]))
+
         if docker_args:
             config_args.extend(["--docker-args", docker_args])
 
@@ -54,6 +134,19 @@ class LauncherService:
         
         # Pass Key via Env (Security Best Practice)
         env["GEMINI_REMOTE_KEY"] = Config.TAILSCALE_AUTH_KEY
+
+        # Fast provisioning of dependency folders from the main checkout (opt-in)
+        if worktree_mode:
+            env["GEMINI_WORKTREE_PROVISION"] = Config.HUB_WORKTREE_PROVISION
+
+            # Pre-warmed worktree: the toolbox reuses the folder it resolves to
+            try:
+                pooled = WorktreePoolService.claim(project_path, worktree_name)
+            except OSError as e:
+                logger.warning(f"Worktree pool unavailable, the toolbox creates the worktree: {e}")
+                pooled = None
+            if pooled and not worktree_name:
+                env["GEMINI_WORKTREE_ID"] = os.path.basename(pooled).replace("exploration-", "", 1)
             
         # Command Construction
         # We pass --remote without the key value since it's in env
@@ -70,33 +163,77 @@ class LauncherService:
         
         logger.info(f"Executing: {cmd_str} in {project_path}")
         
+        # The toolbox appends "<phase> <epoch>" lines to this file as its phases end
+        trace_fd, trace_file = tempfile.mkstemp(prefix="gemini-launch-", suffix=".trace")
+        os.close(trace_fd)
+        env["GEMINI_TOOLBOX_TRACE_FILE"] = trace_file
+        trace.mark("prepare")
+
+        with LauncherService._lock:
+            LauncherService._in_flight += 1
         try:
-            result = subprocess.run(
-                cmd, 
-                cwd=project_path, 
-                env=env, 
-                capture_output=True, 
-                text=True,
-                timeout=30 # Safety timeout for startup
-            )
-            
-            return {
-                "command": cmd_str,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "returncode": result.returncode
-            }
+            result = None
+            if Config.HUB_LAUNCH_ENGINE == "native":
+                try:
+                    plan = LaunchPlanService.get(project_path, profile_path, custom_image or image_variant)
+                    result = NativeLauncherService.launch(cmd[1:], project_path, env, plan, on_output, trace)
+                    result = dict(result, command=cmd_str, engine="native")
+                except NotImplementedError as e:
+                    logger.info(f"Native launch not possible ({e}). Falling back to gemini-toolbox.")
+                except ValueError as e:
+                    result = {"command": cmd_str, "stdout": "", "stderr": f"Error: {e}", "returncode": 1, "engine": "native"}
+
+            if result is None:
+                spawned_at = time.time()
+                if on_output:
+                    result = dict(LauncherService._stream(cmd, project_path, env, on_output), command=cmd_str)
+                else:
+                    completed = subprocess.run(
+                        cmd, 
+                        cwd=project_path, 
+                        env=env, 
+                        capture_output=True, 
+                        text=True,
+                        timeout=30 # Safety timeout for startup
+                    )
+                    
+                    result = {
+                        "command": cmd_str,
+                        "stdout": completed.stdout,
+                        "stderr": completed.stderr,
+                        "returncode": completed.returncode
+                    }
+                trace.extend(LaunchMetricsService.read_script_trace(trace_file, spawned_at, time.time()))
         except subprocess.TimeoutExpired:
-            return {
+            result = {
                 "command": cmd_str,
                 "stdout": "",
                 "stderr": "Error: Command timed out",
                 "returncode": -1
             }
         except Exception as e:
-            return {
+            result = {
                 "command": cmd_str,
                 "stdout": "",
                 "stderr": str(e),
                 "returncode": -1
             }
+        finally:
+            try:
+                os.remove(trace_file)
+            except OSError:
+                pass
+            SessionIndexService.invalidate()
+            with LauncherService._lock:
+                LauncherService._in_flight -= 1
+
+        result["timings"] = trace.to_dict()
+        if result["returncode"] == 0:
+            LaunchMetricsService.record(trace)
+            # Readiness probing starts now rather than when the first client asks
+            match = SESSION_STARTED_REGEX.search(f"{result['stdout']}\n{result['stderr']}")
+            if match:
+                result["session"] = match.group(1)
+                ReadinessService.track(result["session"])
+                TelemetryService.wake()
+        return result
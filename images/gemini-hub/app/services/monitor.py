@@ -1,10 +1,13 @@
 import time
-import os
-import signal
 import logging
 import threading
+from typing import Optional
 from app.config import Config
-from app.services.discovery import DiscoveryService
+from app.services.docker_api import DockerAPI
+from app.services.shutdown import ShutdownService
+from app.services.tailscale import TailscaleService
+from app.services.telemetry import TelemetryService
+from app.services.traffic import TrafficService
 
 logger = logging.getLogger(__name__)
 
@@ -17,45 +20,83 @@ class MonitorService:
         if Config.HUB_AUTO_SHUTDOWN:
             thread = threading.Thread(target=MonitorService._monitor_loop, daemon=True)
             thread.start()
-            logger.info("Auto-shutdown monitor started (60s timeout).")
+            logger.info(f"Auto-shutdown monitor started ({Config.HUB_SHUTDOWN_TIMEOUT}s timeout).")
 
     @staticmethod
     def _monitor_loop():
         """Main loop for the monitor thread."""
         last_active = time.time()
-        timeout = 60 # Seconds
+        timeout = Config.HUB_SHUTDOWN_TIMEOUT
+        active = True
+        interval = Config.HUB_MONITOR_MIN_INTERVAL
 
         while True:
             try:
-                last_active = MonitorService.check_and_shutdown(last_active, timeout)
+                if active:
+                    # Checks are sparse while sessions run: the last one may have ended
+                    # any time since, so idle time counts from the first idle check.
+                    last_active = time.time()
+                checked = MonitorService.check_and_shutdown(last_active, timeout)
+                active = checked != last_active
+                last_active = checked
             except Exception as e:
                 logger.error(f"Monitor loop error: {e}")
-            
-            time.sleep(10)
+
+            interval = MonitorService.next_interval(active, interval, last_active + timeout - time.time())
+            time.sleep(interval)
+
+    @staticmethod
+    def next_interval(active: bool, interval: float, remaining: float) -> float:
+        """
+        Backs off exponentially while sessions are steady; once idle, the next
+        check lands on the shutdown deadline (never sooner than the minimum).
+        """
+        if active:
+            return min(interval * 2, Config.HUB_MONITOR_MAX_INTERVAL)
+        return min(Config.HUB_MONITOR_MAX_INTERVAL, max(Config.HUB_MONITOR_MIN_INTERVAL, remaining))
+
+    @staticmethod
+    def active_sessions() -> int:
+        """
+        Number of active sessions from the cheapest signal that has any: live
+        telemetry subscriptions (no call), running gem-* containers on the
+        Docker socket (one API call), then online tailnet peers (LocalAPI).
+        """
+        local = TelemetryService.count()
+        if local:
+            return local
+        try:
+            local = len(DockerAPI.list_sessions())
+        except OSError as e:
+            logger.debug(f"Docker daemon unreachable, checking the tailnet only: {e}")
+        if local:
+            return local
+        return TailscaleService.count_online_sessions()
+
+    @staticmethod
+    def busy() -> Optional[str]:
+        """Why the Hub is in use right now (client requests, launches, guarded work), None if it is not."""
+        return ShutdownService.pending()
 
     @staticmethod
     def check_and_shutdown(last_active: float, timeout: int) -> float:
-        """Performs a single activity check and kills process if stale."""
+        """Performs a single activity check and shuts the Hub down if stale."""
         try:
-            discovery = DiscoveryService()
-            sessions = discovery.get_sessions()
+            active = MonitorService.busy() or MonitorService.active_sessions()
         except Exception as e:
-            logger.error(f"Discovery failed in monitor: {e}")
+            logger.error(f"Activity check failed in monitor: {e}")
             return last_active
-        
-        # A session is active if it's either local (running) or remote (reachable)
-        active_sessions = [
-            s for s in sessions 
-            if s.get("is_running") or s.get("is_reachable")
-        ]
 
+        # Active: a client is being served, or a session is local (running) or remote (reachable)
         now = time.time()
-        if active_sessions:
+        if active:
             return now
-        
+
+        # The idle clock restarts with every client request (e.g. a user browsing the dashboard)
+        last_active = max(last_active, TrafficService.snapshot()["last_request"])
         idle_time = now - last_active
         if idle_time > timeout:
             logger.warning(f"Inactivity limit ({timeout}s) reached. Shutting down.")
-            os.kill(os.getpid(), signal.SIGTERM)
-        
+            ShutdownService.shutdown("idle")
+
         return last_active
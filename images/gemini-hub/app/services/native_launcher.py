@@ -0,0 +1,249 @@
+import os
+import re
+import grp
+import time
+import uuid
+import shutil
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from app.config import Config
+from app.services import toolbox_args, toolbox_worktree
+from app.services.docker_api import DockerAPI
+from app.services.docker_run import to_container_config
+from app.services.launch_metrics import LaunchTrace
+from app.services.launch_plan import LaunchPlan
+
+logger = logging.getLogger(__name__)
+
+def _sanitize(value: str) -> str:
+    """Lowercase and replace anything outside [a-z0-9-] with '-' (toolbox naming)."""
+    return re.sub(r"[^a-z0-9-]", "-", value.lower())
+
+class NativeLauncherService:
+    """
+    Launches sessions through the Docker Engine API instead of `gemini-toolbox`.
+
+    `plan()` is a port of the toolbox `main()` for detached launches: it turns
+    the same argument vector into the same `docker run` arguments (argument
+    handling in `toolbox_args`, worktree setup in `toolbox_worktree`). Arguments
+    only meaningful to an interactive terminal (commands, foreground mode)
+    raise NotImplementedError so the caller can fall back to the toolbox.
+    User errors raise ValueError with the toolbox error message.
+    """
+
+    @staticmethod
+    def toolbox_checkout(environ: Mapping[str, str]) -> Optional[str]:
+        """Root of the checkout `gemini-toolbox` runs from (it lives in `bin/`), None if not on PATH."""
+        script = shutil.which("gemini-toolbox", path=environ.get("PATH"))
+        if not script:
+            return None
+        return os.path.dirname(os.path.dirname(os.path.realpath(script)))
+
+    @staticmethod
+    def _branch_suffix(environ: Mapping[str, str]) -> str:
+        """Tag suffix for locally built images, from the branch of the toolbox checkout."""
+        repo_root = NativeLauncherService.toolbox_checkout(environ)
+        if not repo_root:
+            return ""
+        branch = toolbox_worktree.git(["-C", repo_root, "rev-parse", "--abbrev-ref", "HEAD"], repo_root)
+        if not branch or branch == "main":
+            return ""
+        return "-" + re.sub(r"[^a-zA-Z0-9]", "-", branch)
+
+    @staticmethod
+    def resolve_image(variant: str, override: str, environ: Mapping[str, str],
+                      suffix: Optional[str] = None) -> str:
+        """
+        Image selection: override > local branch build > local main build > registry.
+        `suffix` is the result of `_branch_suffix` if the caller already has it.
+        """
+        if override:
+            return override
+
+        if suffix is None:
+            suffix = NativeLauncherService._branch_suffix(environ)
+        hub_user = environ.get("DOCKER_HUB_USER") or "jsebayhi"
+        flavor = "cli-preview" if variant == "preview" else "cli"
+        local_tag = f"gemini-cli-toolbox/{flavor}:latest{suffix}"
+        fallback_tag = f"gemini-cli-toolbox/{flavor}:latest"
+        remote_tag = f"{hub_user}/gemini-cli-toolbox:latest-{'preview' if variant == 'preview' else 'stable'}"
+
+        try:
+            if DockerAPI.image_exists(local_tag):
+                return local_tag
+            if suffix and DockerAPI.image_exists(fallback_tag):
+                return fallback_tag
+        except OSError as e:
+            logger.debug(f"Image lookup failed: {e}")
+        return remote_tag
+
+    @staticmethod
+    def _docker_gid(environ: Mapping[str, str]) -> str:
+        gid = environ.get("HOST_DOCKER_GID", "")
+        if gid:
+            return gid
+        try:
+            return str(os.stat(Config.DOCKER_SOCKET).st_gid)
+        except OSError:
+            pass
+        try:
+            return str(grp.getgrnam("docker").gr_gid)
+        except KeyError:
+            return ""
+
+    @staticmethod
+    def plan(argv: List[str], cwd: str, environ: Mapping[str, str],
+             cache: Optional[LaunchPlan] = None) -> Tuple[List[str], str, List[str]]:
+        """
+        Resolves toolbox arguments into (docker run arguments, session id, log lines).
+        The docker run arguments exclude the `docker run` verb itself.
+        With a LaunchPlan, detection results (extra-args, image, Git layout) are
+        memoised across launches of the same project/profile/variant.
+        """
+        memo = cache.memo if cache else (lambda name, compute: compute())
+        opts = toolbox_args.parse(argv, cwd, environ, memo)
+        logs, extra = opts.logs, opts.extra
+        # Only the branch detection is memoised: the image lookups stay live so a
+        # local image built or tagged after the plan was cached is used right away
+        suffix = None if opts.override_image else memo("image-suffix", lambda: NativeLauncherService._branch_suffix(environ))
+        image = NativeLauncherService.resolve_image(opts.variant, opts.override_image, environ, suffix)
+        # Fail on unsupported docker options before any side effect (e.g. worktree creation)
+        to_container_config(extra + [image], environ)
+
+        host_conf_dir = os.path.realpath(os.path.join(cwd, opts.host_conf_dir))
+        if opts.profile_mode:
+            host_conf_dir = os.path.join(host_conf_dir, ".gemini")
+        if not os.path.exists("/.dockerenv") and environ.get("GEMINI_INTERNAL_RUN", "false") != "true":
+            os.makedirs(host_conf_dir, exist_ok=True)
+
+        project_dir = os.path.realpath(os.path.join(cwd, opts.project_dir))
+        if not os.path.isdir(project_dir):
+            raise ValueError(f"Project directory '{project_dir}' does not exist.")
+
+        base_project_name = _sanitize(os.path.basename(project_dir))
+        project_name = base_project_name
+        if opts.worktree_name:
+            project_name = f"{base_project_name}-{_sanitize(opts.worktree_name)}"
+        project_name = _sanitize(project_name)
+        session_type = "bash" if opts.use_bash else "geminicli"
+        session_id = f"gem-{project_name}-{session_type}-{uuid.uuid4().hex[:8]}"
+
+        original_project_dir = project_dir
+        if opts.worktree:
+            project_dir = toolbox_worktree.setup_worktree(base_project_name, opts.worktree_name or None, project_dir, environ, cache)
+
+        network_mode = "--network=bridge"
+        vscode = opts.vscode
+        if opts.raw_host:
+            network_mode = "--net=host"
+        elif opts.remote_mode:
+            if not opts.tailscale_key:
+                raise ValueError("TAILSCALE_KEY is required for --remote mode.")
+            vscode = False
+            extra += ["--env", f"TAILSCALE_AUTH_KEY={opts.tailscale_key}", "--cap-add=NET_ADMIN", "--device", "/dev/net/tun"]
+            if opts.localhost_access:
+                extra += ["-p", "127.0.0.1:0:3000"]
+        elif opts.localhost_access:
+            extra += ["-p", "127.0.0.1:0:3000"]
+
+        docker_args = ["--name", session_id, network_mode, "--volume", f"{project_dir}:{project_dir}"]
+
+        if project_dir != original_project_dir:
+            main_repo_root = original_project_dir
+        else:
+            main_repo_root = memo(f"main-repo:{project_dir}", lambda: toolbox_worktree.main_repo_root(project_dir))
+        if main_repo_root:
+            docker_args += ["--volume", f"{main_repo_root}:{main_repo_root}:ro",
+                            "--volume", f"{main_repo_root}/.git:{main_repo_root}/.git"]
+
+        docker_args += [
+            "--volume", f"{host_conf_dir}:/home/gemini/.gemini",
+            "--env", f"DEFAULT_UID={environ.get('HOST_UID') or os.getuid()}",
+            "--env", f"DEFAULT_GID={environ.get('HOST_GID') or os.getgid()}",
+            "--env", f"GEMINI_SESSION_ID={session_id}", "--env", f"GEMINI_PROJECT_NAME={project_name}",
+            "--env", f"GEMINI_SESSION_TYPE={session_type}", "--env", f"TERM={environ.get('TERM') or 'xterm-256color'}",
+            "--env", "COLORTERM", "--env", "LANG", "--env", "LC_ALL",
+            "--env", "HTTP_PROXY", "--env", "HTTPS_PROXY", "--env", "NO_PROXY",
+            "--env", "http_proxy", "--env", "https_proxy", "--env", "no_proxy",
+            "--workdir", project_dir,
+        ] + extra
+
+        if opts.enable_docker:
+            docker_args += ["--volume", "/var/run/docker.sock:/var/run/docker.sock",
+                            "--env", f"HOST_DOCKER_GID={NativeLauncherService._docker_gid(environ)}"]
+
+        if vscode:
+            docker_args += [
+                "--env", "TERM_PROGRAM", "--env", "TERM_PROGRAM_VERSION",
+                "--env", "GEMINI_CLI_IDE_SERVER_PORT", "--env", "GEMINI_CLI_IDE_AUTH_TOKEN",
+                "--env", "GEMINI_CLI_IDE_WORKSPACE_PATH",
+                "--env", "GEMINI_CLI_IDE_SERVER_HOST=127.0.0.1",
+            ]
+
+        if opts.use_bash:
+            logs.append(">> Mode: BASH")
+            exec_args = ["--entrypoint", "/usr/local/bin/docker-entrypoint.sh", image, "bash"] + opts.args
+        else:
+            exec_args = [image] + opts.args
+
+        return ["--rm", "-d"] + docker_args + exec_args, session_id, logs
+
+    @staticmethod
+    def _host_port(container_id: str, attempts: int = 5) -> Optional[str]:
+        for _ in range(attempts):
+            info = DockerAPI.inspect_container(container_id) or {}
+            ports = ((info.get("NetworkSettings") or {}).get("Ports") or {}).get("3000/tcp") or []
+            if ports and ports[0].get("HostPort"):
+                return ports[0]["HostPort"]
+            time.sleep(0.2)
+        return None
+
+    @staticmethod
+    def launch(argv: List[str], cwd: str, environ: Mapping[str, str], cache: Optional[LaunchPlan] = None,
+               on_output: Optional[Callable[[str], None]] = None, trace: Optional[LaunchTrace] = None) -> Dict[str, Any]:
+        """
+        Creates and starts the session container through the Engine API.
+        Returns the same result shape as the toolbox launch; `on_output`
+        receives each log line as soon as it is produced and `trace` gets
+        the native phases.
+        """
+        mark = trace.mark if trace else (lambda phase: None)
+        run_args, session_id, logs = NativeLauncherService.plan(argv, cwd, environ, cache)
+        name, config = to_container_config(run_args, environ)
+        mark("native.plan")
+
+        emit = on_output or (lambda line: None)
+        for line in logs:
+            emit(line)
+
+        def log(line: str) -> None:
+            logs.append(line)
+            emit(line)
+
+        try:
+            if not DockerAPI.image_exists(config["Image"]):
+                log(f">> Pulling image '{config['Image']}'...")
+                DockerAPI.pull(config["Image"])
+                mark("native.pull")
+
+            log(">> Starting container in background...")
+            container_id = DockerAPI.create_container(name, config)
+            mark("native.create")
+            try:
+                DockerAPI.start_container(container_id)
+            except Exception:
+                DockerAPI.remove_container(container_id)
+                raise
+            mark("native.start")
+        except (OSError, RuntimeError) as e:
+            log(f"Error: {e}")
+            return {"stdout": "", "stderr": "\n".join(logs), "returncode": 1}
+
+        log(f">> Container started: {session_id}")
+        if "3000/tcp" in config["HostConfig"]["PortBindings"]:
+            port = NativeLauncherService._host_port(container_id)
+            if port:
+                log(f">> Session available at http://localhost:{port}")
+            mark("native.ports")
+
+        return {"stdout": container_id + "\n", "stderr": "\n".join(logs) + "\n", "returncode": 0}
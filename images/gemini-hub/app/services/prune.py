@@ -2,15 +2,28 @@ import os
 import time
 import shutil
 import logging
+import random
 import threading
-import subprocess
+from typing import Optional, Set
 from app.config import Config
+from app.services.launcher import LauncherService
+from app.services.session_index import SessionIndex, SessionIndexService
+from app.services.shutdown import ShutdownService
+from app.services.worktree import WorktreeService
+from app.services.worktree_pool import WorktreePoolService
 
 logger = logging.getLogger(__name__)
 
 class PruneService:
     """Background service to clean up stale worktrees based on mtime."""
 
+    _wakeup = threading.Event()
+    _lock = threading.Lock()
+    _targets: Set[str] = set()
+    _force = False
+    _last_generation: Optional[int] = None
+    _next_expiry = 0.0
+
     @staticmethod
     def start():
         """Launch the background prune thread."""
@@ -22,21 +35,105 @@ class PruneService:
         thread = threading.Thread(target=PruneService._prune_loop, daemon=True)
         thread.start()
 
+    @staticmethod
+    def request(project: Optional[str] = None, reason: str = "event") -> None:
+        """
+        Schedules an out-of-band prune. With a project, only the matching
+        worktree folders are scanned; without one, a full scan is forced.
+        """
+        if not Config.HUB_WORKTREE_PRUNE_ENABLED:
+            return
+
+        with PruneService._lock:
+            if project:
+                PruneService._targets.add(project)
+            else:
+                PruneService._force = True
+        logger.debug(f"Prune requested ({reason}): {project or 'all projects'}")
+        PruneService._wakeup.set()
+
+    @staticmethod
+    def _jittered(seconds: float) -> float:
+        """Adds random jitter to avoid synchronized scans across hubs."""
+        return seconds + random.uniform(0, Config.HUB_PRUNE_JITTER)
+
     @staticmethod
     def _prune_loop():
-        """Periodic cleanup loop."""
-        # Run immediately on start, then every hour
+        """Event-driven cleanup loop (deferred start, jittered interval)."""
+        next_scan = time.time() + PruneService._jittered(Config.HUB_PRUNE_INITIAL_DELAY)
         while True:
+            timeout = max(0.0, min(next_scan - time.time(), Config.HUB_PRUNE_DISK_CHECK_INTERVAL))
+            PruneService._wakeup.wait(timeout)
+            PruneService._wakeup.clear()
             try:
-                PruneService.prune()
+                # Worktree removal must not be cut short by a shutdown
+                with ShutdownService.guard("prune") as allowed:
+                    if not allowed:
+                        return
+                    next_scan = PruneService.tick(next_scan)
             except Exception as e:
                 logger.error(f"Pruning error: {e}")
-            
-            time.sleep(3600)  # Sleep for 1 hour
+                next_scan = time.time() + PruneService._jittered(Config.HUB_PRUNE_INTERVAL)
+
+    @staticmethod
+    def tick(next_scan: float) -> float:
+        """
+        Runs one scheduler step and returns the time of the next full scan.
+        Targeted requests run immediately; full scans run when due (or under
+        disk pressure), once no launch is in flight, and only if the inventory
+        changed or a worktree may have reached its expiry since the last scan.
+        """
+        with PruneService._lock:
+            targets = set(PruneService._targets)
+            PruneService._targets.clear()
+            force = PruneService._force
+            PruneService._force = False
+
+        if targets:
+            PruneService.prune(projects=targets)
+
+        now = time.time()
+        pressure = PruneService.disk_pressure()
+        if now < next_scan and not (pressure or force):
+            return next_scan
+
+        if LauncherService.in_flight() > 0:
+            logger.debug("Launch in progress. Deferring prune.")
+            with PruneService._lock:
+                PruneService._force = PruneService._force or force
+            return now + Config.HUB_PRUNE_BUSY_RETRY
+
+        WorktreeService.refresh(force=True, sizes=False)
+        generation = WorktreeService.generation()
+        if not force and generation == PruneService._last_generation and now < PruneService._next_expiry:
+            logger.debug("Worktree inventory unchanged. Skipping prune.")
+        else:
+            if pressure:
+                logger.warning(f"Disk pressure on {Config.WORKTREE_ROOT}. Running prune.")
+            PruneService.prune()
+            PruneService._last_generation = WorktreeService.generation()
+
+        return now + PruneService._jittered(Config.HUB_PRUNE_INTERVAL)
 
     @staticmethod
-    def prune():
-        """Identify and remove stale worktree directories."""
+    def disk_pressure() -> bool:
+        """True if the worktree filesystem usage exceeds HUB_PRUNE_DISK_PRESSURE_PERCENT."""
+        threshold = Config.HUB_PRUNE_DISK_PRESSURE_PERCENT
+        if threshold <= 0:
+            return False
+        try:
+            usage = shutil.disk_usage(Config.WORKTREE_ROOT)
+        except OSError:
+            return False
+        return usage.total > 0 and (usage.used * 100 / usage.total) >= threshold
+
+    @staticmethod
+    def prune(projects: Optional[Set[str]] = None):
+        """
+        Identify and remove stale worktree directories.
+        `projects` restricts the scan to worktree folders of those projects
+        (session project names such as `app-feature` match the `app` folder).
+        """
         root = Config.WORKTREE_ROOT
         if not os.path.exists(root):
             logger.debug(f"Worktree root {root} does not exist. Skipping prune.")
@@ -49,53 +146,67 @@ class PruneService:
         now = time.time()
         
         pruned_count = 0
+        next_expiry = float("inf")
+        index: Optional[SessionIndex] = None
+        blind = False
         
-        # Structure: root/{project}/{worktree}
-        for project_dir in os.listdir(root):
-            project_path = os.path.join(root, project_dir)
-            if not os.path.isdir(project_path):
+        # Git state (branch / headless / orphan) comes from the inventory: tick() has
+        # just refreshed it, targeted prunes reuse it for up to HUB_WORKTREE_INVENTORY_TTL
+        entries = WorktreeService.refresh(sizes=False)
+        for entry in sorted(entries.values(), key=lambda e: (e.project, e.name)):
+            project_dir, worktree_path, state = entry.project, entry.path, entry.state
+            if projects and not any(p == project_dir or p.startswith(f"{project_dir}-") for p in projects):
+                continue
+
+            if state == "branch":
+                expiry_seconds = expiry_branch_sec
+            elif state == "headless":
+                expiry_seconds = expiry_headless_sec
+            else:
+                # Safety Default: dedicated orphan expiry
+                expiry_seconds = expiry_orphan_sec
+            
+            # Check directory mtime
+            try:
+                mtime = os.path.getmtime(worktree_path)
+            except OSError:
+                # Removed since the inventory was refreshed
                 continue
-                
-            for worktree_dir in os.listdir(project_path):
-                worktree_path = os.path.join(project_path, worktree_dir)
-                if not os.path.isdir(worktree_path):
+            age = now - mtime
+            
+            if age > expiry_seconds:
+                # Safety: never remove a worktree mounted by a live session.
+                # The index is built once per pass, only if something is stale.
+                if index is None:
+                    index = SessionIndexService.build()
+                    if index is None:
+                        # Mounts unknown: removing anything could pull a worktree from under a session
+                        logger.warning("Session index unavailable. Skipping worktree removal this pass.")
+                        next_expiry = now
+                        blind = True
+                        break
+                sessions = index.sessions_for(worktree_path)
+                if sessions:
+                    logger.info(f"Skipping stale {state} worktree in use: {worktree_path} (Sessions: {', '.join(sessions)})")
+                    next_expiry = now
                     continue
-                
-                # Determine state using Git
-                # Branch: returns 0, Headless: returns 1, Orphan/Error: returns other
+
+                logger.info(f"Pruning stale {state} worktree: {worktree_path} (Age: {int(age/86400)} days)")
                 try:
-                    result = subprocess.run(
-                        ["git", "-C", worktree_path, "symbolic-ref", "-q", "HEAD"],
-                        capture_output=True,
-                        text=True
-                    )
-                    
-                    if result.returncode == 0:
-                        expiry_seconds = expiry_branch_sec
-                        type_label = "branch"
-                    elif result.returncode == 1:
-                        expiry_seconds = expiry_headless_sec
-                        type_label = "headless"
-                    else:
-                        # Safety Default: dedicated orphan expiry
-                        expiry_seconds = expiry_orphan_sec
-                        type_label = "ambiguous/orphan"
-                except Exception:
-                    expiry_seconds = expiry_orphan_sec
-                    type_label = "error/fallback"
-                
-                # Check directory mtime
-                mtime = os.path.getmtime(worktree_path)
-                age = now - mtime
-                
-                if age > expiry_seconds:
-                    logger.info(f"Pruning stale {type_label} worktree: {worktree_path} (Age: {int(age/86400)} days)")
-                    try:
-                        # Recursive removal of the directory
-                        shutil.rmtree(worktree_path)
-                        pruned_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to remove {worktree_path}: {e}")
+                    # Recursive removal of the directory
+                    shutil.rmtree(worktree_path)
+                    WorktreeService.forget(worktree_path)
+                    pruned_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to remove {worktree_path}: {e}")
+                    next_expiry = now
+            else:
+                next_expiry = min(next_expiry, mtime + expiry_seconds)
+
+        if not projects:
+            PruneService._next_expiry = next_expiry
+            if not blind:
+                pruned_count += WorktreePoolService.reclaim(root)
 
         if pruned_count > 0:
             logger.info(f"Pruning finished. Removed {pruned_count} directories.")
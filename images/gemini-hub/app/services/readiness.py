@@ -0,0 +1,176 @@
+import time
+import logging
+import threading
+import http.client
+from typing import Any, Dict, Optional
+from app.config import Config
+from app.services.docker_api import DockerAPI
+from app.services.tailscale import TailscaleService
+
+logger = logging.getLogger(__name__)
+
+# Checks in the order they can succeed; later ones are only probed once earlier ones pass
+CHECKS = ("container", "port", "http", "peer")
+
+class _Probe:
+    def __init__(self, name: str, vpn: bool):
+        self.name = name
+        self.checks: Dict[str, Optional[bool]] = {check: False for check in CHECKS}
+        if not vpn:
+            self.checks["peer"] = None  # Not applicable
+        self.status = "probing"
+        self.local_url: Optional[str] = None
+        self.error: Optional[str] = None
+        self.version = 0
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "ready": self.status == "ready",
+            "checks": dict(self.checks),
+            "local_url": self.local_url,
+            "error": self.error,
+            "version": self.version,
+            "elapsed": round(self.updated_at - self.started_at, 3),
+        }
+
+class ReadinessService:
+    """
+    Server-side readiness tracking of newly started sessions. One probe thread
+    per session checks container, port mapping, HTTP and tailnet peer with
+    exponential backoff; clients long-poll for state changes instead of each
+    running their own discovery loop.
+    """
+
+    _cond = threading.Condition()
+    _probes: Dict[str, _Probe] = {}
+
+    @staticmethod
+    def _expire() -> None:
+        """Drops finished probes older than HUB_READINESS_TTL. Caller holds the lock."""
+        cutoff = time.time() - Config.HUB_READINESS_TTL
+        for name in [n for n, p in ReadinessService._probes.items() if p.status != "probing" and p.updated_at < cutoff]:
+            del ReadinessService._probes[name]
+
+    @staticmethod
+    def track(name: str) -> Dict[str, Any]:
+        """Starts probing `name` unless a probe is already running or recently finished."""
+        with ReadinessService._cond:
+            ReadinessService._expire()
+            probe = ReadinessService._probes.get(name)
+            if probe is not None:
+                return probe.to_dict()
+
+        # Tailscale detection runs outside the lock shared with long-poll waiters
+        vpn = not Config.HUB_NO_VPN and TailscaleService().is_available()
+        with ReadinessService._cond:
+            probe = ReadinessService._probes.get(name)
+            if probe is not None:
+                return probe.to_dict()
+            probe = ReadinessService._probes[name] = _Probe(name, vpn)
+
+        logger.debug(f"Probing readiness of {name}.")
+        thread = threading.Thread(target=ReadinessService._probe_loop, args=(probe,), daemon=True)
+        thread.start()
+        return probe.to_dict()
+
+    @staticmethod
+    def _update(probe: _Probe, **changes) -> None:
+        """Applies changes and wakes the waiting clients if anything changed."""
+        with ReadinessService._cond:
+            checks = changes.pop("checks", {})
+            changed = any(probe.checks.get(k) != v for k, v in checks.items())
+            changed |= any(getattr(probe, k) != v for k, v in changes.items())
+            if not changed:
+                return
+            probe.checks.update(checks)
+            for key, value in changes.items():
+                setattr(probe, key, value)
+            probe.version += 1
+            probe.updated_at = time.time()
+            ReadinessService._cond.notify_all()
+
+    @staticmethod
+    def _probe_loop(probe: _Probe) -> None:
+        delay = Config.HUB_READINESS_INITIAL_DELAY
+        deadline = probe.started_at + Config.HUB_READINESS_TIMEOUT
+        while True:
+            try:
+                ReadinessService.check(probe)
+            except Exception as e:
+                logger.debug(f"Readiness check of {probe.name} failed: {e}")
+            if probe.status != "probing":
+                logger.info(f"Session {probe.name} is {probe.status} after {probe.updated_at - probe.started_at:.1f}s.")
+                return
+            if time.time() + delay > deadline:
+                ReadinessService._update(probe, status="timeout", error="Session did not become ready in time")
+                logger.warning(f"Session {probe.name} not ready after {Config.HUB_READINESS_TIMEOUT}s.")
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, Config.HUB_READINESS_MAX_DELAY)
+
+    @staticmethod
+    def check(probe: _Probe) -> None:
+        """One probing round; cheap checks first, expensive ones once the earlier pass."""
+        info = DockerAPI.inspect_container(probe.name)
+        if info is None:
+            return  # Not created yet
+        state = info.get("State") or {}
+        if not state.get("Running"):
+            if state.get("Status") in ("exited", "dead"):
+                ReadinessService._update(probe, status="failed", error=f"Container {state.get('Status')} (exit code {state.get('ExitCode')})")
+            return
+        ReadinessService._update(probe, checks={"container": True})
+
+        bindings = ((info.get("NetworkSettings") or {}).get("Ports") or {}).get("3000/tcp") or []
+        port = next((b.get("HostPort") for b in bindings if b.get("HostPort")), None)
+        if port is None:
+            return
+        ReadinessService._update(probe, checks={"port": True}, local_url=f"http://localhost:{port}")
+
+        if not probe.checks["http"]:
+            if not ReadinessService._http_ok(int(port)):
+                return
+            ReadinessService._update(probe, checks={"http": True})
+
+        if probe.checks["peer"] is False:
+            peers = TailscaleService.get_status().get("Peer", {})
+            if not any(p.get("HostName") == probe.name and p.get("Online") for p in peers.values()):
+                return
+            ReadinessService._update(probe, checks={"peer": True})
+
+        ReadinessService._update(probe, status="ready")
+
+    @staticmethod
+    def _http_ok(port: int) -> bool:
+        """Any HTTP response means the session server is up."""
+        conn = http.client.HTTPConnection("localhost", port, timeout=2)
+        try:
+            conn.request("GET", "/")
+            conn.getresponse()
+            return True
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    @staticmethod
+    def wait(name: str, version: int = 0, timeout: float = 25) -> Optional[Dict[str, Any]]:
+        """
+        Long-poll: returns the state once its version is newer than `version`, it
+        is final, or `timeout` elapses. None if the session is not tracked.
+        """
+        with ReadinessService._cond:
+            probe = ReadinessService._probes.get(name)
+            if probe is None:
+                return None
+            ReadinessService._cond.wait_for(lambda: probe.version > version or probe.status != "probing", timeout)
+            return probe.to_dict()
+
+    @staticmethod
+    def clear() -> None:
+        with ReadinessService._cond:
+            ReadinessService._probes.clear()
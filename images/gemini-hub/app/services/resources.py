@@ -0,0 +1,123 @@
+import os
+import re
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import Config
+from app.services.docker_run import parse_memory
+
+logger = logging.getLogger(__name__)
+
+class ResourceService:
+    """
+    Per-session resource limits: validation of the launch fields, hub-level
+    default policies per config profile, and translation into `docker run` options.
+    """
+
+    FIELDS = ("cpus", "cpuset", "memory", "io_weight")
+    OPTIONS = {"cpus": "--cpus", "cpuset": "--cpuset-cpus", "memory": "--memory", "io_weight": "--blkio-weight"}
+    MIN_MEMORY = 6 * 1024 * 1024  # Docker refuses smaller memory limits
+
+    _lock = threading.Lock()
+    _policies: Tuple[Optional[float], Dict[str, Any]] = (None, {})
+
+    @staticmethod
+    def validate(resources: Dict[str, Any]) -> Dict[str, str]:
+        """Returns the normalized fields as docker option values. Raises ValueError."""
+        unknown = set(resources) - set(ResourceService.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown resource fields: {', '.join(sorted(unknown))}")
+
+        host_cpus = os.cpu_count() or 1
+        values: Dict[str, str] = {}
+
+        cpus = resources.get("cpus")
+        if cpus not in (None, ""):
+            try:
+                cpus = float(cpus)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid cpus: {resources['cpus']}")
+            if not 0 < cpus <= host_cpus:
+                raise ValueError(f"cpus must be between 0 and {host_cpus}")
+            values["cpus"] = f"{cpus:g}"
+
+        cpuset = resources.get("cpuset")
+        if cpuset not in (None, ""):
+            cpuset = str(cpuset).replace(" ", "")
+            if not re.fullmatch(r"\d+(-\d+)?(,\d+(-\d+)?)*", cpuset):
+                raise ValueError(f"Invalid cpuset: {resources['cpuset']} (expected e.g. '0-3' or '0,2')")
+            for part in cpuset.split(","):
+                low, _, high = part.partition("-")
+                if int(high or low) >= host_cpus or (high and int(high) < int(low)):
+                    raise ValueError(f"Invalid cpuset: {resources['cpuset']} (host CPUs: 0-{host_cpus - 1})")
+            values["cpuset"] = cpuset
+
+        memory = resources.get("memory")
+        if memory not in (None, ""):
+            if parse_memory(str(memory)) < ResourceService.MIN_MEMORY:
+                raise ValueError("memory must be at least 6m")
+            values["memory"] = str(memory).strip().lower()
+
+        io_weight = resources.get("io_weight")
+        if io_weight not in (None, ""):
+            try:
+                io_weight = int(io_weight)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid io_weight: {resources['io_weight']}")
+            if not 10 <= io_weight <= 1000:
+                raise ValueError("io_weight must be between 10 and 1000")
+            values["io_weight"] = str(io_weight)
+
+        return values
+
+    @staticmethod
+    def policies_file() -> str:
+        return Config.HUB_RESOURCE_POLICIES_FILE or os.path.join(Config.HOST_CONFIG_ROOT, "hub-resources.json")
+
+    @staticmethod
+    def policies() -> Dict[str, Any]:
+        """The policies file ({"default": {...}, "<profile>": {...}}), reloaded when it changes."""
+        path = ResourceService.policies_file()
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return {}
+
+        with ResourceService._lock:
+            cached_mtime, cached = ResourceService._policies
+            if cached_mtime == mtime:
+                return cached
+            try:
+                with open(path) as f:
+                    policies = json.load(f)
+                if not isinstance(policies, dict):
+                    raise ValueError("expected an object")
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring resource policies in {path}: {e}")
+                policies = {}
+            ResourceService._policies = (mtime, policies)
+            return policies
+
+    @staticmethod
+    def resolve(config_profile: Optional[str], requested: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Merges default policy < profile policy < requested fields. Raises ValueError."""
+        policies = ResourceService.policies()
+        merged: Dict[str, str] = {}
+        for name in ("default", config_profile):
+            if not name or not isinstance(policies.get(name), dict):
+                continue
+            try:
+                merged.update(ResourceService.validate(policies[name]))
+            except ValueError as e:
+                raise ValueError(f"Invalid resource policy '{name}': {e}")
+        merged.update(ResourceService.validate(requested or {}))
+        return merged
+
+    @staticmethod
+    def to_docker_args(resources: Dict[str, str]) -> List[str]:
+        args: List[str] = []
+        for field in ResourceService.FIELDS:
+            if field in resources:
+                args.extend([ResourceService.OPTIONS[field], resources[field]])
+        return args
@@ -1,6 +1,11 @@
 import subprocess
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from app.models.session import GeminiSession
+from app.services.activity import ActivityService
+from app.services.docker_api import DockerAPI
+from app.services.prune import PruneService
+from app.services.session_index import SessionIndexService
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +33,7 @@ class SessionService:
             )
             
             if result.returncode == 0:
+                SessionService._stopped(session_id)
                 return {
                     "status": "success",
                     "session_id": session_id
@@ -51,3 +57,82 @@ class SessionService:
                 "error": str(e),
                 "returncode": -1
             }
+
+    @staticmethod
+    def _stopped(session_id: str) -> None:
+        SessionIndexService.invalidate()
+        # Event-driven cleanup: the stopped session's worktrees may now be reclaimable
+        session = GeminiSession.from_name(session_id)
+        if session:
+            PruneService.request(session.project, reason=f"session stop {session_id}")
+
+    @staticmethod
+    def select(project: Optional[str] = None, session_type: Optional[str] = None,
+               idle: Optional[float] = None) -> List[str]:
+        """
+        Running sessions matching all given criteria. `idle` (seconds) is measured
+        from the Hub's activity samples; sessions never sampled before count as active.
+        """
+        containers = DockerAPI.list_sessions()
+        idle_by_name = ActivityService.sample(containers) if idle is not None else {}
+
+        selected = []
+        for container in containers:
+            for name in (n.lstrip("/") for n in container.get("Names", [])):
+                session = GeminiSession.from_name(name)
+                if not session:
+                    continue
+                if project and session.project != project:
+                    continue
+                if session_type and session.session_type != session_type:
+                    continue
+                if idle is not None and idle_by_name.get(name, 0) < idle:
+                    continue
+                selected.append(name)
+        return sorted(selected)
+
+    @staticmethod
+    def stop_container(session_id: str, grace: int) -> Dict[str, Any]:
+        """Stops a session through the Engine API, killing it after `grace` seconds."""
+        if not session_id.startswith("gem-"):
+            raise PermissionError(f"Invalid session ID: {session_id}. Only sessions starting with 'gem-' can be stopped.")
+
+        logger.info(f"Stopping session: {session_id} (grace {grace}s)")
+        try:
+            try:
+                DockerAPI.stop_container(session_id, grace)
+            except RuntimeError as e:
+                # A frozen container cannot receive the stop signal
+                if "paused" not in str(e).lower():
+                    raise
+                DockerAPI.unpause_container(session_id)
+                DockerAPI.stop_container(session_id, grace)
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Error stopping session {session_id}: {e}")
+            return {"status": "error", "session_id": session_id, "error": str(e)}
+
+        SessionService._stopped(session_id)
+        return {"status": "success", "session_id": session_id}
+
+    @staticmethod
+    def pause(session_id: str) -> Dict[str, Any]:
+        """Freezes a session: zero CPU, memory and state kept."""
+        return SessionService._freeze(session_id, DockerAPI.pause_container, "Pausing")
+
+    @staticmethod
+    def resume(session_id: str) -> Dict[str, Any]:
+        """Thaws a paused session."""
+        return SessionService._freeze(session_id, DockerAPI.unpause_container, "Resuming")
+
+    @staticmethod
+    def _freeze(session_id: str, action, verb: str) -> Dict[str, Any]:
+        if not session_id.startswith("gem-"):
+            raise PermissionError(f"Invalid session ID: {session_id}. Only sessions starting with 'gem-' can be paused or resumed.")
+
+        logger.info(f"{verb} session: {session_id}")
+        try:
+            action(session_id)
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Error {verb.lower()} session {session_id}: {e}")
+            return {"status": "error", "session_id": session_id, "error": str(e)}
+        return {"status": "success", "session_id": session_id}
@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Iterable, Optional
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+class SessionIndex:
+    """Immutable mapping of host paths to the running gem-* sessions that mount them."""
+
+    def __init__(self, mounts: Dict[str, Iterable[str]]):
+        self._exact: Dict[str, set] = {}
+        self._covered: Dict[str, set] = {}
+
+        for source, names in mounts.items():
+            source = os.path.normpath(source)
+            self._exact.setdefault(source, set()).update(names)
+
+            # Register every ancestor so "is anything mounted below X?" is a dict lookup
+            child, parent = source, os.path.dirname(source)
+            while parent != child:
+                self._covered.setdefault(parent, set()).update(names)
+                child, parent = parent, os.path.dirname(parent)
+
+    def sessions_for(self, path: str) -> List[str]:
+        """Sessions mounting `path`, one of its ancestors, or anything below it."""
+        path = os.path.normpath(path)
+        found = set(self._covered.get(path, ()))
+
+        current = path
+        while True:
+            found.update(self._exact.get(current, ()))
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+
+        return sorted(found)
+
+    def is_active(self, path: str) -> bool:
+        return bool(self.sessions_for(path))
+
+    @property
+    def sessions(self) -> List[str]:
+        names = set()
+        for values in self._exact.values():
+            names.update(values)
+        return sorted(names)
+
+class SessionIndexService:
+    """Builds and caches the session-to-path index from Docker mount metadata."""
+
+    _lock = threading.Lock()
+    _index: Optional[SessionIndex] = None
+    _built_at = 0.0
+
+    @staticmethod
+    def build() -> Optional[SessionIndex]:
+        """
+        Builds a fresh index with one `docker ps` and one bulk `docker inspect`.
+        Returns None if Docker could not be queried: an unknown mount set must
+        not be mistaken for "nothing is mounted".
+        """
+        mounts: Dict[str, List[str]] = {}
+        try:
+            ps = subprocess.run(
+                ["docker", "ps", "-q", "--no-trunc", "--filter", "name=gem-"],
+                capture_output=True, text=True, timeout=5
+            )
+            if ps.returncode != 0:
+                logger.warning(f"Session index unavailable (docker ps failed): {ps.stderr}")
+                return None
+
+            ids = [i for i in ps.stdout.split() if i]
+            if not ids:
+                return SessionIndex({})
+
+            inspect = subprocess.run(
+                ["docker", "inspect"] + ids,
+                capture_output=True, text=True, timeout=10
+            )
+            if inspect.returncode != 0:
+                logger.warning(f"Session index unavailable (docker inspect failed): {inspect.stderr}")
+                return None
+
+            for container in json.loads(inspect.stdout):
+                name = container.get("Name", "").lstrip("/")
+                if not name.startswith("gem-"):
+                    continue
+                for mount in container.get("Mounts") or []:
+                    source = mount.get("Source")
+                    if mount.get("Type", "bind") == "bind" and source:
+                        mounts.setdefault(source, []).append(name)
+        except Exception as e:
+            logger.warning(f"Session index unavailable: {e}")
+            return None
+
+        return SessionIndex(mounts)
+
+    @staticmethod
+    def get(max_age: Optional[float] = None) -> SessionIndex:
+        """
+        Returns the cached index, rebuilding it if older than `max_age` seconds.
+        A failed build is not cached and reads as empty (display only).
+        """
+        if max_age is None:
+            max_age = Config.HUB_SESSION_INDEX_TTL
+
+        with SessionIndexService._lock:
+            now = time.time()
+            if SessionIndexService._index is None or now - SessionIndexService._built_at >= max_age:
+                index = SessionIndexService.build()
+                if index is None:
+                    return SessionIndex({})
+                SessionIndexService._index = index
+                SessionIndexService._built_at = now
+            return SessionIndexService._index
+
+    @staticmethod
+    def invalidate() -> None:
+        """Forces the next `get()` to rebuild (e.g. after a launch or stop)."""
+        with SessionIndexService._lock:
+            SessionIndexService._index = None
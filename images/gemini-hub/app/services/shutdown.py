@@ -0,0 +1,123 @@
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from app.config import Config
+from app.services.launch_jobs import LaunchJobService
+from app.services.launcher import LauncherService
+from app.services.traffic import TrafficService
+
+logger = logging.getLogger(__name__)
+
+class ShutdownService:
+    """
+    Coordinated exit. Once stopping, new requests get a 503 (see create_app) and background
+    services skip their next round; the drain waits (up to
+    HUB_SHUTDOWN_DRAIN_TIMEOUT) for requests, launches and guarded work such as
+    worktree removal, runs the flush hooks, and only then exits.
+    """
+
+    _cond = threading.Condition()
+    _stopping = threading.Event()
+    _guards: Dict[str, int] = {}
+    _flush_hooks: List[Callable[[], None]] = []
+
+    @staticmethod
+    def stopping() -> bool:
+        return ShutdownService._stopping.is_set()
+
+    @staticmethod
+    @contextmanager
+    def guard(task: str) -> Iterator[bool]:
+        """
+        Marks work that must not be cut short. Yields False (the caller skips
+        the work) once a shutdown has started, True otherwise.
+        """
+        with ShutdownService._cond:
+            allowed = not ShutdownService._stopping.is_set()
+            if allowed:
+                ShutdownService._guards[task] = ShutdownService._guards.get(task, 0) + 1
+        try:
+            yield allowed
+        finally:
+            if allowed:
+                with ShutdownService._cond:
+                    ShutdownService._guards[task] -= 1
+                    if not ShutdownService._guards[task]:
+                        del ShutdownService._guards[task]
+                    ShutdownService._cond.notify_all()
+
+    @staticmethod
+    def register_flush(hook: Callable[[], None]) -> None:
+        """Adds a callable that persists state right before the process exits."""
+        ShutdownService._flush_hooks.append(hook)
+
+    @staticmethod
+    def pending() -> Optional[str]:
+        """What the Hub is still doing for a client or must finish, None if nothing."""
+        in_flight = TrafficService.snapshot()["in_flight"]
+        if in_flight:
+            return f"{in_flight} request(s) in flight"
+        # Background launch jobs also count in LauncherService while launching
+        launches = max(LaunchJobService.pending(), LauncherService.in_flight())
+        if launches:
+            return f"{launches} launch(es) in progress"
+        with ShutdownService._cond:
+            tasks = sorted(ShutdownService._guards)
+        if tasks:
+            return f"{', '.join(tasks)} in progress"
+        return None
+
+    @staticmethod
+    def drain(timeout: Optional[float] = None) -> bool:
+        """
+        Stops new work, waits for pending work and runs the flush hooks.
+        Returns False if the deadline passed with work still pending.
+        """
+        ShutdownService._stopping.set()
+        deadline = time.time() + (Config.HUB_SHUTDOWN_DRAIN_TIMEOUT if timeout is None else timeout)
+
+        drained = True
+        while True:
+            reason = ShutdownService.pending()
+            if reason is None:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                logger.warning(f"Drain deadline reached with {reason}.")
+                drained = False
+                break
+            logger.debug(f"Draining: {reason}.")
+            # Guards notify; requests and launches are polled
+            with ShutdownService._cond:
+                ShutdownService._cond.wait(min(remaining, 0.5))
+
+        for hook in ShutdownService._flush_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Shutdown flush failed: {e}")
+        return drained
+
+    @staticmethod
+    def shutdown(reason: str) -> None:
+        """Drains and exits the process. Only the first call does anything."""
+        with ShutdownService._cond:
+            if ShutdownService._stopping.is_set():
+                return
+            ShutdownService._stopping.set()
+
+        logger.warning(f"Shutting down ({reason}): draining...")
+        ShutdownService.drain()
+        logger.info("Shutdown complete.")
+        logging.shutdown()
+        # The server loop runs in the main thread; every piece of work is done or abandoned
+        os._exit(0)
+
+    @staticmethod
+    def clear() -> None:
+        with ShutdownService._cond:
+            ShutdownService._stopping.clear()
+            ShutdownService._guards.clear()
@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from app.config import Config
+from app.services.discovery import DiscoveryService
+from app.services.shutdown import ShutdownService
+from app.services.worktree import WorktreeService
+from app.services.worktree_pool import WorktreePoolService
+
+logger = logging.getLogger(__name__)
+
+class SnapshotService:
+    """
+    Warm start. The session list, worktree inventory and worktree pool usage
+    ranking are saved to the state volume (HUB_SNAPSHOT_PATH) after the first
+    live discovery and on shutdown. On boot the snapshot is served, marked stale, until live discovery has
+    reconciled; the worktree inventory is seeded so only changed worktrees are
+    re-classified.
+    """
+
+    VERSION = 1
+
+    _lock = threading.Lock()
+    _sessions: Optional[List[Dict[str, Any]]] = None
+    _saved_at: Optional[float] = None
+    _reconciled = threading.Event()
+
+    @staticmethod
+    def start():
+        """Loads the snapshot (before serving, so the first request can use it)."""
+        if not Config.HUB_SNAPSHOT_PATH:
+            SnapshotService._reconciled.set()
+            logger.debug("Warm-start snapshot disabled.")
+            return
+
+        SnapshotService.load()
+        ShutdownService.register_flush(SnapshotService.save)
+
+    @staticmethod
+    def start_reconcile():
+        """
+        Reconciles with live providers in the background. Deferred with the
+        other background services: until then the snapshot answers requests.
+        """
+        if SnapshotService._reconciled.is_set():
+            return
+        thread = threading.Thread(target=SnapshotService.reconcile, daemon=True)
+        thread.start()
+
+    @staticmethod
+    def load() -> bool:
+        """Reads the snapshot. A missing, unreadable or outdated file is ignored."""
+        try:
+            with open(Config.HUB_SNAPSHOT_PATH) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {Config.HUB_SNAPSHOT_PATH}: {e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != SnapshotService.VERSION:
+            return False
+
+        with SnapshotService._lock:
+            SnapshotService._sessions = [dict(s, stale=True) for s in data.get("sessions") or []]
+            SnapshotService._saved_at = data.get("saved_at")
+        WorktreeService.restore(data.get("worktree_root"), data.get("worktrees") or [])
+        WorktreePoolService.restore(data.get("pool_usage") or {})
+        logger.info(f"Loaded snapshot from {time.ctime(SnapshotService._saved_at or 0)} ({len(SnapshotService._sessions)} session(s)).")
+        return True
+
+    @staticmethod
+    def reconcile() -> None:
+        """
+        First live discovery; the snapshot stops being served as soon as it
+        returns. The worktree inventory (with its size walk) is refreshed after.
+        """
+        try:
+            sessions = DiscoveryService().get_sessions()
+        except Exception as e:
+            logger.error(f"Snapshot reconcile failed: {e}")
+            sessions = None
+        with SnapshotService._lock:
+            SnapshotService._sessions = None
+        SnapshotService._reconciled.set()
+
+        try:
+            WorktreeService.refresh(force=True)
+        except Exception as e:
+            logger.error(f"Worktree inventory refresh failed: {e}")
+        if sessions is not None:
+            SnapshotService.save(sessions)
+
+    @staticmethod
+    def stale_sessions() -> Optional[List[Dict[str, Any]]]:
+        """The snapshot's sessions while live discovery has not completed, None afterwards."""
+        if SnapshotService._reconciled.is_set():
+            return None
+        with SnapshotService._lock:
+            return None if SnapshotService._sessions is None else [dict(s) for s in SnapshotService._sessions]
+
+    @staticmethod
+    def status() -> Dict[str, Any]:
+        return {"stale": SnapshotService.stale_sessions() is not None, "saved_at": SnapshotService._saved_at}
+
+    @staticmethod
+    def save(sessions: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Writes the snapshot atomically (`sessions` defaults to a live discovery)."""
+        path = Config.HUB_SNAPSHOT_PATH
+        if not path:
+            return
+        if sessions is None:
+            sessions = DiscoveryService().get_sessions()
+
+        data = {
+            "version": SnapshotService.VERSION,
+            "saved_at": time.time(),
+            "sessions": [{k: v for k, v in s.items() if k != "stale"} for s in sessions],
+            "worktree_root": Config.WORKTREE_ROOT,
+            "worktrees": WorktreeService.dump(),
+            "pool_usage": WorktreePoolService.dump(),
+        }
+        tmp = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not save snapshot to {path}: {e}")
+            return
+        with SnapshotService._lock:
+            SnapshotService._saved_at = data["saved_at"]
+        logger.debug(f"Snapshot saved ({len(sessions)} session(s), {len(data['worktrees'])} worktree(s)).")
+
+    @staticmethod
+    def clear() -> None:
+        with SnapshotService._lock:
+            SnapshotService._sessions = None
+            SnapshotService._saved_at = None
+        SnapshotService._reconciled.clear()
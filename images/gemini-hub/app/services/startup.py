@@ -0,0 +1,137 @@
+import sys
+import time
+import socket
+import logging
+import threading
+import importlib.abc
+import importlib.machinery
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Times the execution of hub (`app.*`) modules. A module's self time covers its
+    own code and the third-party modules it pulls in first; nested hub modules
+    are subtracted and reported on their own.
+    """
+
+    def __init__(self, records: Dict[str, Dict[str, float]]):
+        self.records = records
+        self._stack: List[float] = []
+
+    def find_spec(self, name, path, target=None):
+        if not name.startswith("app."):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(name, path, target)
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def timed(module):
+            start = time.perf_counter()
+            self._stack.append(0.0)
+            try:
+                exec_module(module)
+            finally:
+                total = time.perf_counter() - start
+                nested = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += total
+                self.records[name] = {
+                    "cumulative_ms": round(total * 1000, 2),
+                    "self_ms": round((total - nested) * 1000, 2),
+                }
+
+        spec.loader.exec_module = timed
+        return spec
+
+class StartupService:
+    """
+    Boot timeline of the Hub: phase marks since `run.py` started, per-module
+    import times when profiling (HUB_STARTUP_PROFILE), and the deferred start
+    of background services once the server accepts connections.
+    """
+
+    _lock = threading.Lock()
+    _origin = time.perf_counter()
+    _phases: List[Tuple[str, float]] = []
+    _modules: Dict[str, Dict[str, float]] = {}
+    _timer: Optional[_ImportTimer] = None
+
+    @staticmethod
+    def profile_imports() -> None:
+        """Times every hub module imported from now on (call before importing the app)."""
+        if StartupService._timer is None:
+            StartupService._timer = _ImportTimer(StartupService._modules)
+            sys.meta_path.insert(0, StartupService._timer)
+
+    @staticmethod
+    def mark(phase: str) -> None:
+        """Records the end of a boot phase."""
+        with StartupService._lock:
+            StartupService._phases.append((phase, time.perf_counter() - StartupService._origin))
+
+    @staticmethod
+    def report() -> Dict[str, Any]:
+        """Phase ends (ms since start) and hub modules by self time (empty unless profiling)."""
+        with StartupService._lock:
+            phases = [{"phase": p, "at_ms": round(t * 1000, 1)} for p, t in StartupService._phases]
+            modules = [dict(times, module=name) for name, times in StartupService._modules.items()]
+        modules.sort(key=lambda m: m["self_ms"], reverse=True)
+        return {"phases": phases, "modules": modules}
+
+    @staticmethod
+    def log_report(top: int = 15) -> None:
+        report = StartupService.report()
+        logger.info("Startup phases: " + ", ".join(f"{p['phase']} {p['at_ms']}ms" for p in report["phases"]))
+        if report["modules"]:
+            total = sum(m["self_ms"] for m in report["modules"])
+            logger.info(f"Hub module imports: {total:.1f}ms in {len(report['modules'])} modules. Slowest (self / cumulative):")
+            for m in report["modules"][:top]:
+                logger.info(f"  {m['module']}: {m['self_ms']}ms / {m['cumulative_ms']}ms")
+
+    @staticmethod
+    def wait_until_serving(port: int, timeout: float) -> bool:
+        """Polls until the server accepts connections on localhost:`port`."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                    return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.05)
+
+    @staticmethod
+    def start_background(services: List[Callable[[], None]], port: int, delay: float,
+                         timeout: float = 30) -> threading.Thread:
+        """
+        Starts background services `delay` seconds after the server on `port`
+        accepts connections, so the first requests do not compete with their
+        initial scans. After `timeout` seconds without a server they start anyway.
+        """
+        def run():
+            if StartupService.wait_until_serving(port, timeout):
+                StartupService.mark("serving")
+            else:
+                logger.warning(f"Server not answering on port {port} after {timeout:.0f}s. Starting background services anyway.")
+            time.sleep(delay)
+            for start in services:
+                try:
+                    start()
+                except Exception as e:
+                    logger.error(f"Background service failed to start: {e}")
+            StartupService.mark("background")
+
+        thread = threading.Thread(target=run, name="background-start", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def clear() -> None:
+        with StartupService._lock:
+            StartupService._phases.clear()
+            StartupService._modules.clear()
@@ -0,0 +1,100 @@
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from app.config import Config
+from app.services.session import SessionService
+
+logger = logging.getLogger(__name__)
+
+class StopJob:
+    """One bulk stop: per-session results filled in as the stops complete."""
+
+    def __init__(self, job_id: str, session_ids: List[str], grace: int):
+        self.id = job_id
+        self.grace = grace
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: Dict[str, Dict[str, Any]] = {sid: {"status": "pending"} for sid in session_ids}
+        self._cond = threading.Condition()
+        if not session_ids:
+            self.finished_at = self.created_at
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def set_result(self, session_id: str, result: Dict[str, Any]) -> None:
+        with self._cond:
+            self.results[session_id] = result
+            if all(r["status"] not in ("pending", "stopping") for r in self.results.values()):
+                self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def wait(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done, timeout=timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._cond:
+            results = {sid: dict(r) for sid, r in self.results.items()}
+        statuses = [r["status"] for r in results.values()]
+        return {
+            "job_id": self.id,
+            "status": "done" if self.done else "running",
+            "total": len(results),
+            "stopped": statuses.count("success"),
+            "failed": statuses.count("error"),
+            "results": results,
+        }
+
+class StopJobService:
+    """Stops sessions concurrently in the background; callers poll the job for results."""
+
+    _lock = threading.Lock()
+    _jobs: Dict[str, StopJob] = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _expire() -> None:
+        """Drops finished jobs older than HUB_LAUNCH_JOB_TTL. Caller holds the lock."""
+        cutoff = time.time() - Config.HUB_LAUNCH_JOB_TTL
+        for job_id in [j.id for j in StopJobService._jobs.values() if j.done and j.finished_at < cutoff]:
+            del StopJobService._jobs[job_id]
+
+    @staticmethod
+    def start(session_ids: List[str], grace: int) -> StopJob:
+        """Schedules the stops. Raises PermissionError before anything runs if an ID is not a session."""
+        invalid = [sid for sid in session_ids if not sid.startswith("gem-")]
+        if invalid:
+            raise PermissionError(f"Invalid session IDs: {', '.join(invalid)}. Only sessions starting with 'gem-' can be stopped.")
+
+        job = StopJob(uuid.uuid4().hex, list(dict.fromkeys(session_ids)), grace)
+        with StopJobService._lock:
+            StopJobService._expire()
+            StopJobService._jobs[job.id] = job
+            if StopJobService._executor is None:
+                StopJobService._executor = ThreadPoolExecutor(
+                    max_workers=Config.HUB_STOP_CONCURRENCY, thread_name_prefix="session-stop")
+            executor = StopJobService._executor
+
+        logger.info(f"Stop job {job.id}: stopping {len(job.results)} session(s).")
+        for session_id in job.results:
+            executor.submit(StopJobService._stop, job, session_id)
+        return job
+
+    @staticmethod
+    def _stop(job: StopJob, session_id: str) -> None:
+        job.set_result(session_id, {"status": "stopping"})
+        try:
+            result = SessionService.stop_container(session_id, job.grace)
+        except Exception as e:
+            result = {"status": "error", "session_id": session_id, "error": str(e)}
+        job.set_result(session_id, result)
+
+    @staticmethod
+    def get(job_id: str) -> Optional[StopJob]:
+        with StopJobService._lock:
+            return StopJobService._jobs.get(job_id)
@@ -2,15 +2,22 @@ import json
 import subprocess
 import logging
 import os
+import http.client
 from typing import Dict, Any
 from app.models.session import GeminiSession
 from app.services.base import DiscoveryProvider
+from app.services.docker_api import UnixHTTPConnection
 
 logger = logging.getLogger(__name__)
 
 class TailscaleService(DiscoveryProvider):
     """Session Provider for remote Tailscale nodes."""
 
+    # Written by the entrypoint when the background `tailscale up` fails
+    UP_FAILED_PATH = "/run/tailscale/up-failed"
+
+    _ready = False
+
     def is_available(self) -> bool:
         """Checks if Tailscale is running."""
         socket_path = "/run/tailscale/tailscaled.sock"
@@ -34,6 +41,56 @@ class TailscaleService(DiscoveryProvider):
         except Exception:
             return {}
 
+    @staticmethod
+    def local_status() -> Dict[str, Any]:
+        """
+        Same data as `get_status()` from the tailscaled LocalAPI over its Unix
+        socket, without spawning the CLI. Falls back to the CLI on failure.
+        """
+        socket_path = "/run/tailscale/tailscaled.sock"
+        if not os.path.exists(socket_path):
+            return {}
+
+        conn = UnixHTTPConnection(socket_path, timeout=5)
+        try:
+            # tailscaled only answers LocalAPI requests addressed to this host name
+            conn.request("GET", "/localapi/v0/status", headers={"Host": "local-tailscaled.sock"})
+            response = conn.getresponse()
+            if response.status == 200:
+                return json.loads(response.read())
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            logger.debug(f"Tailscale LocalAPI unavailable: {e}")
+        finally:
+            conn.close()
+        return TailscaleService.get_status()
+
+    @staticmethod
+    def state() -> Dict[str, Any]:
+        """
+        Tailnet bring-up: "ready" once the backend runs, "initialising" while
+        the entrypoint's `tailscale up` is in progress (localhost is already
+        served), "error" if it failed, "disabled" without tailscaled.
+        """
+        if TailscaleService._ready:
+            return {"state": "ready"}
+        if not os.path.exists("/run/tailscale/tailscaled.sock"):
+            return {"state": "disabled"}
+        if TailscaleService.local_status().get("BackendState") == "Running":
+            # Bring-up happens once per container; later outages show per session
+            TailscaleService._ready = True
+            return {"state": "ready"}
+        try:
+            with open(TailscaleService.UP_FAILED_PATH) as f:
+                return {"state": "error", "error": f.read().strip()}
+        except OSError:
+            return {"state": "initialising"}
+
+    @staticmethod
+    def count_online_sessions() -> int:
+        """Number of gem-* peers currently online in the tailnet."""
+        peers = TailscaleService.local_status().get("Peer") or {}
+        return sum(1 for p in peers.values() if p.get("HostName", "").startswith("gem-") and p.get("Online"))
+
     def get_sessions(self) -> Dict[str, GeminiSession]:
         """Returns GeminiSession objects for all nodes in Tailnet."""
         sessions = {}
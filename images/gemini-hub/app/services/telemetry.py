@@ -0,0 +1,151 @@
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+from app.config import Config
+from app.services.docker_api import DockerAPI
+
+logger = logging.getLogger(__name__)
+
+class TelemetryService:
+    """
+    Live resource usage of running sessions. Each gem-* container gets one
+    streaming stats subscription for its lifetime; readers get the latest
+    sample from memory instead of polling the daemon per request.
+    """
+
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    # name -> {"id", "created", "stats", "snapshot", "updated_at"}
+    _streams: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def start():
+        """Launch the subscription manager thread."""
+        if not Config.HUB_TELEMETRY:
+            logger.debug("Session telemetry disabled.")
+            return
+
+        logger.info("Session telemetry started.")
+        thread = threading.Thread(target=TelemetryService._sync_loop, daemon=True)
+        thread.start()
+
+    @staticmethod
+    def _sync_loop():
+        """Picks up new sessions every HUB_TELEMETRY_SYNC_INTERVAL seconds or when woken."""
+        while True:
+            try:
+                TelemetryService.sync()
+            except OSError as e:
+                logger.debug(f"Docker daemon unreachable, telemetry paused: {e}")
+            except Exception as e:
+                logger.error(f"Telemetry sync error: {e}")
+            TelemetryService._wakeup.wait(Config.HUB_TELEMETRY_SYNC_INTERVAL)
+            TelemetryService._wakeup.clear()
+
+    @staticmethod
+    def wake() -> None:
+        """Asks the manager to look for new sessions now (e.g. after a launch)."""
+        TelemetryService._wakeup.set()
+
+    @staticmethod
+    def sync() -> None:
+        """Subscribes to every running session that has no subscription yet."""
+        for container in DockerAPI.list_sessions():
+            name = next(n.lstrip("/") for n in container["Names"] if n.lstrip("/").startswith("gem-"))
+            with TelemetryService._lock:
+                if name in TelemetryService._streams:
+                    continue
+                TelemetryService._streams[name] = {
+                    "id": container["Id"], "created": container.get("Created"),
+                    "stats": None, "snapshot": None, "updated_at": None,
+                }
+            thread = threading.Thread(target=TelemetryService._subscribe, args=(name, container["Id"]),
+                                      daemon=True, name=f"telemetry-{name}")
+            thread.start()
+
+    @staticmethod
+    def _subscribe(name: str, container_id: str) -> None:
+        logger.debug(f"Subscribed to stats of {name}.")
+        try:
+            DockerAPI.stream_stats(container_id, lambda stats: TelemetryService._record(name, stats))
+        except (OSError, RuntimeError) as e:
+            logger.debug(f"Stats stream of {name} ended: {e}")
+        finally:
+            # The stream ends with the container; a restarted one is picked up by the next sync
+            with TelemetryService._lock:
+                TelemetryService._streams.pop(name, None)
+
+    @staticmethod
+    def summarize(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """CPU%, memory and network totals of a stats sample (same formulas as `docker stats`)."""
+        cpu, precpu = stats.get("cpu_stats") or {}, stats.get("precpu_stats") or {}
+        cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+        system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+        online = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+        cpu_percent = cpu_delta / system_delta * online * 100 if cpu_delta > 0 and system_delta > 0 else 0.0
+
+        memory = stats.get("memory_stats") or {}
+        detail = memory.get("stats") or {}
+        # Page cache is reclaimable: cgroup v2 reports it as inactive_file, v1 as cache
+        cache = detail.get("inactive_file", detail.get("cache", 0))
+        networks = (stats.get("networks") or {}).values()
+        return {
+            "cpu_percent": round(cpu_percent, 1),
+            "memory_usage": max(0, memory.get("usage", 0) - cache),
+            "memory_limit": memory.get("limit"),
+            "net_rx_bytes": sum(n.get("rx_bytes", 0) for n in networks),
+            "net_tx_bytes": sum(n.get("tx_bytes", 0) for n in networks),
+        }
+
+    @staticmethod
+    def _record(name: str, stats: Dict[str, Any]) -> None:
+        snapshot = TelemetryService.summarize(stats)
+        with TelemetryService._lock:
+            entry = TelemetryService._streams.get(name)
+            if entry is not None:
+                entry.update(stats=stats, snapshot=snapshot, updated_at=time.time())
+
+    @staticmethod
+    def snapshot(name: str) -> Optional[Dict[str, Any]]:
+        """Latest usage of a session plus its uptime, None without a sample yet."""
+        with TelemetryService._lock:
+            entry = TelemetryService._streams.get(name)
+            if not entry or entry["snapshot"] is None:
+                return None
+            snapshot = dict(entry["snapshot"], updated_at=entry["updated_at"])
+            created = entry["created"]
+        snapshot["uptime"] = round(time.time() - created) if created else None
+        return snapshot
+
+    @staticmethod
+    def count() -> int:
+        """Number of sessions with a live subscription (running containers)."""
+        with TelemetryService._lock:
+            return len(TelemetryService._streams)
+
+    @staticmethod
+    def latest(name: str, max_age: float = 5) -> Optional[Dict[str, Any]]:
+        """Raw stats sample of a session if one arrived within `max_age` seconds."""
+        with TelemetryService._lock:
+            entry = TelemetryService._streams.get(name)
+            if entry and entry["stats"] is not None and time.time() - entry["updated_at"] <= max_age:
+                return entry["stats"]
+        return None
+
+    @staticmethod
+    def apply(session) -> None:
+        """Copies the latest usage onto a `GeminiSession`."""
+        snapshot = TelemetryService.snapshot(session.name)
+        if snapshot:
+            session.cpu_percent = snapshot["cpu_percent"]
+            session.memory_usage = snapshot["memory_usage"]
+            session.memory_limit = snapshot["memory_limit"]
+            session.net_rx_bytes = snapshot["net_rx_bytes"]
+            session.net_tx_bytes = snapshot["net_tx_bytes"]
+            session.uptime = snapshot["uptime"]
+
+    @staticmethod
+    def clear() -> None:
+        with TelemetryService._lock:
+            TelemetryService._streams.clear()
@@ -0,0 +1,137 @@
+import os
+import shlex
+from typing import Any, Callable, List, Mapping
+
+# Options that consume the next argument
+VALUE_OPTIONS = ("--image", "--config", "--profile", "--project", "--name", "--docker-args", "-v", "--volume")
+# Subcommands and options that do not launch a detached session
+NOT_LAUNCHES = ("--help", "update", "stop-hub", "stop", "connect")
+
+Memo = Callable[[str, Callable[[], Any]], Any]
+
+class ToolboxArgs:
+    """Launch options of a `gemini-toolbox` argument vector (defaults as in the toolbox `main()`)."""
+
+    def __init__(self, cwd: str, environ: Mapping[str, str]):
+        self.host_conf_dir = os.path.join(environ.get("HOME", ""), ".gemini")
+        self.profile_mode = False
+        self.project_dir = cwd
+        self.variant = "latest"
+        self.override_image = ""
+        self.use_bash = False
+        self.vscode = environ.get("TERM_PROGRAM") == "vscode"
+        self.enable_docker = True
+        self.localhost_access = True
+        self.remote_mode = self.localhost_mode = self.raw_host = self.no_tmux = False
+        self.detached = self.worktree = False
+        self.tailscale_key = environ.get("GEMINI_REMOTE_KEY", "")
+        self.worktree_name = ""
+        # Extra `docker run` arguments and the arguments passed on to the CLI
+        self.extra: List[str] = []
+        self.args: List[str] = []
+        self.logs: List[str] = []
+
+def read_extra_args(profile: str) -> List[str]:
+    """Reads `<profile>/extra-args` (one or more quoted arguments per line, '#' comments)."""
+    path = os.path.join(profile, "extra-args")
+    if not os.path.isfile(path):
+        return []
+    args: List[str] = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                args.extend(shlex.split(line))
+    return args
+
+def _profile_args(argv: List[str], cwd: str, opts: ToolboxArgs, memo: Memo) -> List[str]:
+    """Pre-scan for --config/--profile: a profile's extra-args go before the command line."""
+    temp_conf, profile_mode, has_config, has_profile = opts.host_conf_dir, False, False, False
+    for i, arg in enumerate(argv):
+        if arg == "--config" and i + 1 < len(argv):
+            temp_conf, profile_mode, has_config = argv[i + 1], False, True
+        elif arg == "--profile" and i + 1 < len(argv):
+            temp_conf, profile_mode, has_profile = argv[i + 1], True, True
+    if has_config and has_profile:
+        raise ValueError("Cannot use both --config and --profile simultaneously.")
+
+    temp_conf = os.path.realpath(os.path.join(cwd, temp_conf))
+    if profile_mode and os.path.isfile(os.path.join(temp_conf, "extra-args")):
+        opts.logs.append(f">> Loading profile args from {temp_conf}/extra-args")
+        return memo(f"extra-args:{temp_conf}", lambda: read_extra_args(temp_conf)) + list(argv)
+    return list(argv)
+
+def parse(argv: List[str], cwd: str, environ: Mapping[str, str], memo: Memo) -> ToolboxArgs:
+    """
+    Port of the toolbox argument handling for detached launches. Raises
+    NotImplementedError for what needs a terminal and ValueError (toolbox
+    message) for user errors.
+    """
+    opts = ToolboxArgs(cwd, environ)
+    rest = _profile_args(argv, cwd, opts, memo)
+    # Pre-scan for Variant & Override Image (the whole vector, as the toolbox does)
+    for i, arg in enumerate(rest):
+        if arg == "--preview":
+            opts.variant = "preview"
+        elif arg == "--image" and i + 1 < len(rest):
+            opts.override_image = rest[i + 1]
+
+    while rest:
+        arg = rest.pop(0)
+        if arg in VALUE_OPTIONS and not rest:
+            raise ValueError(f"{arg} requires a value")
+        if arg == "--preview":
+            opts.variant = "preview"
+        elif arg == "--image":
+            rest.pop(0)
+        elif arg == "--no-ide":
+            opts.vscode = False
+        elif arg == "--no-docker":
+            opts.enable_docker = False
+        elif arg == "--no-tmux":
+            opts.extra += ["--env", "GEMINI_TOOLBOX_TMUX=false"]
+            opts.no_tmux = True
+        elif arg == "--config":
+            opts.host_conf_dir = rest.pop(0)
+        elif arg == "--profile":
+            opts.host_conf_dir, opts.profile_mode = rest.pop(0), True
+        elif arg == "--project":
+            opts.project_dir = rest.pop(0)
+        elif arg == "--bash":
+            opts.use_bash = True
+        elif arg == "--detached":
+            opts.detached = True
+        elif arg == "--no-vpn":
+            opts.localhost_mode = True
+        elif arg == "--no-localhost":
+            opts.localhost_access = False
+        elif arg == "--network-host":
+            opts.raw_host = True
+        elif arg == "--remote":
+            opts.remote_mode = True
+            if rest and rest[0].startswith("tskey-"):
+                opts.tailscale_key = rest.pop(0)
+        elif arg == "--worktree":
+            opts.worktree = True
+        elif arg == "--name":
+            opts.worktree_name = rest.pop(0)
+        elif arg == "--docker-args":
+            # Same as `IFS=' ' read -r -a`: first line, split on spaces
+            opts.extra += [part for part in rest.pop(0).split("\n", 1)[0].split(" ") if part]
+        elif arg in ("-v", "--volume"):
+            opts.extra += ["--volume", rest.pop(0)]
+        elif arg in NOT_LAUNCHES:
+            raise NotImplementedError(f"'{arg}' is not a launch")
+        elif arg == "--":
+            opts.args += rest
+            break
+        else:
+            opts.args.append(arg)
+
+    if not opts.detached:
+        raise NotImplementedError("Foreground sessions require a terminal")
+    if opts.remote_mode and opts.no_tmux:
+        raise ValueError("--remote and --no-tmux are incompatible.")
+    if opts.remote_mode and opts.localhost_mode:
+        raise ValueError("--remote and --no-vpn are incompatible.")
+    return opts
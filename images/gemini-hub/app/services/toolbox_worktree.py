@@ -0,0 +1,72 @@
+import os
+import re
+import uuid
+import subprocess
+from typing import List, Mapping, Optional, Tuple
+from app.services.launch_plan import LaunchPlan
+from app.services.worktree import WorktreeService
+
+def git(args: List[str], cwd: str) -> Optional[str]:
+    """Output of a git command, None if it failed."""
+    try:
+        result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True, timeout=10)
+    except Exception:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def repo_state(project_dir: str) -> Tuple[bool, bool, str]:
+    """(inside a work tree, has a HEAD commit, toplevel) as checked by `setup_worktree`."""
+    inside = git(["rev-parse", "--is-inside-work-tree"], project_dir) is not None
+    has_head = inside and git(["rev-parse", "--verify", "HEAD"], project_dir) is not None
+    toplevel = (git(["rev-parse", "--show-toplevel"], project_dir) or "") if inside else ""
+    return inside, has_head, toplevel
+
+def main_repo_root(project_dir: str) -> str:
+    """Main checkout of a project that is itself a linked worktree, else ''."""
+    toplevel = git(["-C", project_dir, "rev-parse", "--show-toplevel"], project_dir)
+    if toplevel and os.path.isfile(os.path.join(toplevel, ".git")):
+        common_dir = git(["-C", project_dir, "rev-parse", "--git-common-dir"], project_dir)
+        if common_dir:
+            return os.path.dirname(common_dir)
+    return ""
+
+def setup_worktree(base_project_name: str, target_name: Optional[str], project_dir: str, environ: Mapping[str, str],
+                   cache: Optional[LaunchPlan] = None) -> str:
+    """Port of the toolbox `setup_worktree` (same layout, naming and Git commands)."""
+    root = environ.get("GEMINI_WORKTREE_ROOT") or os.path.join(
+        environ.get("XDG_CACHE_HOME") or os.path.join(environ.get("HOME", ""), ".cache"),
+        "gemini-toolbox", "worktrees")
+    base = os.path.join(root, base_project_name)
+
+    def check():
+        return repo_state(project_dir)
+
+    inside, has_head, toplevel = cache.memo(f"repo:{project_dir}", check) if cache else check()
+    if not inside:
+        raise ValueError("--worktree can only be used within a Git repository.")
+    if not has_head:
+        raise ValueError("Cannot create a worktree from an empty repository.")
+    if os.path.isfile(os.path.join(toplevel, ".git")):
+        raise ValueError("--worktree is not supported from within another worktree.")
+
+    if target_name:
+        folder = WorktreeService.branch_folder(target_name)
+    else:
+        worktree_id = re.sub(r"[^A-Za-z0-9]", "", environ.get("GEMINI_WORKTREE_ID", "")) or uuid.uuid4().hex[:8]
+        folder = f"exploration-{worktree_id}"
+    path = os.path.join(base, folder)
+
+    if os.path.isdir(path):
+        return path
+
+    os.makedirs(base, exist_ok=True)
+    if target_name:
+        exists = git(["show-ref", "--verify", "--quiet", f"refs/heads/{target_name}"], project_dir) is not None
+        cmd = ["worktree", "add", path, target_name] if exists else ["worktree", "add", "-b", target_name, path]
+    else:
+        cmd = ["worktree", "add", "--detach", path, "HEAD"]
+    if git(cmd, project_dir) is None:
+        raise ValueError("Failed to create git worktree.")
+
+    WorktreeService.provision(toplevel, path)
+    return path
@@ -0,0 +1,39 @@
+import time
+import threading
+from typing import Any, Dict
+
+class TrafficService:
+    """
+    Counts the Hub's own HTTP traffic so auto-shutdown can tell a user is still
+    around: requests in flight (long-polls and event streams stay in flight
+    until they end) and the time of the last request.
+    """
+
+    _lock = threading.Lock()
+    _in_flight = 0
+    _last_request = 0.0
+
+    @staticmethod
+    def begin() -> None:
+        """`before_request` hook."""
+        with TrafficService._lock:
+            TrafficService._in_flight += 1
+            TrafficService._last_request = time.time()
+
+    @staticmethod
+    def end(exc=None) -> None:
+        """`teardown_request` hook (runs after a streamed response finishes)."""
+        with TrafficService._lock:
+            TrafficService._in_flight = max(0, TrafficService._in_flight - 1)
+            TrafficService._last_request = time.time()
+
+    @staticmethod
+    def snapshot() -> Dict[str, Any]:
+        with TrafficService._lock:
+            return {"in_flight": TrafficService._in_flight, "last_request": TrafficService._last_request}
+
+    @staticmethod
+    def clear() -> None:
+        with TrafficService._lock:
+            TrafficService._in_flight = 0
+            TrafficService._last_request = 0.0
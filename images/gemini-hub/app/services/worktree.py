@@ -0,0 +1,254 @@
+import os
+import re
+import time
+import logging
+import threading
+import subprocess
+from typing import Dict, Any, List, Iterator, Tuple, Optional
+from app.config import Config
+from app.models.worktree import Worktree
+from app.services.session_index import SessionIndexService
+
+logger = logging.getLogger(__name__)
+
+class WorktreeService:
+    """Maintains an incremental inventory of the ephemeral worktree cache."""
+
+    _lock = threading.Lock()
+    _root: Optional[str] = None
+    _entries: Dict[str, Worktree] = {}
+    _last_refresh = 0.0
+    _generation = 0
+
+    @staticmethod
+    def iter_worktrees(root: str) -> Iterator[Tuple[str, str, str]]:
+        """
+        Yields (project, worktree, path) following the root/{project}/{worktree} layout.
+        Hidden folders are reserved for Hub-managed entries (e.g. the worktree pool).
+        """
+        if not os.path.isdir(root):
+            return
+
+        for project_dir in sorted(os.listdir(root)):
+            project_path = os.path.join(root, project_dir)
+            if not os.path.isdir(project_path):
+                continue
+
+            for worktree_dir in sorted(os.listdir(project_path)):
+                worktree_path = os.path.join(project_path, worktree_dir)
+                if worktree_dir.startswith(".") or not os.path.isdir(worktree_path):
+                    continue
+                yield project_dir, worktree_dir, worktree_path
+
+    @staticmethod
+    def project_folder(project_path: str) -> str:
+        """Worktree cache folder of a project (mirrors `base_project_name` in gemini-toolbox)."""
+        return re.sub(r"[^a-z0-9-]", "-", os.path.basename(os.path.normpath(project_path)).lower())
+
+    @staticmethod
+    def branch_folder(branch: str) -> str:
+        """Folder of a named worktree (mirrors `setup_worktree` in gemini-toolbox)."""
+        return re.sub(r"[^A-Za-z0-9._-]", "", branch.replace("/", "-"))
+
+    @staticmethod
+    def gitdir(path: str) -> Optional[str]:
+        """The admin folder of a linked worktree (`.git` file), None if it has none."""
+        try:
+            with open(os.path.join(path, ".git")) as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if not content.startswith("gitdir: "):
+            return None
+        return os.path.normpath(os.path.join(path, content[len("gitdir: "):]))
+
+    @staticmethod
+    def head_mtime(path: str) -> Optional[float]:
+        """mtime of the HEAD file of a worktree's gitdir, None if it has none."""
+        gitdir = WorktreeService.gitdir(path) or os.path.join(path, ".git")
+        try:
+            return os.path.getmtime(os.path.join(gitdir, "HEAD"))
+        except OSError:
+            return None
+
+    @staticmethod
+    def classify(path: str) -> Tuple[str, Optional[str]]:
+        """
+        Determines the Git state of a worktree (ADR-0029).
+        Branch: exit 0, Headless: exit 1, Orphan/Error: anything else.
+        """
+        try:
+            result = subprocess.run(
+                ["git", "-C", path, "symbolic-ref", "-q", "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                ref = (result.stdout or "").strip()
+                return "branch", ref.replace("refs/heads/", "", 1) or None
+            if result.returncode == 1:
+                return "headless", None
+        except Exception as e:
+            logger.debug(f"[Worktree: {path}] Classification failed: {e}")
+        return "orphan", None
+
+    @staticmethod
+    def dir_size(path: str) -> int:
+        """Returns the allocated size of a directory tree, counting hardlinks once."""
+        total = 0
+        seen = set()
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        if st.st_nlink > 1:
+                            key = (st.st_dev, st.st_ino)
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                        total += getattr(st, "st_blocks", 0) * 512 or st.st_size
+            except OSError as e:
+                logger.debug(f"[Worktree: {path}] Cannot scan {current}: {e}")
+        return total
+
+    @staticmethod
+    def provision(template: str, path: str) -> None:
+        """
+        Clones ignored dependency folders from the main checkout into a new
+        worktree (ADR-0063). Reuses the toolbox implementation so worktrees
+        created by the Hub and by `gemini-toolbox` are provisioned identically.
+        """
+        if Config.HUB_WORKTREE_PROVISION == "off":
+            return
+
+        env = os.environ.copy()
+        env["GEMINI_WORKTREE_PROVISION"] = Config.HUB_WORKTREE_PROVISION
+        try:
+            subprocess.run(
+                ["bash", "-c", 'source "$(command -v gemini-toolbox)" && provision_worktree "$1" "$2"', "_", template, path],
+                env=env, capture_output=True, text=True, timeout=600
+            )
+        except Exception as e:
+            logger.warning(f"[Worktree: {path}] Provisioning failed: {e}")
+
+    @staticmethod
+    def refresh(force: bool = False, sizes: bool = True) -> Dict[str, Worktree]:
+        """
+        Incrementally reconciles the inventory with the filesystem.
+        Only new worktrees and those whose gitdir HEAD changed (checkout,
+        commit, deleted admin folder) are re-classified;
+        sizes are recomputed on change or when older than HUB_WORKTREE_SIZE_TTL.
+        Callers that only need state (e.g. the Pruner) can skip sizing.
+        """
+        root = Config.WORKTREE_ROOT
+        now = time.time()
+
+        with WorktreeService._lock:
+            if WorktreeService._root != root:
+                WorktreeService._root = root
+                WorktreeService._entries = {}
+                WorktreeService._last_refresh = 0.0
+
+            if not force and now - WorktreeService._last_refresh < Config.HUB_WORKTREE_INVENTORY_TTL:
+                return dict(WorktreeService._entries)
+
+            previous = WorktreeService._entries
+            current: Dict[str, Worktree] = {}
+            changed = False
+
+            for project, name, path in WorktreeService.iter_worktrees(root):
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+
+                head_mtime = WorktreeService.head_mtime(path)
+                entry = previous.get(path)
+                if entry is None or entry.head_mtime != head_mtime:
+                    entry = entry or Worktree(project, name, path)
+                    entry.head_mtime = head_mtime
+                    entry.state, entry.branch = WorktreeService.classify(path)
+                    changed = True
+                if entry.mtime != mtime:
+                    entry.mtime = mtime
+                    entry.size_checked_at = 0.0
+                    changed = True
+
+                if sizes and now - entry.size_checked_at >= Config.HUB_WORKTREE_SIZE_TTL:
+                    entry.size_bytes = WorktreeService.dir_size(path)
+                    entry.size_checked_at = now
+
+                current[path] = entry
+
+            if changed or current.keys() != previous.keys():
+                WorktreeService._generation += 1
+
+            WorktreeService._entries = current
+            WorktreeService._last_refresh = now
+            return dict(current)
+
+    @staticmethod
+    def forget(path: str) -> None:
+        """Drops a worktree from the inventory (e.g. after pruning)."""
+        with WorktreeService._lock:
+            if WorktreeService._entries.pop(path, None) is not None:
+                WorktreeService._generation += 1
+
+    @staticmethod
+    def dump() -> List[Dict[str, Any]]:
+        """Inventory entries including the fields needed to restore them."""
+        with WorktreeService._lock:
+            return [dict(e.to_dict(), size_checked_at=e.size_checked_at, head_mtime=e.head_mtime)
+                    for e in WorktreeService._entries.values()]
+
+    @staticmethod
+    def restore(root: Optional[str], entries: List[Dict[str, Any]]) -> None:
+        """
+        Seeds an empty inventory from `dump()` output (warm start). The next
+        refresh still reconciles with the filesystem, but only re-classifies
+        worktrees whose gitdir HEAD changed since.
+        """
+        if root != Config.WORKTREE_ROOT:
+            return
+        with WorktreeService._lock:
+            if WorktreeService._entries:
+                return
+            for data in entries:
+                entry = Worktree(data["project"], data["name"], data["path"])
+                entry.state, entry.branch = data.get("state", "orphan"), data.get("branch")
+                entry.mtime = data.get("last_activity", 0.0)
+                entry.head_mtime = data.get("head_mtime")
+                entry.size_bytes = data.get("size_bytes")
+                entry.size_checked_at = data.get("size_checked_at", 0.0)
+                WorktreeService._entries[entry.path] = entry
+            WorktreeService._root = root
+            WorktreeService._last_refresh = 0.0
+
+    @staticmethod
+    def generation() -> int:
+        """Monotonic counter bumped whenever the inventory content changes."""
+        return WorktreeService._generation
+
+    @staticmethod
+    def get_inventory(force: bool = False) -> List[Dict[str, Any]]:
+        """Returns the inventory as a list of dicts, enriched with running sessions."""
+        entries = WorktreeService.refresh(force=force)
+        index = SessionIndexService.get() if entries else None
+
+        inventory = []
+        for path, entry in entries.items():
+            entry.sessions = index.sessions_for(path) if index else []
+            inventory.append(entry.to_dict())
+
+        inventory.sort(key=lambda x: (x["project"], x["name"]))
+        return inventory
@@ -0,0 +1,299 @@
+import os
+import uuid
+import shutil
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional, Set
+from app.config import Config
+from app.services.worktree import WorktreeService
+
+logger = logging.getLogger(__name__)
+
+class WorktreePoolService:
+    """
+    Keeps pre-created detached worktrees ready for the most frequently used
+    projects so that worktree launches only pay for the container start.
+
+    Pool entries live next to regular worktrees as hidden folders:
+    root/{project}/.pool-{id} (ready) and root/{project}/.pool-tmp-{id} (being built).
+    """
+
+    PREFIX = ".pool-"
+    STAGING_PREFIX = ".pool-tmp-"
+
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    _usage: Dict[str, int] = {}
+    # False until usage is known (a claim, or a restore from the snapshot):
+    # until then every ready entry would look unwanted to `reclaim`
+    _usage_known = False
+    # Entries being built or claimed: refills, other claims and reclaim leave them alone
+    _busy: Set[str] = set()
+    # Entries finished since the current reclaim pass computed what to keep
+    _built: Set[str] = set()
+
+    @staticmethod
+    def start():
+        """Launch the background refill thread."""
+        if Config.HUB_WORKTREE_POOL_SIZE <= 0:
+            logger.debug("Worktree pool disabled.")
+            return
+
+        logger.info(f"Worktree pool started (Size: {Config.HUB_WORKTREE_POOL_SIZE} per project, {Config.HUB_WORKTREE_POOL_PROJECTS} projects).")
+        threading.Thread(target=WorktreePoolService._refill_loop, daemon=True).start()
+
+    @staticmethod
+    def _refill_loop():
+        """Refills and refreshes the pool after claims and periodically."""
+        while True:
+            WorktreePoolService._wakeup.wait(Config.HUB_WORKTREE_POOL_REFRESH_INTERVAL)
+            WorktreePoolService._wakeup.clear()
+            try:
+                WorktreePoolService.refill()
+            except Exception as e:
+                logger.error(f"Worktree pool error: {e}")
+
+    @staticmethod
+    def _git(args: List[str], timeout: int = 10) -> Optional[subprocess.CompletedProcess]:
+        try:
+            return subprocess.run(["git"] + args, capture_output=True, text=True, timeout=timeout)
+        except Exception as e:
+            logger.debug(f"git {' '.join(args)} failed: {e}")
+            return None
+
+    @staticmethod
+    def _repo(project_path: str) -> Optional[str]:
+        """Returns the main checkout of a project, or None if it cannot host worktrees."""
+        result = WorktreePoolService._git(["-C", project_path, "rev-parse", "--show-toplevel"])
+        if not result or result.returncode != 0:
+            return None
+        toplevel = result.stdout.strip()
+        # Worktrees of worktrees are not supported by gemini-toolbox
+        return toplevel if os.path.isdir(os.path.join(toplevel, ".git")) else None
+
+    @staticmethod
+    def _head(path: str) -> Optional[str]:
+        result = WorktreePoolService._git(["-C", path, "rev-parse", "HEAD"])
+        return result.stdout.strip() if result and result.returncode == 0 else None
+
+    @staticmethod
+    def _base(project_path: str) -> str:
+        return os.path.join(Config.WORKTREE_ROOT, WorktreeService.project_folder(project_path))
+
+    @staticmethod
+    def entries(project_path: str, repo: str) -> List[str]:
+        """Ready pool entries of a project, oldest first."""
+        base = WorktreePoolService._base(project_path)
+        try:
+            names = os.listdir(base)
+        except OSError:
+            return []
+
+        found = []
+        for name in names:
+            path = os.path.join(base, name)
+            if not name.startswith(WorktreePoolService.PREFIX) or name.startswith(WorktreePoolService.STAGING_PREFIX) \
+                    or path in WorktreePoolService._busy:
+                continue
+            # Projects may share a folder name: keep the entries of this repository
+            gitdir = WorktreeService.gitdir(path)
+            if gitdir and gitdir.startswith(os.path.join(repo, ".git", "worktrees") + os.sep):
+                found.append(path)
+        return sorted(found, key=lambda p: os.path.getmtime(p))
+
+    @staticmethod
+    def _projects() -> List[str]:
+        """The most frequently launched projects that get a pool."""
+        with WorktreePoolService._lock:
+            ranked = sorted(WorktreePoolService._usage.items(), key=lambda x: -x[1])
+        return [path for path, _ in ranked[:Config.HUB_WORKTREE_POOL_PROJECTS]]
+
+    @staticmethod
+    def dump() -> Dict[str, int]:
+        """Launch counts per project, for the warm-start snapshot."""
+        with WorktreePoolService._lock:
+            return dict(WorktreePoolService._usage)
+
+    @staticmethod
+    def restore(usage: Dict[str, int]) -> None:
+        """Seeds the usage ranking from `dump()` output (merged with claims since boot)."""
+        with WorktreePoolService._lock:
+            for path, count in usage.items():
+                WorktreePoolService._usage[path] = WorktreePoolService._usage.get(path, 0) + count
+            WorktreePoolService._usage_known = True
+        WorktreePoolService._wakeup.set()
+
+    @staticmethod
+    def claim(project_path: str, worktree_name: Optional[str] = None) -> Optional[str]:
+        """
+        Moves a pool entry to the folder gemini-toolbox will use for this launch
+        and returns its path, or None if the pool cannot serve the request (the
+        toolbox then creates the worktree itself). Named launches are only served
+        for new branches.
+        """
+        if Config.HUB_WORKTREE_POOL_SIZE <= 0:
+            return None
+
+        project_path = os.path.realpath(project_path)
+        with WorktreePoolService._lock:
+            WorktreePoolService._usage[project_path] = WorktreePoolService._usage.get(project_path, 0) + 1
+            WorktreePoolService._usage_known = True
+        WorktreePoolService._wakeup.set()
+
+        repo = WorktreePoolService._repo(project_path)
+        if not repo:
+            return None
+
+        base = WorktreePoolService._base(project_path)
+        if worktree_name:
+            target = os.path.join(base, WorktreeService.branch_folder(worktree_name))
+            exists = WorktreePoolService._git(["-C", repo, "show-ref", "--verify", "--quiet", f"refs/heads/{worktree_name}"])
+            if not exists or exists.returncode != 1:
+                return None
+        else:
+            target = os.path.join(base, f"exploration-{uuid.uuid4().hex[:8]}")
+
+        if os.path.exists(target):
+            return None
+
+        # Reserve the entry under the lock; git runs outside of it
+        with WorktreePoolService._lock:
+            available = WorktreePoolService.entries(project_path, repo)
+            if not available:
+                logger.debug(f"Worktree pool empty for {project_path}.")
+                return None
+            entry = available[0]
+            WorktreePoolService._busy.add(entry)
+        try:
+            # Match what `git worktree add ... HEAD` would have produced right now
+            head = WorktreePoolService._head(repo)
+            if head and WorktreePoolService._head(entry) != head:
+                WorktreePoolService._git(["-C", entry, "checkout", "-q", "--detach", head], timeout=60)
+
+            moved = WorktreePoolService._git(["-C", repo, "worktree", "move", entry, target], timeout=30)
+            if not moved or moved.returncode != 0:
+                logger.warning(f"Failed to claim pool entry {entry}: {moved.stderr if moved else 'git error'}")
+                return None
+        finally:
+            with WorktreePoolService._lock:
+                WorktreePoolService._busy.discard(entry)
+
+        if worktree_name:
+            checkout = WorktreePoolService._git(["-C", target, "checkout", "-q", "-b", worktree_name])
+            if not checkout or checkout.returncode != 0:
+                logger.warning(f"Failed to create branch '{worktree_name}' in pooled worktree. Falling back.")
+                WorktreePoolService._git(["-C", repo, "worktree", "remove", "--force", target], timeout=30)
+                return None
+
+        logger.info(f"Claimed pooled worktree for {project_path}: {target}")
+        return target
+
+    @staticmethod
+    def _build(project_path: str, repo: str) -> Optional[str]:
+        """Creates one pool entry (staged, then renamed once fully checked out)."""
+        entry_id = uuid.uuid4().hex[:8]
+        base = WorktreePoolService._base(project_path)
+        staging = os.path.join(base, f"{WorktreePoolService.STAGING_PREFIX}{entry_id}")
+        final = os.path.join(base, f"{WorktreePoolService.PREFIX}{entry_id}")
+
+        with WorktreePoolService._lock:
+            WorktreePoolService._busy.add(staging)
+        try:
+            os.makedirs(base, exist_ok=True)
+            created = WorktreePoolService._git(["-C", repo, "worktree", "add", "-q", "--detach", staging, "HEAD"], timeout=300)
+            if not created or created.returncode != 0:
+                logger.warning(f"Failed to create pool entry for {project_path}: {created.stderr if created else 'git error'}")
+                return None
+
+            WorktreeService.provision(repo, staging)
+
+            moved = WorktreePoolService._git(["-C", repo, "worktree", "move", staging, final], timeout=30)
+            if not moved or moved.returncode != 0:
+                return None
+            with WorktreePoolService._lock:
+                WorktreePoolService._built.add(final)
+            return final
+        except Exception as e:
+            logger.warning(f"Failed to build pool entry for {project_path}: {e}")
+            return None
+        finally:
+            with WorktreePoolService._lock:
+                WorktreePoolService._busy.discard(staging)
+
+    @staticmethod
+    def refill() -> int:
+        """
+        Brings each pooled project to HUB_WORKTREE_POOL_SIZE entries and moves
+        existing entries to the latest HEAD. Returns the number of entries built.
+        """
+        built = 0
+        for project_path in WorktreePoolService._projects():
+            repo = WorktreePoolService._repo(project_path)
+            if not repo:
+                continue
+
+            head = WorktreePoolService._head(repo)
+            available = WorktreePoolService.entries(project_path, repo)
+            for entry in available[:Config.HUB_WORKTREE_POOL_SIZE]:
+                if head and WorktreePoolService._head(entry) != head:
+                    WorktreePoolService._git(["-C", entry, "checkout", "-q", "--detach", head], timeout=120)
+
+            for _ in range(Config.HUB_WORKTREE_POOL_SIZE - len(available)):
+                if WorktreePoolService._build(project_path, repo):
+                    built += 1
+
+        if built:
+            logger.info(f"Worktree pool refilled ({built} new entries).")
+        return built
+
+    @staticmethod
+    def reclaim(root: str) -> int:
+        """
+        Removes pool entries that are no longer wanted: entries of projects that
+        dropped out of the pool, surplus entries, and leftovers from interrupted
+        builds. Called by the Pruner. Returns the number of entries removed.
+        Ready entries are left alone until the usage ranking is known.
+        """
+        with WorktreePoolService._lock:
+            usage_known = WorktreePoolService._usage_known
+            WorktreePoolService._built.clear()
+
+        keep: Set[str] = set()
+        for project_path in WorktreePoolService._projects():
+            repo = WorktreePoolService._repo(project_path)
+            if repo:
+                keep.update(WorktreePoolService.entries(project_path, repo)[:Config.HUB_WORKTREE_POOL_SIZE])
+
+        removed = 0
+        if not os.path.isdir(root):
+            return removed
+
+        for project_dir in os.listdir(root):
+            project_path = os.path.join(root, project_dir)
+            if not os.path.isdir(project_path):
+                continue
+            for name in os.listdir(project_path):
+                path = os.path.join(project_path, name)
+                if not name.startswith(WorktreePoolService.PREFIX) or path in keep:
+                    continue
+                if not usage_known and not name.startswith(WorktreePoolService.STAGING_PREFIX):
+                    continue
+                # Rename under the lock so a concurrent claim cannot pick it up,
+                # then delete outside of it so launches are not blocked.
+                with WorktreePoolService._lock:
+                    if path in WorktreePoolService._busy or path in WorktreePoolService._built:
+                        continue
+                    doomed = os.path.join(project_path, f"{WorktreePoolService.STAGING_PREFIX}reclaim-{uuid.uuid4().hex[:8]}")
+                    try:
+                        os.rename(path, doomed)
+                    except OSError as e:
+                        logger.error(f"Failed to remove {path}: {e}")
+                        continue
+                try:
+                    shutil.rmtree(doomed)
+                    removed += 1
+                    logger.info(f"Reclaimed unused pool worktree: {path}")
+                except Exception as e:
+                    logger.error(f"Failed to remove {path}: {e}")
+        return removed
@@ -2,9 +2,48 @@ let currentPath = "";
 let selectedConfig = "";
 
 document.addEventListener("DOMContentLoaded", () => {
+    if (document.getElementById('tailnetBanner')) {
+        waitForTailnet();
+    }
+    if (document.getElementById('staleBanner')) {
+        waitForLiveSessions();
+        return; // Snapshot data: probing stale sessions would only time out
+    }
     checkConnectivity();
 });
 
+/**
+ * Reloads the page once the tailnet is up (or failed), so VPN sessions appear.
+ */
+async function waitForTailnet() {
+    while (true) {
+        await new Promise(r => setTimeout(r, 2000));
+        try {
+            const res = await fetch('/api/tailscale');
+            if (res.ok && (await res.json()).state !== 'initialising') break;
+        } catch (e) {
+            // Transient error: keep waiting
+        }
+    }
+    window.location.reload();
+}
+
+/**
+ * Reloads the page once live discovery has replaced the warm-start snapshot.
+ */
+async function waitForLiveSessions() {
+    while (true) {
+        await new Promise(r => setTimeout(r, 1000));
+        try {
+            const res = await fetch('/api/snapshot');
+            if (res.ok && !(await res.json()).stale) break;
+        } catch (e) {
+            // Hub still starting: keep waiting
+        }
+    }
+    window.location.reload();
+}
+
 async function checkConnectivity() {
     const cards = document.querySelectorAll('.card');
     
@@ -13,6 +52,7 @@ async function checkConnectivity() {
         const mainLink = card.querySelector('.card-main-link');
         
         if (!localBadge) continue; // Offline or no local port
+        if (card.dataset.paused === 'true') continue; // Frozen: would only time out
         
         const localUrl = localBadge.getAttribute('data-local-url');
         const vpnUrl = mainLink.href; // Original VPN URL from template
@@ -128,6 +168,56 @@ async function stopSession(sessionId) {
     }
 }
 
+async function setSessionFrozen(sessionId, pause) {
+    const res = await fetch(pause ? '/api/sessions/pause' : '/api/sessions/resume', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ session_id: sessionId })
+    });
+    const result = await res.json();
+    if (result.status !== 'success') {
+        throw new Error(result.error || `Failed to ${pause ? 'pause' : 'resume'} session`);
+    }
+}
+
+async function pauseSession(sessionId) {
+    const btn = document.querySelector(`.card[data-id="${sessionId}"] .pause-btn`);
+    btn.disabled = true;
+    try {
+        await setSessionFrozen(sessionId, true);
+        window.location.reload();
+    } catch (e) {
+        alert("Error: " + e.message);
+        btn.disabled = false;
+    }
+}
+
+async function resumeSession(sessionId) {
+    const btn = document.querySelector(`.card[data-id="${sessionId}"] .pause-btn`);
+    btn.disabled = true;
+    try {
+        await setSessionFrozen(sessionId, false);
+        window.location.reload();
+    } catch (e) {
+        alert("Error: " + e.message);
+        btn.disabled = false;
+    }
+}
+
+/**
+ * Opening a paused session thaws it first, then follows the link.
+ */
+function resumeAndOpen(event, sessionId) {
+    event.preventDefault();
+    const url = event.currentTarget.href;
+    // Open synchronously so popup blockers allow it; navigate once resumed
+    const win = window.open('about:blank', '_blank');
+    setSessionFrozen(sessionId, false)
+        .then(() => { if (win) win.location = url; window.location.reload(); })
+        .catch((e) => { if (win) win.close(); alert("Error: " + e.message); });
+    return false;
+}
+
 // --- Wizard Logic ---
 
 function openWizard() {
@@ -421,6 +511,73 @@ async function loadConfigDetails() {
     }
 }
 
+/**
+ * fetch() that retries network failures (not HTTP errors) with a short backoff.
+ * Only safe for idempotent requests.
+ */
+async function fetchWithRetry(url, options, attempts = 3) {
+    for (let i = 1; ; i++) {
+        try {
+            return await fetch(url, options);
+        } catch (e) {
+            if (i >= attempts) throw e;
+            await new Promise(r => setTimeout(r, 500 * i));
+        }
+    }
+}
+
+/**
+ * Follows a launch job over Server-Sent Events, appending output lines to `logPre`
+ * and showing the admission queue position in `status`.
+ * Resolves with the launch result carried by the final `done` event.
+ */
+function streamLaunchJob(job, logPre, status) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(job.events_url);
+        source.addEventListener('queued', (e) => {
+            const position = JSON.parse(e.data).position;
+            status.innerText = position > 0 ? `⏳ Waiting for host capacity (position ${position} in queue)...` : "⏳ Launching...";
+        });
+        source.addEventListener('output', (e) => {
+            logPre.innerText += e.data + "\n";
+            logPre.scrollTop = logPre.scrollHeight;
+        });
+        source.addEventListener('done', (e) => {
+            source.close();
+            resolve(JSON.parse(e.data));
+        });
+        // Transient errors reconnect automatically (resuming via Last-Event-ID)
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                reject(new Error("Lost connection to launch job " + job.job_id));
+            }
+        };
+    });
+}
+
+/**
+ * Long-polls the Hub's readiness probe for a session, calling `onUpdate` with
+ * each new state until it is final (ready, failed or timeout).
+ */
+async function waitForReadiness(hostname, onUpdate) {
+    let version = 0;
+    for (let errors = 0; errors < 3;) {
+        try {
+            const res = await fetch(`/api/sessions/${encodeURIComponent(hostname)}/readiness?version=${version}`);
+            if (!res.ok) return;
+            const state = await res.json();
+            errors = 0;
+            if (state.version !== version) onUpdate(state);
+            version = state.version;
+            if (state.status !== 'probing') return;
+        } catch (e) {
+            errors++;
+            console.error("Readiness poll failed", e);
+            await new Promise(r => setTimeout(r, 1000 * errors));
+        }
+    }
+}
+
 async function doLaunch() {
     const btn = document.getElementById('launch-btn');
     const backBtn = document.getElementById('launch-back-btn');
@@ -447,9 +604,11 @@ async function doLaunch() {
     results.style.display = "none";
 
     try {
-        const res = await fetch('/api/launch', {
+        // One key per launch attempt: retries after a dropped connection reuse the same job
+        const idempotencyKey = (window.crypto && crypto.randomUUID) ? crypto.randomUUID() : `${Date.now()}-${Math.random()}`;
+        const res = await fetchWithRetry('/api/launch/jobs', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
             body: JSON.stringify({
                 project_path: currentPath,
                 config_profile: config,
@@ -465,9 +624,17 @@ async function doLaunch() {
                 interactive: interactive
             })
         });
-        const result = await res.json();
-        
+        const job = await res.json();
+
+        // Show the log right away and stream lines into it while the launch runs
         results.style.display = "block";
+        cmdSpan.innerText = "...";
+        status.innerText = "⏳ Launching...";
+        status.style.color = "";
+        logPre.innerText = "";
+
+        const result = (res.status === 202) ? await streamLaunchJob(job, logPre, status) : job;
+        
         cmdSpan.innerText = result.command || "???";
         const output = (result.stdout || "") + "\n" + (result.stderr || "");
         logPre.innerText = output;
@@ -477,32 +644,30 @@ async function doLaunch() {
             status.innerText = "✅ Session launched!";
             status.style.color = "var(--accent)";
             
-            // Try to extract hostname to offer direct connect
+            // The launch result names the session (older results: parse the log)
             const match = output.match(/Container started: (gem-[a-zA-Z0-9-]+)/);
-            if (match && match[1]) {
-                const hostname = match[1];
-                
+            const hostname = result.session || (match && match[1]);
+            if (hostname) {
                 // 1. Default to VPN Button
                 btn.innerText = "Connect (VPN) 🚀";
                 btn.onclick = () => window.open(`http://${hostname}:3000`, '_blank');
                 btn.style.display = "block";
-                
-                // 2. Upgrade to Local Button (if on host)
-                if (['localhost', '127.0.0.1'].includes(window.location.hostname)) {
-                    // Poll briefly for the port mapping to appear
-                    setTimeout(async () => {
-                        try {
-                            const res = await fetch(`/api/resolve-local-url?hostname=${hostname}`);
-                            const data = await res.json();
-                            if (data.url) {
-                                // Smart Upgrade: Change the main button to Local
-                                btn.innerText = "Connect (Local) ⚡";
-                                btn.onclick = () => window.open(data.url, '_blank');
-                                btn.style.border = "1px solid var(--accent)";
-                            }
-                        } catch (e) { console.error("Failed to resolve local url", e); }
-                    }, 1500); // Wait 1.5s for Docker to map ports
-                }
+
+                // 2. Follow the server-side readiness probe; upgrade to Local (if on host)
+                const onHost = ['localhost', '127.0.0.1'].includes(window.location.hostname);
+                waitForReadiness(hostname, (state) => {
+                    if (onHost && state.checks.http && state.local_url) {
+                        // Smart Upgrade: Change the main button to Local
+                        btn.innerText = "Connect (Local) ⚡";
+                        btn.onclick = () => window.open(state.local_url, '_blank');
+                        btn.style.border = "1px solid var(--accent)";
+                    }
+                    if (state.ready) {
+                        status.innerText = "✅ Session ready!";
+                    } else if (state.status === 'probing') {
+                        status.innerText = "✅ Session launched! Waiting for it to come up...";
+                    }
+                });
             }
 
             backBtn.innerText = "Done";
@@ -1,9 +1,15 @@
 from flask import Blueprint, render_template
 from app.services.discovery import DiscoveryService
+from app.services.snapshot import SnapshotService
+from app.services.tailscale import TailscaleService
 
 web = Blueprint('web', __name__)
 
 @web.route('/')
 def home():
-    machines = DiscoveryService().get_sessions()
-    return render_template('index.html', machines=machines)
+    # Right after a (re)start, the last known sessions are shown until live discovery completes
+    machines = SnapshotService.stale_sessions()
+    stale = machines is not None
+    if not stale:
+        machines = DiscoveryService().get_sessions()
+    return render_template('index.html', machines=machines, stale=stale, tailnet=TailscaleService.state())
@@ -34,9 +34,26 @@ main() {
     log_info "Starting Tailscaled..."
     mkdir -p /var/lib/tailscale
     mkdir -p "$SOCKET_DIR"
+    # A socket left by a previous run of this container would look ready
+    rm -f "$SOCKET_PATH"
     # Note: We omit --tun=userspace-networking to enable Kernel TUN mode for stability
     tailscaled --statedir=/var/lib/tailscale --socket="$SOCKET_PATH" &
-    sleep 3
+    local TAILSCALED_PID=$!
+
+    # 1.1 Wait for the daemon socket (instead of a fixed delay)
+    local deadline=$(( SECONDS + ${HUB_TAILSCALED_TIMEOUT:-15} ))
+    until [ -e "$SOCKET_PATH" ]; do
+        if ! kill -0 "$TAILSCALED_PID" 2>/dev/null && [ ! -e "$SOCKET_PATH" ]; then
+            log_error "tailscaled exited before opening $SOCKET_PATH."
+            exit 1
+        fi
+        if [ "$SECONDS" -ge "$deadline" ]; then
+            log_error "tailscaled did not open $SOCKET_PATH within ${HUB_TAILSCALED_TIMEOUT:-15}s."
+            exit 1
+        fi
+        sleep 0.1
+    done
+    log_debug "Tailscaled ready."
 
     # 2. Authenticate
     if [ -z "${TAILSCALE_AUTH_KEY:-}" ]; then
@@ -47,10 +64,19 @@ main() {
     log_info "Authenticating with Tailscale..."
     # Fixed hostname for consistent DNS (http://gemini-hub:8888)
     # --force-reauth: Aggressively reclaim the 'gemini-hub' name if state was lost
+    # Runs in the background: the Hub serves localhost while the tailnet comes up.
+    # A failure is left in UP_FAILED_PATH for the Hub to report.
     local HOSTNAME="gemini-hub"
-    tailscale --socket="$SOCKET_PATH" up --authkey="$TAILSCALE_AUTH_KEY" --hostname="$HOSTNAME" --force-reauth
-
-    log_info "Gemini Hub Online: http://$HOSTNAME:8888"
+    local UP_FAILED_PATH="${SOCKET_DIR}/up-failed"
+    rm -f "$UP_FAILED_PATH"
+    (
+        if up_output=$(tailscale --socket="$SOCKET_PATH" up --authkey="$TAILSCALE_AUTH_KEY" --hostname="$HOSTNAME" --force-reauth 2>&1); then
+            log_info "Gemini Hub Online: http://$HOSTNAME:8888"
+        else
+            log_error "Tailscale authentication failed: $up_output"
+            echo "$up_output" > "$UP_FAILED_PATH"
+        fi
+    ) &
     
     # 2.1 User Creation: Create a non-root user matching the host UID/GID
     # This allows the Flask app to safely operate on host-mounted volumes
@@ -94,6 +120,10 @@ main() {
     # Allow the non-root user to talk to the Tailscale daemon
     chown "$TARGET_USER" "$SOCKET_DIR" "$SOCKET_PATH"
 
+    # 2.4 Hub State: warm-start snapshot in the persistent state volume
+    mkdir -p /var/lib/tailscale/hub
+    chown "$TARGET_USER" /var/lib/tailscale/hub
+
     # 2.3 Docker-out-of-Docker Setup
     local DOCKER_SOCK="${DOCKER_SOCK:-/var/run/docker.sock}"
     if [ -n "${HOST_DOCKER_GID:-}" ] && [ -S "$DOCKER_SOCK" ]; then
@@ -1,13 +1,46 @@
-from app import create_app
-from app.services.monitor import MonitorService
-from app.services.prune import PruneService
+from app.config import Config
+from app.services.startup import StartupService
 
+# Time every hub module import from here on (HUB_STARTUP_PROFILE=true)
+if Config.HUB_STARTUP_PROFILE:
+    StartupService.profile_imports()
+
+import signal  # noqa: E402
+from app import create_app  # noqa: E402
+from app.services.idle_policy import IdlePolicyService  # noqa: E402
+from app.services.image import ImageService  # noqa: E402
+from app.services.monitor import MonitorService  # noqa: E402
+from app.services.prune import PruneService  # noqa: E402
+from app.services.shutdown import ShutdownService  # noqa: E402
+from app.services.snapshot import SnapshotService  # noqa: E402
+from app.services.telemetry import TelemetryService  # noqa: E402
+from app.services.worktree_pool import WorktreePoolService  # noqa: E402
+
+StartupService.mark("imports")
 app = create_app()
+StartupService.mark("create_app")
 
 if __name__ == '__main__':
-    # Start background services
-    MonitorService.start()
-    PruneService.start()
-    
+    # `docker stop` drains like an idle shutdown
+    signal.signal(signal.SIGTERM, lambda signum, frame: ShutdownService.shutdown("SIGTERM"))
+
+    # Serve the last known state until live discovery reconciles
+    SnapshotService.start()
+
+    # Background services start once the server is answering
+    port = 8888
+    services = [
+        SnapshotService.start_reconcile,
+        MonitorService.start,
+        PruneService.start,
+        WorktreePoolService.start,
+        ImageService.start,
+        TelemetryService.start,
+        IdlePolicyService.start,
+    ]
+    if Config.HUB_STARTUP_PROFILE:
+        services.append(StartupService.log_report)
+    StartupService.start_background(services, port, Config.HUB_BACKGROUND_START_DELAY)
+
     # Listen on all interfaces so the host (and mapped ports) can reach it
-    app.run(host='0.0.0.0', port=8888)
+    app.run(host='0.0.0.0', port=port)
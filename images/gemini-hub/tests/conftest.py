@@ -17,6 +17,7 @@ def app(monkeypatch: pytest.MonkeyPatch) -> Flask:
     monkeypatch.setattr(Config, "HOST_CONFIG_ROOT", "/mock/config")
     monkeypatch.setattr(Config, "TAILSCALE_AUTH_KEY", "mock-key")
     monkeypatch.setattr(Config, "HUB_AUTO_SHUTDOWN", False)
+    monkeypatch.setattr(Config, "HUB_SESSION_MEMORY_MB", 0)
 
     app = create_app()
     return app
@@ -1,4 +1,5 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+from app.config import Config
 
 def test_get_roots(client):
     """Test getting workspace roots."""
@@ -215,3 +216,233 @@ def test_resolve_local_url_empty_hostname(client):
     resp = client.get("/api/resolve-local-url?hostname=")
     assert resp.status_code == 200
     assert resp.json["url"] is None
+
+def test_get_worktrees(client):
+    """Test listing the worktree inventory."""
+    inventory = [{"project": "app", "name": "feat", "state": "branch", "sessions": []}]
+    with patch("app.api.routes.WorktreeService.get_inventory", return_value=inventory) as mock_inv:
+        response = client.get('/api/worktrees')
+        assert response.status_code == 200
+        assert response.json == {"worktrees": inventory}
+        mock_inv.assert_called_once_with(force=False)
+
+def test_get_worktrees_force_refresh(client):
+    """Test forcing an inventory refresh."""
+    with patch("app.api.routes.WorktreeService.get_inventory", return_value=[]) as mock_inv:
+        response = client.get('/api/worktrees?refresh=true')
+        assert response.status_code == 200
+        mock_inv.assert_called_once_with(force=True)
+
+def test_api_worktrees_generic_exception(client):
+    """Trigger generic Exception handler in /worktrees for coverage."""
+    with patch("app.api.routes.WorktreeService.get_inventory", side_effect=Exception("Generic Error")):
+        resp = client.get("/api/worktrees")
+        assert resp.status_code == 500
+        assert resp.json["error"] == "Generic Error"
+
+def test_launch_job_streams_events(client):
+    """A launch job returns 202 and its events endpoint streams output then the result."""
+    def fake_launch(on_output, **kwargs):
+        on_output(">> Pulling image...")
+        return {"returncode": 0, "stdout": "", "stderr": "", "command": "cmd"}
+
+    with patch("app.services.launch_jobs.LauncherService.launch", side_effect=fake_launch):
+        response = client.post('/api/launch/jobs', json={"project_path": "/mock/root/work"})
+        assert response.status_code == 202
+        job_id = response.json["job_id"]
+
+        events = client.get(response.json["events_url"])
+        assert events.mimetype == "text/event-stream"
+        body = events.get_data(as_text=True)
+        assert "event: output\ndata: >> Pulling image..." in body
+        assert '"status": "success"' in body
+
+    assert client.get(f'/api/launch/jobs/{job_id}').json["status"] == "done"
+
+def test_launch_job_validation(client):
+    """Launch jobs reject missing and unsafe paths before starting, unknown jobs are 404."""
+    assert client.post('/api/launch/jobs', json={}).status_code == 400
+    assert client.post('/api/launch/jobs', json={"project_path": "/etc"}).status_code == 403
+    assert client.get('/api/launch/jobs/unknown').status_code == 404
+    assert client.get('/api/launch/jobs/unknown/events').status_code == 404
+
+def test_images_status_and_pull(client):
+    """The images API reports tracked images and schedules pulls."""
+    images = [{"image": "img:1", "source": "standard", "status": "pulling", "progress": {"current": 1, "total": 2}}]
+    with patch("app.api.routes.ImageService.status", return_value=images):
+        assert client.get('/api/images').json == {"images": images}
+
+    with patch("app.api.routes.ImageService.track") as track, \
+         patch("app.api.routes.ImageService.pull", return_value=True) as pull:
+        response = client.post('/api/images/pull', json={"image": "team/tool:1"})
+        assert response.status_code == 202
+        track.assert_called_once_with("team/tool:1")
+        pull.assert_called_once_with("team/tool:1")
+
+    assert client.post('/api/images/pull', json={}).status_code == 400
+
+def test_launch_queue_and_admission_timeout(client):
+    """The queue endpoint exposes admission state; a sync launch that never gets capacity is a 503."""
+    state = {"queued": 1, "launching": 2, "limits": {}, "capacity": {}}
+    with patch("app.api.routes.AdmissionService.status", return_value=state):
+        assert client.get('/api/launch/queue').json == state
+
+    with patch("app.api.routes.AdmissionService.admit", side_effect=TimeoutError("Timed out waiting for host capacity")):
+        response = client.post('/api/launch', json={"project_path": "/work"})
+        assert response.status_code == 503
+        assert "capacity" in response.json["error"]
+
+def test_launch_resource_fields(client):
+    """Resource fields are passed through and invalid values are a 400 on both launch endpoints."""
+    mock_result = {"returncode": 0, "stdout": "", "stderr": "", "command": "..."}
+    with patch("app.api.routes.LauncherService.launch", return_value=mock_result) as launch:
+        client.post('/api/launch', json={"project_path": "/work", "cpus": 1, "memory": "2g", "cpuset": ""})
+        assert launch.call_args.kwargs["resources"] == {"cpus": 1, "memory": "2g"}
+
+    response = client.post('/api/launch/jobs', json={"project_path": "/mock/root/work", "io_weight": 1})
+    assert response.status_code == 400
+    assert "io_weight" in response.json["error"]
+
+    with patch("app.api.routes.LauncherService.launch", side_effect=ValueError("cpus must be between 0 and 4")):
+        assert client.post('/api/launch', json={"project_path": "/work", "cpus": 9}).status_code == 400
+
+def test_launch_idempotency_key_replays_result(client):
+    """Retries carrying the same Idempotency-Key return the first result without relaunching."""
+    mock_result = {"returncode": 0, "stdout": "gem-1", "stderr": "", "command": "..."}
+    headers = {"Idempotency-Key": "retry-test-1"}
+    with patch("app.api.routes.LauncherService.launch", return_value=mock_result) as launch:
+        first = client.post('/api/launch', json={"project_path": "/work"}, headers=headers)
+        retry = client.post('/api/launch', json={"project_path": "/work"}, headers=headers)
+        assert launch.call_count == 1
+        assert first.json["deduplicated"] is False
+        assert retry.json["deduplicated"] is True
+        assert retry.json["stdout"] == "gem-1"
+
+        other = client.post('/api/launch', json={"project_path": "/other"}, headers=headers)
+        assert other.status_code == 400
+
+def test_launch_idempotency_key_retries_failed_launch(client):
+    """A failed launch is not replayed: a retry with the same key launches again."""
+    failed = {"returncode": 1, "stdout": "", "stderr": "pull failed", "command": "..."}
+    ok = {"returncode": 0, "stdout": "gem-1", "stderr": "", "command": "..."}
+    headers = {"Idempotency-Key": "retry-test-3"}
+    with patch("app.api.routes.LauncherService.launch", side_effect=[failed, ok]) as launch:
+        assert client.post('/api/launch', json={"project_path": "/work"}, headers=headers).status_code == 500
+        retry = client.post('/api/launch', json={"project_path": "/work"}, headers=headers)
+        assert launch.call_count == 2
+        assert retry.status_code == 200
+        assert retry.json["deduplicated"] is False
+
+def test_launch_job_idempotency_key_returns_same_job(client):
+    """Job retries with the same key get the original job id."""
+    with patch("app.services.launch_jobs.LauncherService.launch", return_value={"returncode": 0, "stdout": "", "stderr": ""}):
+        body = {"project_path": "/mock/root/work", "idempotency_key": "retry-test-2"}
+        first = client.post('/api/launch/jobs', json=body).json
+        retry = client.post('/api/launch/jobs', json=body).json
+        assert retry["job_id"] == first["job_id"]
+        assert retry["deduplicated"] is True
+
+def test_launch_metrics(client):
+    """The metrics endpoint exposes the aggregated phase percentiles."""
+    summary = {"total": {"count": 1, "p50": 2.0, "p90": 2.0, "p99": 2.0, "max": 2.0, "histogram": {"+Inf": 1}}}
+    with patch("app.api.routes.LaunchMetricsService.summary", return_value=summary):
+        assert client.get('/api/launch/metrics').json == {"phases": summary}
+
+def test_session_readiness_long_poll(client):
+    """The readiness endpoint starts tracking the session and long-polls its state."""
+    state = {"name": "gem-proj-cli-abc", "status": "ready", "ready": True, "version": 4}
+    with patch("app.api.routes.ReadinessService.track") as mock_track, \
+         patch("app.api.routes.ReadinessService.wait", return_value=state) as mock_wait:
+        response = client.get('/api/sessions/gem-proj-cli-abc/readiness?version=3&timeout=99')
+        assert response.json == state
+        mock_track.assert_called_once_with("gem-proj-cli-abc")
+        mock_wait.assert_called_once_with("gem-proj-cli-abc", 3, 30)
+
+    assert client.get('/api/sessions/not-a-session/readiness').status_code == 400
+    assert client.get('/api/sessions/gem-proj-cli-abc/readiness?version=x').status_code == 400
+
+def test_bulk_stop_by_list(client):
+    """A bulk stop returns the job to poll right away."""
+    job = MagicMock(id="j1")
+    job.to_dict.return_value = {"job_id": "j1", "status": "running", "total": 2}
+    with patch("app.api.routes.StopJobService.start", return_value=job) as mock_start:
+        response = client.post('/api/sessions/stop/bulk', json={"sessions": ["gem-a-cli-1", "gem-b-cli-2"], "grace": 5})
+        assert response.status_code == 202
+        assert response.json["status_url"] == "/api/sessions/stop/jobs/j1"
+        mock_start.assert_called_once_with(["gem-a-cli-1", "gem-b-cli-2"], 5)
+
+def test_bulk_stop_by_filter(client):
+    job = MagicMock(id="j2")
+    job.to_dict.return_value = {"job_id": "j2"}
+    with patch("app.api.routes.SessionService.select", return_value=["gem-a-cli-1"]) as mock_select, \
+         patch("app.api.routes.StopJobService.start", return_value=job) as mock_start:
+        response = client.post('/api/sessions/stop/bulk', json={"filter": {"project": "a", "idle": "600"}})
+        assert response.status_code == 202
+        mock_select.assert_called_once_with("a", None, 600.0)
+        mock_start.assert_called_once_with(["gem-a-cli-1"], Config.HUB_STOP_GRACE)
+
+def test_bulk_stop_validation(client):
+    assert client.post('/api/sessions/stop/bulk', json={}).status_code == 400
+    assert client.post('/api/sessions/stop/bulk', json={"filter": {}}).status_code == 400
+    assert client.post('/api/sessions/stop/bulk', json={"sessions": "gem-a-cli-1"}).status_code == 400
+    assert client.post('/api/sessions/stop/bulk', json={"sessions": [], "grace": 9999}).status_code == 400
+    assert client.post('/api/sessions/stop/bulk', json={"filter": {"idle": "soon"}}).status_code == 400
+    assert client.post('/api/sessions/stop/bulk', json={"sessions": ["postgres"]}).status_code == 403
+
+def test_stop_job_status(client):
+    job = MagicMock()
+    job.to_dict.return_value = {"job_id": "j1", "status": "done"}
+    with patch("app.api.routes.StopJobService.get", return_value=job):
+        assert client.get('/api/sessions/stop/jobs/j1?wait=5').json["status"] == "done"
+        job.wait.assert_called_once_with(5.0)
+    with patch("app.api.routes.StopJobService.get", return_value=None):
+        assert client.get('/api/sessions/stop/jobs/nope').status_code == 404
+
+def test_pause_and_resume_session(client):
+    with patch("app.api.routes.SessionService.pause", return_value={"status": "success", "session_id": "gem-a-cli-1"}) as mock_pause:
+        assert client.post('/api/sessions/pause', json={"session_id": "gem-a-cli-1"}).status_code == 200
+        mock_pause.assert_called_once_with("gem-a-cli-1")
+    with patch("app.api.routes.SessionService.resume", return_value={"status": "error", "error": "not paused"}):
+        assert client.post('/api/sessions/resume', json={"session_id": "gem-a-cli-1"}).status_code == 500
+    with patch("app.api.routes.SessionService.resume", side_effect=PermissionError("no")):
+        assert client.post('/api/sessions/resume', json={"session_id": "postgres"}).status_code == 403
+    assert client.post('/api/sessions/pause', json={}).status_code == 400
+
+def test_requests_tracked_for_auto_shutdown(client):
+    """Requests count as in flight until their (streamed) response ends."""
+    from app.services.traffic import TrafficService
+    TrafficService.clear()
+    job = MagicMock()
+    seen = []
+    def events(job, after):
+        seen.append(TrafficService.snapshot()["in_flight"])
+        yield "event: done\ndata: {}\n\n"
+
+    with patch("app.api.routes.LaunchJobService.get", return_value=job), \
+         patch("app.api.routes.LaunchJobService.events", side_effect=events):
+        client.get('/api/launch/jobs/abc/events').get_data()
+
+    assert seen == [1]
+    traffic = TrafficService.snapshot()
+    assert traffic["in_flight"] == 0
+    assert traffic["last_request"] > 0
+    TrafficService.clear()
+
+def test_sessions_served_from_snapshot_until_reconciled(client):
+    stale = [{"name": "gem-app-cli-1", "stale": True}]
+    with patch("app.api.routes.SnapshotService.stale_sessions", return_value=stale), \
+         patch("app.api.routes.DiscoveryService") as mock_discovery:
+        assert client.get('/api/sessions').json == stale
+        mock_discovery.assert_not_called()
+
+    with patch("app.api.routes.SnapshotService.status", return_value={"stale": False, "saved_at": 1.0}):
+        assert client.get('/api/snapshot').json == {"stale": False, "saved_at": 1.0}
+
+def test_tailscale_state(client):
+    with patch("app.api.routes.TailscaleService.state", return_value={"state": "initialising"}):
+        assert client.get('/api/tailscale').json == {"state": "initialising"}
+
+def test_startup_report(client):
+    report = {"phases": [{"phase": "create_app", "at_ms": 250.0}], "modules": []}
+    with patch("app.api.routes.StartupService.report", return_value=report):
+        assert client.get('/api/startup').json == report
@@ -0,0 +1,106 @@
+"""
+Differential tests: the native launch engine must produce the same container
+configuration as `gemini-toolbox` for the same arguments.
+The toolbox runs for real against a fake `docker` that records its arguments.
+"""
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+import pytest
+from app.services.docker_run import to_container_config
+from app.services.native_launcher import NativeLauncherService
+
+TOOLBOX = Path(__file__).resolve().parents[4] / "bin" / "gemini-toolbox"
+
+pytestmark = pytest.mark.skipif(
+    not TOOLBOX.exists() or not shutil.which("bash") or not shutil.which("git"),
+    reason="gemini-toolbox script, bash and git are required"
+)
+
+FAKE_DOCKER = """#!/bin/bash
+case "$1" in
+    run) printf '%s\\0' "$@" > "$DOCKER_RUN_LOG"; echo "fake-container-id" ;;
+    ps) echo "hub-id" ;;
+    inspect) echo "49152" ;;
+    image) exit 1 ;;
+esac
+"""
+
+@pytest.fixture
+def sandbox(tmp_path, mocker):
+    """A git project, a fake docker on PATH and a deterministic environment."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    docker = bin_dir / "docker"
+    docker.write_text(FAKE_DOCKER)
+    docker.chmod(0o755)
+    (bin_dir / "gemini-toolbox").symlink_to(TOOLBOX)
+
+    project = tmp_path / "My_Project"
+    project.mkdir()
+    git = ["git", "-c", "user.email=t@t", "-c", "user.name=t"]
+    subprocess.run(git + ["init", "-q"], cwd=project, check=True)
+    (project / "README.md").write_text("hello")
+    subprocess.run(git + ["add", "."], cwd=project, check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], cwd=project, check=True)
+
+    env = {
+        "PATH": f"{bin_dir}:{os.environ.get('PATH', '')}",
+        "HOME": str(tmp_path / "home"),
+        "DOCKER_RUN_LOG": str(tmp_path / "docker-run.log"),
+        "GEMINI_WORKTREE_ROOT": str(tmp_path / "worktrees"),
+        "GEMINI_REMOTE_KEY": "tskey-test",
+        "GEMINI_INTERNAL_RUN": "true",
+        "HOST_UID": "1000", "HOST_GID": "1000", "HOST_DOCKER_GID": "999",
+        "TERM": "xterm", "LANG": "C.UTF-8",
+    }
+    (tmp_path / "home").mkdir()
+
+    # No local images: both engines fall back to the registry image
+    mocker.patch("app.services.native_launcher.DockerAPI.image_exists", return_value=False)
+    return project, env
+
+def toolbox_config(argv, cwd, env):
+    result = subprocess.run(["bash", str(TOOLBOX)] + argv, cwd=cwd, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    with open(env["DOCKER_RUN_LOG"]) as f:
+        run_args = f.read().split("\0")[1:-1]
+    return to_container_config(run_args, env)
+
+def native_config(argv, cwd, env):
+    run_args, _, _ = NativeLauncherService.plan(argv, str(cwd), env)
+    return to_container_config(run_args, env)
+
+def normalize(name, config):
+    """Session ids end with a random 8-character suffix."""
+    def strip(value):
+        return re.sub(r"-[0-9a-z]{8}$", "-ID", value)
+
+    config["Env"] = [strip(e) if e.startswith("GEMINI_SESSION_ID=") else e for e in config["Env"]]
+    return strip(name), config
+
+@pytest.mark.parametrize("argv", [
+    ["--remote", "--detached", "--", "-i", "Refactor auth"],
+    ["--remote", "--detached", "--bash", "--preview", "--no-docker", "--no-ide"],
+    ["--remote", "--detached", "--image", "custom/image:1", "--docker-args", "--label team=a -e KEY=VAL", "-v", "/data:/data:ro"],
+    ["--remote", "--detached", "--worktree", "--name", "feat/engine", "--", "-p", "Write tests"],
+])
+def test_engines_produce_equivalent_configs(sandbox, argv):
+    project, env = sandbox
+    expected = normalize(*toolbox_config(argv, project, env))
+    actual = normalize(*native_config(argv, project, env))
+    assert actual == expected
+
+def test_engines_match_with_profile_extra_args(sandbox, tmp_path):
+    project, env = sandbox
+    profile = tmp_path / "profiles" / "work"
+    profile.mkdir(parents=True)
+    (profile / "extra-args").write_text('# Caches\n--volume "/cache/m2:/home/gemini/.m2"\n--preview\n')
+
+    argv = ["--remote", "--detached", "--profile", str(profile)]
+    expected = normalize(*toolbox_config(argv, project, env))
+    actual = normalize(*native_config(argv, project, env))
+    assert actual == expected
+    assert "/cache/m2:/home/gemini/.m2" in actual[1]["HostConfig"]["Binds"]
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+
 def test_home_route(client):
     """Test that the homepage renders correctly."""
     mock_machines = [
@@ -22,4 +23,36 @@ def test_home_route(client):
         assert "Gemini Workspace Hub" in content
         # The template displays the project name, not the raw hostname
         assert "proj1" in content
-        assert "bash" in content
\ No newline at end of file
+        assert "bash" in content
+
+
+def test_home_route_shows_usage_and_paused(client):
+    """Live usage and the paused state are rendered on the session card."""
+    mock_machines = [
+        {"name": "gem-machine-1", "project": "proj1", "type": "cli", "ip": "100.1.1.1", "online": True,
+         "is_running": True, "is_paused": True, "cpu_percent": 12.5, "memory_usage": 512 * 1048576, "uptime": 600},
+    ]
+    with patch("app.web.routes.DiscoveryService.get_sessions", return_value=mock_machines):
+        content = client.get('/').data.decode()
+        assert "12.5% · 512 MiB · 10m" in content
+        assert "resumeSession('gem-machine-1')" in content
+        assert 'data-paused="true"' in content
+
+
+def test_home_route_serves_snapshot_while_stale(client):
+    """Right after a restart, the last known sessions render with a stale banner."""
+    stale = [{"name": "gem-machine-1", "project": "proj1", "type": "cli", "ip": "100.1.1.1", "online": True, "stale": True}]
+    with patch("app.web.routes.SnapshotService.stale_sessions", return_value=stale), \
+         patch("app.web.routes.DiscoveryService.get_sessions") as mock_get:
+        content = client.get('/').data.decode()
+        mock_get.assert_not_called()
+        assert "proj1" in content
+        assert 'id="staleBanner"' in content
+
+
+def test_home_route_while_tailnet_initialising(client):
+    """The local dashboard is served before the tailnet is up, with a notice."""
+    with patch("app.web.routes.DiscoveryService.get_sessions", return_value=[]), \
+         patch("app.web.routes.TailscaleService.state", return_value={"state": "initialising"}):
+        content = client.get('/').data.decode()
+        assert 'id="tailnetBanner"' in content
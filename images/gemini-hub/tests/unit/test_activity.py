@@ -0,0 +1,66 @@
+import pytest
+from app.config import Config
+from app.services.activity import ActivityService
+
+def _stats(cpu_ns, net_bytes):
+    return {"cpu_stats": {"cpu_usage": {"total_usage": cpu_ns}}, "networks": {"eth0": {"rx_bytes": net_bytes, "tx_bytes": 0}}}
+
+@pytest.fixture(autouse=True)
+def _activity(mocker):
+    mocker.patch.object(Config, "HUB_ACTIVITY_CPU_PERCENT", 5)
+    mocker.patch.object(Config, "HUB_ACTIVITY_NET_BYTES", 1000)
+    ActivityService.clear()
+    yield
+    ActivityService.clear()
+
+def test_idle_counts_from_last_active_sample():
+    name = "gem-proj-cli-1"
+    assert ActivityService.observe(name, _stats(0, 0), now=100) == 0
+    # 1% of a core and 100 B/s: idle
+    assert ActivityService.observe(name, _stats(100_000_000, 1000), now=110) == 10
+    # 50% of a core: active again
+    assert ActivityService.observe(name, _stats(5_100_000_000, 1000), now=120) == 0
+    # Network burst: active
+    assert ActivityService.observe(name, _stats(5_100_000_000, 100_000), now=130) == 0
+    assert ActivityService.observe(name, _stats(5_100_000_000, 100_000), now=190) == 60
+    assert ActivityService.idle_seconds(name) == 60
+    assert ActivityService.idle_seconds("gem-other-cli-2") is None
+
+def test_sample_lists_sessions_and_forgets_gone_ones(mocker):
+    mocker.patch("app.services.activity.DockerAPI.list_sessions", return_value=[{"Id": "c1", "Names": ["/gem-a-cli-1"]}])
+    stats = mocker.patch("app.services.activity.DockerAPI.container_stats", return_value=_stats(0, 0))
+    ActivityService.observe("gem-gone-cli-9", _stats(0, 0), now=1)
+
+    assert ActivityService.sample() == {"gem-a-cli-1": 0}
+    stats.assert_called_once_with("c1")
+    assert ActivityService.idle_seconds("gem-gone-cli-9") is None
+
+def test_paused_session_keeps_state_with_its_clock_held(mocker, monkeypatch):
+    container = {"Id": "c1", "Names": ["/gem-a-cli-1"], "State": "running"}
+    stats = mocker.patch("app.services.activity.DockerAPI.container_stats", return_value=_stats(0, 0))
+    now = [100.0]
+    monkeypatch.setattr("app.services.activity.time.time", lambda: now[0])
+
+    assert ActivityService.sample([container]) == {"gem-a-cli-1": 0}
+    # Frozen for over an hour: not sampled, not forgotten
+    now[0] = 5000.0
+    assert ActivityService.sample([dict(container, State="paused")]) == {}
+    assert stats.call_count == 1
+    assert ActivityService.idle_seconds("gem-a-cli-1") == 0
+    # Resumed: idle time counts from the last paused listing, not from before the pause
+    now[0] = 5060.0
+    assert ActivityService.sample([container]) == {"gem-a-cli-1": 60}
+
+def test_failed_sample_keeps_previous_state(mocker):
+    mocker.patch("app.services.activity.DockerAPI.list_sessions", return_value=[{"Id": "c1", "Names": ["/gem-a-cli-1"]}])
+    mocker.patch("app.services.activity.DockerAPI.container_stats", return_value=None)
+    ActivityService.observe("gem-a-cli-1", _stats(0, 0), now=1)
+    assert ActivityService.sample() == {}
+    assert ActivityService.idle_seconds("gem-a-cli-1") == 0
+
+def test_sample_prefers_live_telemetry(mocker):
+    mocker.patch("app.services.activity.DockerAPI.list_sessions", return_value=[{"Id": "c1", "Names": ["/gem-a-cli-1"]}])
+    mocker.patch("app.services.activity.TelemetryService.latest", return_value=_stats(0, 0))
+    stats = mocker.patch("app.services.activity.DockerAPI.container_stats")
+    assert ActivityService.sample() == {"gem-a-cli-1": 0}
+    stats.assert_not_called()
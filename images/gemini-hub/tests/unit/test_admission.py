@@ -0,0 +1,79 @@
+import threading
+import pytest
+from collections import deque
+from app.config import Config
+from app.services.admission import AdmissionService
+
+GB = 1024 ** 3
+
+@pytest.fixture
+def host(mocker):
+    """An idle host with 8 GB available; tests mutate the snapshot."""
+    capacity = {"cpus": 4, "load": 0.5, "memory_total": 16 * GB, "memory_available": 8 * GB, "sessions": 0, "session_memory": 0}
+    mocker.patch.object(AdmissionService, "capacity", return_value=capacity)
+    mocker.patch.object(AdmissionService, "_queue", deque())
+    mocker.patch.object(AdmissionService, "_launching", 0)
+    mocker.patch.object(Config, "HUB_MAX_CONCURRENT_LAUNCHES", 1)
+    mocker.patch.object(Config, "HUB_MAX_SESSIONS", 0)
+    mocker.patch.object(Config, "HUB_SESSION_MEMORY_MB", 1024)
+    mocker.patch.object(Config, "HUB_ADMISSION_POLL_INTERVAL", 1)
+    return capacity
+
+def test_blocked_by_limits(host, mocker):
+    assert AdmissionService.blocked_by(host, 0) is None
+    assert AdmissionService.blocked_by(host, 1) == "concurrent launches"
+
+    mocker.patch.object(Config, "HUB_MAX_SESSIONS", 3)
+    assert AdmissionService.blocked_by(dict(host, sessions=3), 0) == "session limit"
+
+    mocker.patch.object(Config, "HUB_MAX_CONCURRENT_LAUNCHES", 0)
+    low = dict(host, memory_available=GB + GB // 2, sessions=1)
+    assert AdmissionService.blocked_by(low, 0) is None
+    assert AdmissionService.blocked_by(low, 1) == "memory"
+    # Nothing running: nothing would ever free memory, so do not wait
+    assert AdmissionService.blocked_by(dict(low, memory_available=0, sessions=0), 0) is None
+
+def test_queue_is_fifo_and_reports_positions(host):
+    positions = []
+    admitted = threading.Event()
+
+    def queued():
+        with AdmissionService.admit(on_position=positions.append):
+            admitted.set()
+
+    with AdmissionService.admit():
+        worker = threading.Thread(target=queued)
+        worker.start()
+        assert not admitted.wait(0.2)
+        assert AdmissionService.status()["queued"] == 1
+
+    worker.join(timeout=5)
+    assert admitted.is_set()
+    assert positions == [1, 0]
+    assert AdmissionService._launching == 0
+
+def test_admission_timeout_leaves_queue(host):
+    with AdmissionService.admit():
+        with pytest.raises(TimeoutError):
+            with AdmissionService.admit(timeout=0.1):
+                pass
+    assert not AdmissionService._queue
+
+def test_capacity_reads_host_and_sessions(mocker):
+    mocker.patch.object(AdmissionService, "_read_meminfo", return_value={"MemTotal": 16 * GB, "MemAvailable": 8 * GB})
+    mocker.patch.object(AdmissionService, "_read_cgroup_limit", return_value=2 * GB)
+
+    def request(method, path, **kwargs):
+        if path == "/containers/json":
+            return 200, [{"Id": "a", "Names": ["/gem-a"]}, {"Id": "b", "Names": ["/gem-b"]}]
+        return 200, {"memory_stats": {"usage": GB}}
+    mocker.patch("app.services.admission.DockerAPI.request", side_effect=request)
+
+    capacity = AdmissionService.capacity(force=True)
+    assert capacity["memory_available"] == 2 * GB
+    assert capacity["sessions"] == 2
+    assert capacity["session_memory"] == 2 * GB
+
+def test_capacity_without_daemon(mocker):
+    mocker.patch("app.services.admission.DockerAPI.request", side_effect=OSError("no socket"))
+    assert AdmissionService.capacity(force=True)["sessions"] == 0
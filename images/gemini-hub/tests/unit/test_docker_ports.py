@@ -91,3 +91,16 @@ def test_docker_ps_generic_exception(mocker):
     mocker.patch("subprocess.run", side_effect=Exception("Subprocess failed"))
     service = DockerService()
     assert service.get_sessions() == {}
+
+def test_docker_paused_status():
+    """Paused containers are still running locally but flagged as frozen."""
+    docker_output = ("gem-test-cli-u1|0.0.0.0:32768->3000/tcp|Up 5 minutes (Paused)\n"
+                     "gem-test-cli-u2|0.0.0.0:32769->3000/tcp|Up 2 hours")
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = docker_output
+
+        sessions = DockerService().get_sessions()
+        assert sessions["gem-test-cli-u1"].is_running and sessions["gem-test-cli-u1"].is_paused
+        assert sessions["gem-test-cli-u1"].local_url == "http://localhost:32768"
+        assert not sessions["gem-test-cli-u2"].is_paused
@@ -0,0 +1,65 @@
+import pytest
+from app.services.docker_run import to_container_config, parse_memory
+
+def test_translates_toolbox_run_args():
+    name, config = to_container_config([
+        "--rm", "-d", "--name", "gem-app-bash-1", "--network=bridge",
+        "--volume", "/src:/src", "-v", "/repo:/repo:ro",
+        "--env", "A=1", "--env", "LANG", "--env", "MISSING",
+        "--workdir", "/src", "--cap-add=NET_ADMIN", "--device", "/dev/net/tun",
+        "-p", "127.0.0.1:0:3000", "--label", "team=core",
+        "--entrypoint", "/entry.sh", "img:1", "bash", "-c", "echo hi"
+    ], {"LANG": "C.UTF-8"})
+
+    assert name == "gem-app-bash-1"
+    assert config["Image"] == "img:1"
+    assert config["Cmd"] == ["bash", "-c", "echo hi"]
+    assert config["Entrypoint"] == ["/entry.sh"]
+    assert config["Env"] == ["A=1", "LANG=C.UTF-8"]
+    assert config["WorkingDir"] == "/src"
+    assert config["Labels"] == {"team": "core"}
+    assert config["ExposedPorts"] == {"3000/tcp": {}}
+
+    host = config["HostConfig"]
+    assert host["Binds"] == ["/src:/src", "/repo:/repo:ro"]
+    assert host["NetworkMode"] == "bridge"
+    assert host["CapAdd"] == ["NET_ADMIN"]
+    assert host["Devices"][0]["PathInContainer"] == "/dev/net/tun"
+    assert host["PortBindings"] == {"3000/tcp": [{"HostIp": "127.0.0.1", "HostPort": "0"}]}
+    assert host["AutoRemove"] is True
+
+def test_image_default_command_is_none():
+    _, config = to_container_config(["--net=host", "img"], {})
+    assert config["Cmd"] is None
+    assert config["HostConfig"]["NetworkMode"] == "host"
+
+def test_publish_forms():
+    _, config = to_container_config(["-p", "8080:80", "-p", "53/udp", "img"], {})
+    assert config["HostConfig"]["PortBindings"] == {
+        "80/tcp": [{"HostIp": "", "HostPort": "8080"}],
+        "53/udp": [{"HostIp": "", "HostPort": ""}],
+    }
+
+def test_resources():
+    _, config = to_container_config(["--memory", "512m", "--cpus=1.5", "img"], {})
+    assert config["HostConfig"]["Memory"] == 512 * 1024 ** 2
+    assert config["HostConfig"]["NanoCpus"] == 1_500_000_000
+    assert parse_memory("2g") == 2 * 1024 ** 3
+    with pytest.raises(ValueError):
+        parse_memory("lots")
+
+def test_unsupported_option_raises():
+    with pytest.raises(NotImplementedError):
+        to_container_config(["--link", "db:db", "img"], {})
+
+def test_missing_image_raises():
+    with pytest.raises(ValueError):
+        to_container_config(["--rm"], {})
+
+def test_resource_limits():
+    _, config = to_container_config(["--cpus", "1.5", "--cpuset-cpus", "0-1", "--memory", "2g", "--blkio-weight", "300", "img"], {})
+    host = config["HostConfig"]
+    assert host["NanoCpus"] == 1_500_000_000
+    assert host["CpusetCpus"] == "0-1"
+    assert host["Memory"] == 2 * 1024 ** 3
+    assert host["BlkioWeight"] == 300
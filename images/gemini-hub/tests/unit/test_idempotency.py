@@ -0,0 +1,77 @@
+import threading
+import pytest
+from app.config import Config
+from app.services.idempotency import IdempotencyService
+
+@pytest.fixture(autouse=True)
+def _store(mocker):
+    mocker.patch.object(Config, "HUB_IDEMPOTENCY_TTL", 600)
+    mocker.patch.object(Config, "HUB_IDEMPOTENCY_MAX_ENTRIES", 2)
+    IdempotencyService.clear()
+
+def test_value_is_stored_per_key():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert IdempotencyService.run("k", compute) == (1, False)
+    assert IdempotencyService.run("k", compute) == (1, True)
+    assert IdempotencyService.run("other", compute) == (2, False)
+
+def test_concurrent_callers_share_one_execution():
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "session"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(IdempotencyService.run("k", compute, keep=False)))
+               for _ in range(3)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == [1]
+    assert sorted(results) == [("session", False), ("session", True), ("session", True)]
+    # In-flight entries are not kept once done
+    assert IdempotencyService.run("k", lambda: "new", keep=False) == ("new", False)
+
+def test_failures_are_not_stored():
+    with pytest.raises(RuntimeError):
+        IdempotencyService.run("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert IdempotencyService.run("k", lambda: "ok") == ("ok", False)
+
+def test_rejected_values_are_not_stored():
+    def ok(value):
+        return value["returncode"] == 0
+
+    failed = {"returncode": 1}
+    assert IdempotencyService.run("k", lambda: failed, cache_if=ok) == (failed, False)
+    assert IdempotencyService.run("k", lambda: {"returncode": 0}, cache_if=ok) == ({"returncode": 0}, False)
+    assert IdempotencyService.run("k", lambda: {"returncode": 2}, cache_if=ok) == ({"returncode": 0}, True)
+
+def test_key_reuse_with_other_request_is_rejected():
+    IdempotencyService.run("k", lambda: 1, fingerprint=("a",))
+    with pytest.raises(ValueError, match="different launch"):
+        IdempotencyService.run("k", lambda: 2, fingerprint=("b",))
+
+def test_store_is_bounded_and_expires(mocker):
+    for key in ["a", "b", "c"]:
+        IdempotencyService.run(key, lambda: key)
+    assert IdempotencyService.run("a", lambda: "again") == ("again", False)
+
+    mocker.patch.object(Config, "HUB_IDEMPOTENCY_TTL", -1)
+    assert IdempotencyService.run("c", lambda: "expired") == ("expired", False)
+
+def test_fingerprint_identifies_launch_tuple():
+    base = {"project_path": "/work/app", "task": "fix", "worktree_mode": True, "worktree_name": "feat", "session_type": "cli"}
+    assert IdempotencyService.fingerprint(base) == IdempotencyService.fingerprint(dict(base, interactive=False))
+    assert IdempotencyService.fingerprint(base) != IdempotencyService.fingerprint(dict(base, task="other"))
+    assert IdempotencyService.fingerprint(base) != IdempotencyService.fingerprint(dict(base, worktree_name="x"))
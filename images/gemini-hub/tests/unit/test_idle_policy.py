@@ -0,0 +1,60 @@
+import pytest
+from app.config import Config
+from app.services.idle_policy import IdlePolicyService
+
+CONTAINERS = [
+    {"Id": "1", "Names": ["/gem-app-geminicli-a1"], "Command": "/usr/local/bin/docker-entrypoint.sh gemini"},
+    {"Id": "2", "Names": ["/gem-app-bash-b2"], "Command": "/usr/local/bin/docker-entrypoint.sh bash"},
+    {"Id": "3", "Names": ["/gem-app-geminicli-c3"], "Command": "/usr/local/bin/docker-entrypoint.sh gemini -p 'fix tests'"},
+]
+
+@pytest.fixture(autouse=True)
+def _thresholds(mocker):
+    mocker.patch.object(Config, "HUB_IDLE_STOP_CLI", 0)
+    mocker.patch.object(Config, "HUB_IDLE_STOP_BASH", 3600)
+    mocker.patch.object(Config, "HUB_IDLE_STOP_TASK", 600)
+    mocker.patch.object(Config, "HUB_STOP_GRACE", 7)
+
+def test_category():
+    assert [IdlePolicyService.category(c) for c in CONTAINERS] == ["cli", "bash", "task"]
+
+def test_enforce_stops_sessions_past_their_category_threshold(mocker):
+    mocker.patch("app.services.idle_policy.DockerAPI.list_sessions", return_value=CONTAINERS)
+    mocker.patch("app.services.idle_policy.ActivityService.sample", return_value={
+        "gem-app-geminicli-a1": 99999,  # cli: never stopped
+        "gem-app-bash-b2": 1800,        # bash: below 3600
+        "gem-app-geminicli-c3": 600,    # task: at the limit
+    })
+    start = mocker.patch("app.services.idle_policy.StopJobService.start")
+
+    assert IdlePolicyService.enforce() == ["gem-app-geminicli-c3"]
+    start.assert_called_once_with(["gem-app-geminicli-c3"], 7)
+
+def test_enforce_without_expired_sessions_stops_nothing(mocker):
+    mocker.patch("app.services.idle_policy.DockerAPI.list_sessions", return_value=CONTAINERS)
+    mocker.patch("app.services.idle_policy.ActivityService.sample", return_value={})
+    start = mocker.patch("app.services.idle_policy.StopJobService.start")
+    assert IdlePolicyService.enforce() == []
+    start.assert_not_called()
+
+def test_start_is_noop_without_thresholds(mocker):
+    mocker.patch.object(Config, "HUB_IDLE_STOP_BASH", 0)
+    mocker.patch.object(Config, "HUB_IDLE_STOP_TASK", 0)
+    thread = mocker.patch("app.services.idle_policy.threading.Thread")
+    IdlePolicyService.start()
+    thread.assert_not_called()
+
+def test_pause_action_skips_frozen_sessions(mocker):
+    mocker.patch.object(Config, "HUB_IDLE_ACTION", "pause")
+    frozen = dict(CONTAINERS[2], Id="4", Names=["/gem-app-geminicli-d4"], State="paused")
+    mocker.patch("app.services.idle_policy.DockerAPI.list_sessions", return_value=CONTAINERS + [frozen])
+    sample = mocker.patch("app.services.idle_policy.ActivityService.sample",
+                          return_value={"gem-app-geminicli-c3": 900})
+    pause = mocker.patch("app.services.idle_policy.SessionService.pause")
+    start = mocker.patch("app.services.idle_policy.StopJobService.start")
+
+    assert IdlePolicyService.enforce() == ["gem-app-geminicli-c3"]
+    # Frozen sessions are listed to the sampler (it keeps their state) but never acted upon
+    assert frozen in sample.call_args[0][0]
+    pause.assert_called_once_with("gem-app-geminicli-c3")
+    start.assert_not_called()
@@ -0,0 +1,185 @@
+import os
+import json
+import base64
+import threading
+import http.server
+import socketserver
+from urllib.parse import urlparse, parse_qs, unquote
+import pytest
+from app.config import Config
+from app.services.docker_api import DockerAPI
+from app.services.image import ImageService
+from app.services.native_launcher import NativeLauncherService
+
+class _FakeRegistryDaemon(http.server.BaseHTTPRequestHandler):
+    """
+    Docker daemon stand-in: images become present once pulled; 'broken/*' fails
+    in-band and 'private/*' needs registry credentials.
+    """
+    images = set()
+    pulls = []
+    auths = []
+
+    def do_GET(self):
+        name = unquote(self.path.split("/")[2])
+        self.send_response(200 if name in self.images else 404)
+        self.end_headers()
+
+    def do_POST(self):
+        query = parse_qs(urlparse(self.path).query)
+        image = f"{query['fromImage'][0]}:{query['tag'][0]}"
+        self.pulls.append(image)
+        auth = self.headers.get("X-Registry-Auth")
+        self.auths.append(json.loads(base64.urlsafe_b64decode(auth)) if auth else None)
+        if image.startswith("private/") and not auth:
+            self.send_response(401)
+            self.end_headers()
+            self.wfile.write(b'{"message": "unauthorized"}')
+            return
+        self.send_response(200)
+        self.end_headers()
+        events = [
+            {"status": "Pulling from x", "id": "latest"},
+            {"status": "Downloading", "id": "l1", "progressDetail": {"current": 50, "total": 100}},
+            {"status": "Download complete", "id": "l1"},
+            {"status": "Already exists", "id": "l2", "progressDetail": {}},
+        ]
+        if image.startswith("broken/"):
+            events.append({"error": "manifest unknown"})
+        else:
+            self.images.add(image)
+        for event in events:
+            self.wfile.write((json.dumps(event) + "\r\n").encode())
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def daemon(tmp_path, mocker):
+    _FakeRegistryDaemon.images = {"jsebayhi/gemini-cli-toolbox:latest-stable"}
+    _FakeRegistryDaemon.pulls = []
+    _FakeRegistryDaemon.auths = []
+    sock = str(tmp_path / "docker.sock")
+    server = socketserver.ThreadingUnixStreamServer(sock, _FakeRegistryDaemon)
+    server.get_request = lambda: (server.socket.accept()[0], ("local", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    mocker.patch.object(Config, "DOCKER_SOCKET", sock)
+    mocker.patch.object(Config, "HUB_IMAGE_CUSTOM_MAX", 2)
+    mocker.patch.object(ImageService, "_state", {})
+    mocker.patch.object(ImageService, "_variants", None)
+    mocker.patch.object(Config, "HUB_IMAGE_PREPULL_PREVIEW", False)
+    mocker.patch.object(ImageService, "_preview_used", False)
+    mocker.patch.object(ImageService, "_custom", type(ImageService._custom)())
+    mocker.patch.dict("os.environ", {"PATH": "", "DOCKER_HUB_USER": "jsebayhi", "DOCKER_CONFIG": str(tmp_path / "docker")})
+    yield _FakeRegistryDaemon
+    server.shutdown()
+    server.server_close()
+
+def wait_pulls():
+    ImageService._executor.shutdown(wait=True)
+    ImageService._executor = None
+
+def by_image():
+    return {entry["image"]: entry for entry in ImageService.status()}
+
+def test_refresh_pulls_preview_when_configured_or_launched(daemon, mocker):
+    daemon.images = set()
+    ImageService.refresh()
+    wait_pulls()
+    assert daemon.pulls == ["jsebayhi/gemini-cli-toolbox:latest-stable"]
+    assert by_image()["jsebayhi/gemini-cli-toolbox:latest-preview"]["status"] == "unknown"
+
+    ImageService.track_preview()
+    ImageService.refresh()
+    wait_pulls()
+    assert daemon.pulls[-1] == "jsebayhi/gemini-cli-toolbox:latest-preview"
+
+def test_refresh_pulls_missing_variants(daemon, mocker):
+    mocker.patch.object(Config, "HUB_IMAGE_PREPULL_PREVIEW", True)
+    ImageService.refresh()
+    wait_pulls()
+
+    assert daemon.pulls == ["jsebayhi/gemini-cli-toolbox:latest-preview"]
+    images = by_image()
+    assert images["jsebayhi/gemini-cli-toolbox:latest-stable"]["status"] == "present"
+    assert images["jsebayhi/gemini-cli-toolbox:latest-preview"]["status"] == "present"
+    assert images["jsebayhi/gemini-cli-toolbox:latest-preview"]["source"] == "preview"
+
+def test_pull_reports_progress_and_errors(daemon, mocker):
+    progress = []
+    DockerAPI.pull("team/tool:1", on_progress=progress.append)
+    assert [e["status"] for e in progress][-1] == "Already exists"
+
+    ImageService.track("broken/image:1")
+    assert ImageService.pull("broken/image:1")
+    wait_pulls()
+    state = by_image()["broken/image:1"]
+    assert state["status"] == "error"
+    assert "manifest unknown" in state["error"]
+
+def test_pull_sends_registry_credentials(daemon, tmp_path, mocker):
+    """Plain `auths` entries of the Docker client config are forwarded to the daemon."""
+    config = tmp_path / "docker" / "config.json"
+    config.parent.mkdir()
+    config.write_text(json.dumps({"auths": {
+        "https://index.docker.io/v1/": {"auth": base64.b64encode(b"me:secret").decode()},
+        "ghcr.io": {"identitytoken": "tok"},
+    }}))
+    cli = mocker.patch("app.services.docker_api.subprocess.run")
+
+    DockerAPI.pull("private/tool:1")
+    DockerAPI.pull("ghcr.io/team/tool:1")
+    assert daemon.auths == [
+        {"username": "me", "password": "secret", "serveraddress": "https://index.docker.io/v1/"},
+        {"identitytoken": "tok", "serveraddress": "ghcr.io"},
+    ]
+    cli.assert_not_called()
+
+def test_pull_falls_back_to_cli_when_refused(daemon, mocker):
+    """Without usable credentials (e.g. a credential helper), `docker pull` takes over."""
+    cli = mocker.patch("app.services.docker_api.subprocess.run", return_value=mocker.Mock(returncode=0, stderr=""))
+    DockerAPI.pull("private/tool:1")
+    assert cli.call_args[0][0] == ["docker", "pull", "-q", "private/tool:1"]
+
+    cli.return_value = mocker.Mock(returncode=1, stderr="denied: requested access to the resource is denied\n")
+    with pytest.raises(RuntimeError, match="access to the resource is denied"):
+        DockerAPI.pull("private/tool:1")
+
+def test_progress_aggregates_layers(daemon, mocker):
+    states = []
+    original = ImageService._set_state
+    mocker.patch.object(ImageService, "_set_state", side_effect=lambda image, **s: (states.append(s), original(image, **s)))
+
+    ImageService.pull("team/tool:1")
+    wait_pulls()
+    progress = [s["progress"] for s in states if "progress" in s]
+    assert progress[0] == {"current": 50, "total": 100, "layers": 1}
+    assert progress[-1] == {"current": 100, "total": 100, "layers": 2}
+    assert states[-1]["status"] == "present"
+
+def test_pull_is_deduplicated(daemon):
+    ImageService._state["team/tool:1"] = {"status": "pulling"}
+    assert not ImageService.pull("team/tool:1")
+
+def test_tracked_variants_are_memoised_per_toolbox_head(daemon, mocker, tmp_path):
+    """GET /api/images does not spawn git or query the daemon while the toolbox HEAD is unchanged."""
+    checkout = tmp_path / "toolbox"
+    (checkout / ".git").mkdir(parents=True)
+    (checkout / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    mocker.patch("app.services.image.NativeLauncherService.toolbox_checkout", return_value=str(checkout))
+    resolve = mocker.spy(NativeLauncherService, "resolve_image")
+
+    ImageService.tracked()
+    ImageService.tracked()
+    assert resolve.call_count == 2
+
+    os.utime(checkout / ".git" / "HEAD", (1, 1))
+    ImageService.tracked()
+    ImageService.tracked(fresh=True)
+    assert resolve.call_count == 6
+
+def test_custom_images_are_bounded(daemon):
+    for image in ["a:1", "b:1", "c:1"]:
+        ImageService.track(image)
+    assert [i for i, source in ImageService.tracked().items() if source == "custom"] == ["b:1", "c:1"]
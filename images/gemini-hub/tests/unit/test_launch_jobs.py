@@ -0,0 +1,115 @@
+import json
+import threading
+import pytest
+from app.config import Config
+from app.services.launch_jobs import LaunchJob, LaunchJobService
+from app.services.launcher import LauncherService
+
+@pytest.fixture(autouse=True)
+def _jobs(mocker):
+    mocker.patch.object(Config, "HUB_LAUNCH_OUTPUT_LINES", 3)
+    mocker.patch.object(Config, "HUB_SESSION_MEMORY_MB", 0)
+    mocker.patch.object(LaunchJobService, "_jobs", {})
+
+def parse(events):
+    """Splits an SSE stream into (event, data, id) tuples, ignoring comments."""
+    parsed = []
+    for chunk in "".join(events).split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in chunk.splitlines() if not line.startswith(":"))
+        if fields:
+            parsed.append((fields.get("event"), fields.get("data"), fields.get("id")))
+    return parsed
+
+def test_ring_buffer_keeps_latest_lines():
+    job = LaunchJob("j")
+    for i in range(5):
+        job.append(f"line {i}")
+    lines, done, _ = job.wait(0, timeout=0)
+    assert lines == [(3, "line 2"), (4, "line 3"), (5, "line 4")]
+    assert not done
+
+def test_events_replay_buffer_then_done():
+    job = LaunchJob("j")
+    job.append("pulling\r")
+    job.append("started")
+    job.finish({"returncode": 0, "status": "success"})
+
+    events = parse(LaunchJobService.events(job))
+    assert events[:2] == [("output", "pulling", "1"), ("output", "started", "2")]
+    assert events[-1][0] == "done"
+    assert json.loads(events[-1][1])["status"] == "success"
+
+def test_events_resume_after_last_event_id():
+    job = LaunchJob("j")
+    for line in ["a", "b", "c"]:
+        job.append(line)
+    job.finish({"returncode": 0})
+    assert [e[1] for e in parse(LaunchJobService.events(job, after=2))] == ["c", '{"returncode": 0}']
+
+def test_events_stream_while_running():
+    job = LaunchJob("j")
+    stream = LaunchJobService.events(job, heartbeat=0.05)
+
+    assert next(stream) == ": keep-alive\n\n"
+    job.append("hello")
+    assert "data: hello" in next(stream)
+    threading.Timer(0.05, job.finish, [{"returncode": 0}]).start()
+    assert parse(list(stream))[-1][0] == "done"
+
+def test_start_runs_launch_with_output_callback(mocker):
+    def fake_launch(on_output, **kwargs):
+        on_output(">> Container started: gem-x")
+        return {"returncode": 0, "stdout": "", "stderr": "", "command": "cmd"}
+
+    launch = mocker.patch.object(LauncherService, "launch", side_effect=fake_launch)
+    job = LaunchJobService.start(project_path="/work")
+    events = parse(LaunchJobService.events(job))
+
+    assert launch.call_args.kwargs["project_path"] == "/work"
+    assert events[0][1] == ">> Container started: gem-x"
+    assert json.loads(events[-1][1])["status"] == "success"
+    assert LaunchJobService.get(job.id) is job
+
+def test_start_reports_failures(mocker):
+    mocker.patch.object(LauncherService, "launch", side_effect=RuntimeError("boom"))
+    job = LaunchJobService.start(project_path="/work")
+    result = json.loads(parse(LaunchJobService.events(job))[-1][1])
+    assert result["status"] == "error"
+    assert result["error"] == "boom"
+
+def test_finished_jobs_expire(mocker):
+    mocker.patch.object(Config, "HUB_LAUNCH_JOB_TTL", 0)
+    mocker.patch.object(LauncherService, "launch", return_value={"returncode": 0, "stdout": "", "stderr": ""})
+    first = LaunchJobService.start(project_path="/work")
+    list(LaunchJobService.events(first))
+
+    LaunchJobService.start(project_path="/work")
+    assert LaunchJobService.get(first.id) is None
+
+def test_events_report_queue_position():
+    job = LaunchJob("j")
+    job.set_position(2)
+    stream = LaunchJobService.events(job)
+    assert next(stream) == 'event: queued\ndata: {"position": 2}\n\n'
+    assert job.to_dict()["status"] == "queued"
+
+    job.set_position(0)
+    job.append("started")
+    job.finish({"returncode": 0})
+    events = parse(list(stream))
+    assert events[0] == ("queued", '{"position": 0}', None)
+    assert [e[0] for e in events[1:]] == ["output", "done"]
+
+def test_start_once_returns_running_duplicate(mocker):
+    release = threading.Event()
+    mocker.patch.object(LauncherService, "launch", side_effect=lambda **kw: release.wait(5) and {"returncode": 0, "stdout": "", "stderr": ""})
+
+    first, duplicate = LaunchJobService.start_once(project_path="/work", task="fix")
+    assert not duplicate
+    assert LaunchJobService.start_once(project_path="/work", task="fix") == (first, True)
+    other, duplicate = LaunchJobService.start_once(project_path="/work", task="other")
+    assert other is not first and not duplicate
+
+    release.set()
+    list(LaunchJobService.events(first))
+    assert LaunchJobService.start_once(project_path="/work", task="fix")[0] is not first
@@ -0,0 +1,66 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+from app.config import Config
+from app.services.launch_metrics import LaunchMetricsService, LaunchTrace
+from app.services.launcher import LauncherService
+
+@pytest.fixture(autouse=True)
+def _metrics(mocker):
+    mocker.patch.object(Config, "HUB_LAUNCH_METRICS_SAMPLES", 100)
+    LaunchMetricsService.clear()
+
+def test_trace_marks_consecutive_phases(mocker):
+    clock = iter([10.0, 10.5, 12.0, 12.25])
+    mocker.patch("app.services.launch_metrics.time.monotonic", side_effect=lambda: next(clock))
+    trace = LaunchTrace()
+    trace.mark("admission")
+    trace.mark("prepare")
+    trace.extend([("toolbox.run", 3.0), ("toolbox.exit", -0.1)])
+    assert trace.to_dict() == {"phases": {"admission": 0.5, "prepare": 1.5, "toolbox.run": 3.0, "toolbox.exit": 0.0}, "total": 5.0}
+
+def test_read_script_trace(tmp_path):
+    trace = tmp_path / "launch.trace"
+    trace.write_text("start 100.5\nimage 101,0\ngarbage\nrun 104.0\n")
+    phases = LaunchMetricsService.read_script_trace(str(trace), spawned_at=100.0, exited_at=104.25)
+    assert phases == [("toolbox.init", 0.5), ("toolbox.image", 0.5), ("toolbox.run", 3.0), ("toolbox.exit", 0.25)]
+    assert LaunchMetricsService.read_script_trace(str(tmp_path / "missing"), 0, 0) == []
+
+def test_summary_percentiles_and_histogram():
+    for seconds in range(1, 11):
+        trace = LaunchTrace()
+        trace.extend([("toolbox.run", float(seconds))])
+        LaunchMetricsService.record(trace)
+
+    run = LaunchMetricsService.summary()["toolbox.run"]
+    assert run["count"] == 10
+    assert (run["p50"], run["p90"], run["p99"], run["max"]) == (5.0, 9.0, 10.0, 10.0)
+    assert run["histogram"]["1"] == 1
+    assert run["histogram"]["5"] == 5
+    assert run["histogram"]["10"] == 10
+    assert run["histogram"]["+Inf"] == 10
+    assert "total" in LaunchMetricsService.summary()
+
+def test_launch_reports_toolbox_phases(mocker):
+    """The toolbox writes its phase marks to GEMINI_TOOLBOX_TRACE_FILE; the result breaks them down."""
+    mocker.patch.object(Config, "HUB_ROOTS", ["/mock/root"])
+
+    def fake_toolbox(cmd, env, **kwargs):
+        now = time.time()
+        with open(env["GEMINI_TOOLBOX_TRACE_FILE"], "a") as f:
+            f.write(f"start {now}\nimage {now}\nrun {now}\n")
+        return MagicMock(returncode=0, stdout="", stderr="")
+    mocker.patch("subprocess.run", side_effect=fake_toolbox)
+
+    result = LauncherService.launch("/mock/root/project")
+    phases = result["timings"]["phases"]
+    assert list(phases) == ["prepare", "toolbox.init", "toolbox.image", "toolbox.run", "toolbox.exit"]
+    assert result["timings"]["total"] >= 0
+    assert LaunchMetricsService.summary()["toolbox.run"]["count"] == 1
+
+def test_failed_launches_are_not_aggregated(mocker):
+    mocker.patch.object(Config, "HUB_ROOTS", ["/mock/root"])
+    mocker.patch("subprocess.run", return_value=MagicMock(returncode=1, stdout="", stderr="boom"))
+    result = LauncherService.launch("/mock/root/project")
+    assert "prepare" in result["timings"]["phases"]
+    assert LaunchMetricsService.summary() == {}
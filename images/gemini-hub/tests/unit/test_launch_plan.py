@@ -0,0 +1,83 @@
+import os
+import subprocess
+import pytest
+from app.config import Config
+from app.services.launch_plan import LaunchPlanService
+from app.services.native_launcher import NativeLauncherService
+
+@pytest.fixture
+def workspace(tmp_path, mocker):
+    project = tmp_path / "project"
+    (project / ".git").mkdir(parents=True)
+    (project / "src").mkdir()
+    profile = tmp_path / "profiles" / "work"
+    profile.mkdir(parents=True)
+    (profile / "extra-args").write_text("--preview\n")
+
+    mocker.patch.object(Config, "HUB_LAUNCH_PLAN_TTL", 300)
+    mocker.patch.object(Config, "HUB_LAUNCH_PLAN_CACHE_SIZE", 64)
+    LaunchPlanService.clear()
+    return project, profile
+
+def test_same_tuple_reuses_plan(workspace):
+    project, profile = workspace
+    plan = LaunchPlanService.get(str(project), str(profile), "standard")
+    assert LaunchPlanService.get(str(project), str(profile), "standard") is plan
+    assert LaunchPlanService.get(str(project), str(profile), "preview") is not plan
+
+def test_memo_computes_once(workspace):
+    project, profile = workspace
+    plan = LaunchPlanService.get(str(project), str(profile), "standard")
+    calls = []
+    for _ in range(3):
+        plan.memo("image", lambda: calls.append(1) or "img")
+    assert calls == [1]
+
+@pytest.mark.parametrize("touch", ["extra-args", "profile", "git"])
+def test_mtime_changes_invalidate(workspace, touch):
+    project, profile = workspace
+    plan = LaunchPlanService.get(str(project / "src"), str(profile), "standard")
+
+    target = {"extra-args": profile / "extra-args", "profile": profile, "git": project / ".git"}[touch]
+    os.utime(target, (1000, 1000))
+    assert LaunchPlanService.get(str(project / "src"), str(profile), "standard") is not plan
+
+def test_ttl_expiry(workspace, mocker):
+    project, _ = workspace
+    plan = LaunchPlanService.get(str(project), None, "standard")
+    mocker.patch.object(Config, "HUB_LAUNCH_PLAN_TTL", 0)
+    assert LaunchPlanService.get(str(project), None, "standard") is not plan
+
+def test_cache_is_bounded(workspace, mocker):
+    project, _ = workspace
+    mocker.patch.object(Config, "HUB_LAUNCH_PLAN_CACHE_SIZE", 2)
+    first = LaunchPlanService.get(str(project), None, "a")
+    LaunchPlanService.get(str(project), None, "b")
+    LaunchPlanService.get(str(project), None, "c")
+    assert LaunchPlanService.get(str(project), None, "a") is not first
+
+def test_repeat_native_plan_skips_detection(tmp_path, mocker):
+    """A cached plan removes all Git detection from repeat launches."""
+    project = tmp_path / "repo"
+    project.mkdir()
+    git = ["git", "-c", "user.email=t@t", "-c", "user.name=t"]
+    subprocess.run(git + ["init", "-q"], cwd=project, check=True)
+    subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "init"], cwd=project, check=True)
+    LaunchPlanService.clear()
+
+    image_exists = mocker.patch("app.services.native_launcher.DockerAPI.image_exists", return_value=False)
+    env = {"HOME": str(tmp_path), "GEMINI_INTERNAL_RUN": "true", "HOST_DOCKER_GID": "1", "PATH": ""}
+    argv = ["--detached"]
+
+    plan = LaunchPlanService.get(str(project), None, "standard")
+    NativeLauncherService.plan(argv, str(project), env, plan)
+    image_calls = image_exists.call_count
+
+    run = mocker.spy(subprocess, "run")
+    NativeLauncherService.plan(argv, str(project), env, LaunchPlanService.get(str(project), None, "standard"))
+    assert run.call_count == 0
+    # Image lookups stay live: a local build made since the plan was cached is used
+    image_exists.return_value = True
+    run_args, _, _ = NativeLauncherService.plan(argv, str(project), env, LaunchPlanService.get(str(project), None, "standard"))
+    assert image_exists.call_count == image_calls + 2
+    assert "gemini-cli-toolbox/cli:latest" in run_args
@@ -1,3 +1,4 @@
+import pytest
 import subprocess
 from unittest.mock import patch
 from app.services.launcher import LauncherService
@@ -61,7 +62,8 @@ def test_launch_with_variant_and_docker():
         mock_run.return_value.stdout = "OK"
         mock_run.return_value.stderr = ""
         
-        with patch("app.config.Config.HUB_ROOTS", ["/mock/root"]):
+        with patch("app.config.Config.HUB_ROOTS", ["/mock/root"]), \
+             patch("app.services.launcher.ImageService.track_preview") as track_preview:
             result = LauncherService.launch(
                 "/mock/root/project", 
                 image_variant='preview', 
@@ -73,6 +75,7 @@ def test_launch_with_variant_and_docker():
             cmd = args[0]
             assert "--preview" in cmd
             assert "--no-docker" in cmd
+            track_preview.assert_called_once()
 
 def test_launch_with_worktree():
     """Test launch with worktree mode and explicit name."""
@@ -126,3 +129,104 @@ def test_launch_security_partial_match(tmp_path):
         with pytest.raises(PermissionError):
             LauncherService.launch(str(partial))
 
+
+def test_launch_worktree_passes_provision_mode():
+    """Worktree launches forward the configured provisioning mode to the toolbox."""
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.returncode = 0
+
+        with patch("app.config.Config.HUB_ROOTS", ["/mock/root"]), \
+             patch("app.config.Config.HUB_WORKTREE_PROVISION", "reflink"):
+            LauncherService.launch("/mock/root/project", worktree_mode=True)
+            assert mock_run.call_args[1]["env"]["GEMINI_WORKTREE_PROVISION"] == "reflink"
+
+def test_launch_anonymous_worktree_uses_pool():
+    """A claimed pool entry is handed to the toolbox via GEMINI_WORKTREE_ID."""
+    with patch("subprocess.run") as mock_run, \
+         patch("app.services.launcher.WorktreePoolService.claim", return_value="/cache/wt/app/exploration-ab12cd34") as mock_claim:
+        mock_run.return_value.returncode = 0
+
+        with patch("app.config.Config.HUB_ROOTS", ["/mock/root"]):
+            LauncherService.launch("/mock/root/project", worktree_mode=True)
+
+        mock_claim.assert_called_once_with("/mock/root/project", None)
+        assert mock_run.call_args[1]["env"]["GEMINI_WORKTREE_ID"] == "ab12cd34"
+
+def test_launch_worktree_falls_back_when_pool_fails():
+    """A filesystem error while claiming leaves the worktree to the toolbox."""
+    with patch("subprocess.run") as mock_run, \
+         patch("app.services.launcher.WorktreePoolService.claim", side_effect=FileNotFoundError("gone")):
+        mock_run.return_value.returncode = 0
+
+        with patch("app.config.Config.HUB_ROOTS", ["/mock/root"]):
+            result = LauncherService.launch("/mock/root/project", worktree_mode=True)
+
+        assert result["returncode"] == 0
+        assert "GEMINI_WORKTREE_ID" not in mock_run.call_args[1]["env"]
+
+def test_stream_forwards_lines_and_keeps_tail(mocker):
+    """Streaming launches forward merged output line by line and keep a bounded tail."""
+    mocker.patch("app.config.Config.HUB_LAUNCH_OUTPUT_LINES", 2)
+    lines = []
+    result = LauncherService._stream(["bash", "-c", "echo one; echo two >&2; echo three"], "/", {}, lines.append)
+
+    assert lines == ["one", "two", "three"]
+    assert result == {"stdout": "two\nthree\n", "stderr": "", "returncode": 0}
+
+def test_stream_timeout_kills_process():
+    result = LauncherService._stream(["bash", "-c", "echo waiting; sleep 10"], "/", {}, lambda line: None, timeout=0.2)
+    assert result["returncode"] == -1
+    assert "timed out" in result["stderr"]
+    assert result["stdout"] == "waiting\n"
+
+def test_stream_timeout_restarts_on_output():
+    """A launch that keeps printing progress is not cut off by the inactivity timeout."""
+    result = LauncherService._stream(["bash", "-c", "for i in 1 2 3 4 5; do echo $i; sleep 0.1; done"],
+                                     "/", {}, lambda line: None, timeout=0.3)
+    assert result["returncode"] == 0
+    assert result["stdout"] == "1\n2\n3\n4\n5\n"
+
+def test_launch_with_output_callback_streams(mocker):
+    stream = mocker.patch.object(LauncherService, "_stream", return_value={"stdout": "ok\n", "stderr": "", "returncode": 0})
+    run = mocker.patch("subprocess.run")
+    mocker.patch("app.config.Config.HUB_ROOTS", ["/mock/root"])
+
+    result = LauncherService.launch("/mock/root/project", on_output=print)
+
+    run.assert_not_called()
+    assert stream.call_args[0][0][:3] == ["gemini-toolbox", "--remote", "--detached"]
+    assert result["command"].startswith("gemini-toolbox")
+
+def test_launch_resources_become_docker_args(mocker):
+    """Resource fields are validated and appended to the docker options."""
+    mocker.patch("app.config.Config.HUB_ROOTS", ["/mock/root"])
+    mocker.patch("app.services.launcher.ResourceService.policies", return_value={"default": {"memory": "4g"}})
+    run = mocker.patch("subprocess.run")
+    run.return_value.returncode = 0
+
+    LauncherService.launch("/mock/root/project", docker_args="-v /a:/a", resources={"cpus": 1, "io_weight": 100})
+    cmd = run.call_args[0][0]
+    assert cmd[cmd.index("--docker-args") + 1] == "-v /a:/a --cpus 1 --memory 4g --blkio-weight 100"
+
+    run.reset_mock()
+    with pytest.raises(ValueError):
+        LauncherService.launch("/mock/root/project", resources={"io_weight": 1})
+    run.assert_not_called()
+
+def test_launch_success_starts_readiness_probe(mocker):
+    """The launched session is named in the result and probed right away."""
+    mocker.patch("app.config.Config.HUB_ROOTS", ["/mock/root"])
+    run = mocker.patch("subprocess.run")
+    run.return_value.returncode = 0
+    run.return_value.stdout = ""
+    run.return_value.stderr = ">> Container started: gem-project-cli-a1b2\n"
+    track = mocker.patch("app.services.launcher.ReadinessService.track")
+
+    result = LauncherService.launch("/mock/root/project")
+    assert result["session"] == "gem-project-cli-a1b2"
+    track.assert_called_once_with("gem-project-cli-a1b2")
+
+    run.return_value.returncode = 1
+    track.reset_mock()
+    assert "session" not in LauncherService.launch("/mock/root/project")
+    track.assert_not_called()
@@ -12,3 +12,20 @@ def test_monitor_shutdown_disabled():
         with patch("threading.Thread") as mock_thread:
             MonitorService.start()
             mock_thread.assert_not_called()
+
+def test_monitor_busy_delegates_to_shutdown():
+    """Anything a shutdown would have to wait for keeps the Hub alive."""
+    with patch("app.services.monitor.ShutdownService.pending", return_value="prune in progress"):
+        assert MonitorService.busy() == "prune in progress"
+
+def test_monitor_timeout_from_config():
+    with patch.object(Config, "HUB_SHUTDOWN_TIMEOUT", 300), \
+         patch("app.services.monitor.time.time", return_value=1000), \
+         patch("app.services.monitor.MonitorService.check_and_shutdown", side_effect=Exception("Stop")) as mock_check, \
+         patch("app.services.monitor.time.sleep", side_effect=Exception("Stop loop")):
+        try:
+            MonitorService._monitor_loop()
+        except Exception as e:
+            if str(e) != "Stop loop":
+                raise e
+        mock_check.assert_called_once_with(1000, 300)
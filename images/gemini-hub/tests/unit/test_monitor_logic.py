@@ -1,46 +1,49 @@
 import pytest
 from unittest.mock import patch
-import signal
 from app.services.monitor import MonitorService
+from app.services.traffic import TrafficService
 from app.config import Config
 
 @pytest.fixture(autouse=True)
 def mock_monitor_deps():
     """Ensure all tests have stable, non-interfering mocks."""
+    TrafficService.clear()
     with patch("time.time", return_value=2000), \
-         patch("os.getpid", return_value=1234), \
-         patch("os.kill") as mock_kill:
-        yield mock_kill
+         patch("app.services.monitor.MonitorService.busy", return_value=None), \
+         patch("app.services.monitor.ShutdownService.shutdown") as mock_shutdown:
+        yield mock_shutdown
+    TrafficService.clear()
 
 def test_monitor_activity_permutations(mock_monitor_deps):
     """Verify that any activity (local or remote) prevents shutdown."""
     scenarios = [
-        (True, False, 2000, False), # Local only -> Active, No Kill
-        (False, True, 2000, False), # Remote only -> Active, No Kill
-        (True, True, 2000, False),  # Both -> Active, No Kill
-        (False, False, 1000, True)  # None -> Remains Idle, TRIGGER KILL
+        (1, 0, 0, 2000, False), # Telemetry registry only -> Active, No Kill
+        (0, 2, 0, 2000, False), # Docker socket only -> Active, No Kill
+        (0, 0, 1, 2000, False), # Remote only -> Active, No Kill
+        (0, 0, 0, 1000, True)   # None -> Remains Idle, TRIGGER KILL
     ]
     
-    for running, reachable, expected, should_kill in scenarios:
+    for streams, containers, peers, expected, should_kill in scenarios:
         mock_monitor_deps.reset_mock()
-        mock_sessions = [{"is_running": running, "is_reachable": reachable}]
-        with patch("app.services.discovery.DiscoveryService.get_sessions", return_value=mock_sessions):
+        with patch("app.services.monitor.TelemetryService.count", return_value=streams), \
+             patch("app.services.monitor.DockerAPI.list_sessions", return_value=[{}] * containers), \
+             patch("app.services.monitor.TailscaleService.count_online_sessions", return_value=peers):
             res = MonitorService.check_and_shutdown(last_active=1000, timeout=60)
-            assert res == expected, f"Failed for {running}/{reachable}"
+            assert res == expected, f"Failed for {streams}/{containers}/{peers}"
             if should_kill:
                 mock_monitor_deps.assert_called_once()
             else:
                 mock_monitor_deps.assert_not_called()
 
 def test_monitor_shutdown_trigger(mock_monitor_deps):
-    """Verify that SIGTERM is sent exactly when the timeout is exceeded."""
-    with patch("app.services.discovery.DiscoveryService.get_sessions", return_value=[]), \
+    """Verify that the shutdown starts exactly when the timeout is exceeded."""
+    with patch("app.services.monitor.MonitorService.active_sessions", return_value=0), \
          patch("time.time", return_value=1061):
         
         # 1061 - 1000 = 61s > 60s
         res = MonitorService.check_and_shutdown(last_active=1000, timeout=60)
         assert res == 1000
-        mock_monitor_deps.assert_called_once_with(1234, signal.SIGTERM)
+        mock_monitor_deps.assert_called_once_with("idle")
 
 def test_monitor_loop_resilience():
     """Ensure the monitor loop survives a discovery failure."""
@@ -58,7 +61,7 @@ def test_monitor_loop_resilience():
 
 def test_monitor_empty_sessions_idle(mock_monitor_deps):
     """Ensure no sessions results in idle status (no update to last_active)."""
-    with patch("app.services.discovery.DiscoveryService.get_sessions", return_value=[]), \
+    with patch("app.services.monitor.MonitorService.active_sessions", return_value=0), \
          patch("time.time", return_value=1050): # 1050 - 1000 = 50s (Still Idle, not stale)
         res = MonitorService.check_and_shutdown(last_active=1000, timeout=60)
         assert res == 1000 # Unchanged
@@ -67,8 +70,7 @@ def test_monitor_empty_sessions_idle(mock_monitor_deps):
 def test_monitor_online_hybrid_status(mock_monitor_deps):
     """Verify that being 'online' (either flag) prevents idle."""
     # Scenario: Offline on VPN, but Running locally
-    mock_sessions = [{"is_running": True, "is_reachable": False}]
-    with patch("app.services.discovery.DiscoveryService.get_sessions", return_value=mock_sessions), \
+    with patch("app.services.monitor.MonitorService.active_sessions", return_value=1), \
          patch("time.time", return_value=3000):
         res = MonitorService.check_and_shutdown(last_active=1000, timeout=60)
         assert res == 3000 # Updated
@@ -91,7 +93,7 @@ def test_monitor_start_logic_disabled():
 
 def test_monitor_check_and_shutdown_discovery_failure():
     """Verify that monitor handles discovery failure gracefully (no state update)."""
-    with patch("app.services.discovery.DiscoveryService.get_sessions") as mock_get:
+    with patch("app.services.monitor.MonitorService.active_sessions") as mock_get:
         mock_get.side_effect = Exception("Discovery Crashed")
         
         # Should catch exception and return the original last_active
@@ -115,3 +117,55 @@ def test_monitor_loop_iteration_timing():
         
         assert mock_check.call_count >= 1
         assert mock_sleep.call_count >= 1
+
+def test_active_sessions_stops_at_cheapest_signal():
+    """Later (more expensive) signals are only consulted when earlier ones see nothing."""
+    with patch("app.services.monitor.TelemetryService.count", return_value=3), \
+         patch("app.services.monitor.DockerAPI.list_sessions") as mock_list, \
+         patch("app.services.monitor.TailscaleService.count_online_sessions") as mock_peers:
+        assert MonitorService.active_sessions() == 3
+        mock_list.assert_not_called()
+        mock_peers.assert_not_called()
+
+    with patch("app.services.monitor.TelemetryService.count", return_value=0), \
+         patch("app.services.monitor.DockerAPI.list_sessions", side_effect=OSError("no socket")), \
+         patch("app.services.monitor.TailscaleService.count_online_sessions", return_value=2) as mock_peers:
+        assert MonitorService.active_sessions() == 2
+        mock_peers.assert_called_once()
+
+def test_next_interval_backs_off_and_tightens():
+    with patch.object(Config, "HUB_MONITOR_MIN_INTERVAL", 2), patch.object(Config, "HUB_MONITOR_MAX_INTERVAL", 30):
+        # Steady sessions: exponential backoff up to the maximum
+        assert MonitorService.next_interval(True, 2, 60) == 4
+        assert MonitorService.next_interval(True, 16, 60) == 30
+        # Idle: next check on the deadline, bounded by min/max
+        assert MonitorService.next_interval(False, 30, 12.5) == 12.5
+        assert MonitorService.next_interval(False, 30, 0.1) == 2
+        assert MonitorService.next_interval(False, 2, 60) == 30
+
+def test_monitor_loop_counts_idle_from_first_idle_check():
+    """After a sparse active check, the idle period starts at the next check, not the previous one."""
+    clock = iter([1000, 1000, 1001, 1001, 1030, 1030, 1031])
+    with patch("app.services.monitor.time.time", side_effect=lambda: next(clock)), \
+         patch("app.services.monitor.MonitorService.active_sessions", side_effect=[1, 0, Exception("Stop")]), \
+         patch("app.services.monitor.time.sleep", side_effect=[None, Exception("Stop loop")]) as mock_sleep, \
+         patch("app.services.monitor.ShutdownService.shutdown") as mock_kill:
+        try:
+            MonitorService._monitor_loop()
+        except Exception as e:
+            if str(e) != "Stop loop":
+                raise e
+        mock_kill.assert_not_called()
+        # Idle since 1030 with a 60s timeout: the next check is due at the deadline
+        assert mock_sleep.call_args_list[-1][0][0] == 30
+
+def test_client_activity_prevents_shutdown(mock_monitor_deps):
+    """A busy Hub or a recent client request keeps it alive without any session."""
+    with patch("app.services.monitor.MonitorService.active_sessions", return_value=0):
+        with patch("app.services.monitor.MonitorService.busy", return_value="1 launch(es) in progress"):
+            assert MonitorService.check_and_shutdown(last_active=1000, timeout=60) == 2000
+
+        # Last request 30s ago: the idle clock starts there
+        TrafficService._last_request = 1970
+        assert MonitorService.check_and_shutdown(last_active=1000, timeout=60) == 1970
+        mock_monitor_deps.assert_not_called()
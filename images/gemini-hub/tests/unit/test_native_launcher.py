@@ -0,0 +1,117 @@
+import json
+import threading
+import socketserver
+import http.server
+import pytest
+from app.config import Config
+from app.services.docker_api import DockerAPI
+from app.services.launcher import LauncherService
+from app.services.native_launcher import NativeLauncherService
+
+@pytest.fixture
+def env(tmp_path):
+    (tmp_path / "project").mkdir()
+    return {"HOME": str(tmp_path), "GEMINI_REMOTE_KEY": "tskey-1", "GEMINI_INTERNAL_RUN": "true",
+            "HOST_UID": "1000", "HOST_GID": "1000", "HOST_DOCKER_GID": "999", "PATH": ""}
+
+@pytest.fixture
+def api(mocker):
+    mocker.patch("app.services.native_launcher.DockerAPI.image_exists", return_value=True)
+    mocker.patch("app.services.native_launcher.DockerAPI.create_container", return_value="abc123")
+    mocker.patch("app.services.native_launcher.DockerAPI.start_container")
+    mocker.patch("app.services.native_launcher.DockerAPI.remove_container")
+    mocker.patch("app.services.native_launcher.DockerAPI.inspect_container",
+                 return_value={"NetworkSettings": {"Ports": {"3000/tcp": [{"HostPort": "49153"}]}}})
+    return DockerAPI
+
+def test_plan_requires_detached(env, tmp_path):
+    with pytest.raises(NotImplementedError):
+        NativeLauncherService.plan(["--bash"], str(tmp_path / "project"), env)
+
+def test_plan_rejects_unsupported_docker_args(env, tmp_path):
+    with pytest.raises(NotImplementedError):
+        NativeLauncherService.plan(["--detached", "--docker-args", "--privileged"], str(tmp_path / "project"), env)
+
+def test_plan_user_errors(env, tmp_path):
+    project = str(tmp_path / "project")
+    with pytest.raises(ValueError, match="incompatible"):
+        NativeLauncherService.plan(["--detached", "--remote", "--no-vpn"], project, env)
+    with pytest.raises(ValueError, match="TAILSCALE_KEY"):
+        NativeLauncherService.plan(["--detached", "--remote"], project, dict(env, GEMINI_REMOTE_KEY=""))
+
+def test_launch_creates_and_starts(env, api, tmp_path):
+    result = NativeLauncherService.launch(["--remote", "--detached", "--image", "img:1"], str(tmp_path / "project"), env)
+
+    assert result["returncode"] == 0
+    assert "Container started: gem-project-geminicli-" in result["stderr"]
+    assert "http://localhost:49153" in result["stderr"]
+    name, config = api.create_container.call_args[0]
+    assert name.startswith("gem-project-geminicli-")
+    assert config["Image"] == "img:1"
+    api.start_container.assert_called_once_with("abc123")
+
+def test_launch_pulls_missing_image(env, api, tmp_path, mocker):
+    mocker.patch("app.services.native_launcher.DockerAPI.image_exists", return_value=False)
+    pull = mocker.patch("app.services.native_launcher.DockerAPI.pull")
+    NativeLauncherService.launch(["--detached", "--image", "img:1"], str(tmp_path / "project"), env)
+    pull.assert_called_once_with("img:1")
+
+def test_launch_start_failure_removes_container(env, api, tmp_path, mocker):
+    api.start_container.side_effect = RuntimeError("port conflict")
+    result = NativeLauncherService.launch(["--detached", "--image", "img:1"], str(tmp_path / "project"), env)
+
+    assert result["returncode"] == 1
+    assert "port conflict" in result["stderr"]
+    api.remove_container.assert_called_once_with("abc123")
+
+def test_launcher_falls_back_to_toolbox(mocker):
+    mocker.patch.object(Config, "HUB_LAUNCH_ENGINE", "native")
+    mocker.patch.object(Config, "HUB_ROOTS", ["/mock/root"])
+    mocker.patch("app.services.launcher.NativeLauncherService.launch", side_effect=NotImplementedError("unsupported"))
+    run = mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=0, stdout="ok", stderr=""))
+
+    result = LauncherService.launch("/mock/root/project")
+    assert result["stdout"] == "ok"
+    assert run.call_args[0][0][0] == "gemini-toolbox"
+
+def test_launcher_uses_native_engine(mocker):
+    mocker.patch.object(Config, "HUB_LAUNCH_ENGINE", "native")
+    mocker.patch.object(Config, "HUB_ROOTS", ["/mock/root"])
+    native = mocker.patch("app.services.launcher.NativeLauncherService.launch",
+                          return_value={"stdout": "id", "stderr": "", "returncode": 0})
+    run = mocker.patch("subprocess.run")
+
+    result = LauncherService.launch("/mock/root/project", session_type="bash")
+    assert result["engine"] == "native"
+    assert native.call_args[0][0] == ["--remote", "--detached", "--bash"]
+    run.assert_not_called()
+
+class _FakeDaemon(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        payload = json.dumps({"Id": "c1", "Echo": body, "Path": self.path}).encode()
+        self.send_response(201)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def test_docker_api_over_unix_socket(tmp_path, mocker):
+    """The client speaks HTTP over the daemon's Unix socket."""
+    sock = str(tmp_path / "docker.sock")
+    server = socketserver.UnixStreamServer(sock, _FakeDaemon)
+    server.get_request = lambda: (server.socket.accept()[0], ("local", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mocker.patch.object(Config, "DOCKER_SOCKET", sock)
+
+    try:
+        status, data = DockerAPI.request("POST", "/containers/create", body={"Image": "img"}, query={"name": "gem-x"})
+        assert status == 201
+        assert data["Echo"] == {"Image": "img"}
+        assert data["Path"] == "/containers/create?name=gem-x"
+        assert DockerAPI.create_container("gem-x", {"Image": "img"}) == "c1"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,6 +1,7 @@
 import os
 import time
 from app.services.prune import PruneService
+from app.services.session_index import SessionIndex
 from app.config import Config
 
 def test_prune_prune(tmp_path, mocker):
@@ -37,7 +38,9 @@ def test_prune_prune(tmp_path, mocker):
     def mock_git_run(cmd, **kwargs):
         path = cmd[2]
         class MockResult:
-            def __init__(self, code): self.returncode = code
+            def __init__(self, code):
+                self.returncode = code
+                self.stdout = ""
         
         if "stale-branch" in path or "fresh" in path:
             return MockResult(0) # Branch
@@ -46,6 +49,8 @@ def test_prune_prune(tmp_path, mocker):
         return MockResult(128) # Error
         
     mocker.patch("subprocess.run", side_effect=mock_git_run)
+    # No live sessions
+    mocker.patch("app.services.prune.SessionIndexService.build", return_value=SessionIndex({}))
     
     now = time.time()
     
@@ -93,3 +98,102 @@ def test_prune_disabled(mocker):
     mock_thread.assert_not_called()
 
 
+
+def test_prune_skips_worktree_with_live_session(tmp_path, mocker):
+    """A stale worktree mounted by a running gem-* container is never removed."""
+    root = tmp_path / "worktrees"
+    busy = root / "proj" / "busy"
+    idle = root / "proj" / "idle"
+    busy.mkdir(parents=True)
+    idle.mkdir(parents=True)
+    for p in (busy, idle):
+        os.utime(p, (0, 0))
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=1, stdout=""))
+    build = mocker.patch("app.services.prune.SessionIndexService.build",
+                         return_value=SessionIndex({str(busy): ["gem-proj-busy-geminicli-1"]}))
+
+    PruneService.prune()
+
+    assert busy.exists()
+    assert not idle.exists()
+    build.assert_called_once()
+
+def test_prune_reads_state_from_refreshed_inventory(tmp_path, mocker):
+    """A pass right after the scheduler's refresh runs no git command."""
+    from app.services.worktree import WorktreeService
+    root = tmp_path / "worktrees"
+    stale = root / "proj" / "stale"
+    stale.mkdir(parents=True)
+    os.utime(stale, (0, 0))
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch.object(Config, "HUB_WORKTREE_INVENTORY_TTL", 30)
+    run = mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=1, stdout=""))
+    mocker.patch("app.services.prune.SessionIndexService.build", return_value=SessionIndex({}))
+    WorktreeService.refresh(force=True, sizes=False)
+    run.reset_mock()
+
+    PruneService.prune()
+    run.assert_not_called()
+    assert not stale.exists()
+
+def test_prune_keeps_stale_worktree_when_docker_fails(tmp_path, mocker):
+    """If the session index cannot be built, nothing is removed and a rescan is due."""
+    root = tmp_path / "worktrees"
+    stale = root / "proj" / "stale"
+    stale.mkdir(parents=True)
+    os.utime(stale, (0, 0))
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=1, stdout="", stderr="daemon down"))
+    reclaim = mocker.patch("app.services.prune.WorktreePoolService.reclaim")
+
+    PruneService.prune()
+
+    assert stale.exists()
+    assert PruneService._next_expiry <= time.time()
+    reclaim.assert_not_called()
+
+def test_prune_no_index_when_nothing_stale(tmp_path, mocker):
+    """The session index (Docker calls) is only built if a worktree is stale."""
+    root = tmp_path / "worktrees"
+    (root / "proj" / "fresh").mkdir(parents=True)
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=1, stdout=""))
+    build = mocker.patch("app.services.prune.SessionIndexService.build")
+
+    PruneService.prune()
+    build.assert_not_called()
+
+def test_prune_reclaims_pool_only_on_full_scan(tmp_path, mocker):
+    """Hidden pool entries are skipped by the expiry pass and handed to the pool."""
+    root = tmp_path / "worktrees"
+    pool_entry = root / "proj" / ".pool-abc"
+    pool_entry.mkdir(parents=True)
+    os.utime(pool_entry, (0, 0))
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=1, stdout=""))
+    reclaim = mocker.patch("app.services.prune.WorktreePoolService.reclaim", return_value=0)
+
+    PruneService.prune(projects={"proj"})
+    reclaim.assert_not_called()
+    assert pool_entry.exists()
+
+    PruneService.prune()
+    reclaim.assert_called_once_with(str(root))
+
+def test_prune_loop_exits_on_shutdown(mocker):
+    """Once a shutdown has started, no new prune pass begins."""
+    from app.services.shutdown import ShutdownService
+    mocker.patch.object(PruneService, "_wakeup")
+    mock_tick = mocker.patch.object(PruneService, "tick")
+    ShutdownService._stopping.set()
+    try:
+        PruneService._prune_loop()
+    finally:
+        ShutdownService.clear()
+    mock_tick.assert_not_called()
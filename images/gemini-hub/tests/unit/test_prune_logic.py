@@ -1,4 +1,7 @@
+import os
+import pytest
 from app.services.prune import PruneService
+from app.services.session_index import SessionIndex
 
 def test_prune_start_enabled(mocker):
     """Verify that PruneService starts its thread if enabled."""
@@ -95,3 +98,120 @@ def test_prune_rmtree_error_handling(mocker, tmp_path):
     
     PruneService.prune()
     assert True
+
+# --- Scheduler (event-triggered, jittered) ---
+
+@pytest.fixture
+def scheduler(mocker, tmp_path):
+    """Resets scheduler state and points it at an empty worktree root."""
+    from app.config import Config
+    root = tmp_path / "worktrees"
+    root.mkdir()
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch.object(Config, "HUB_WORKTREE_PRUNE_ENABLED", True)
+    mocker.patch.object(Config, "HUB_PRUNE_INTERVAL", 3600)
+    mocker.patch.object(Config, "HUB_PRUNE_JITTER", 0)
+    mocker.patch.object(Config, "HUB_PRUNE_BUSY_RETRY", 60)
+    mocker.patch.object(PruneService, "_targets", set())
+    mocker.patch.object(PruneService, "_force", False)
+    mocker.patch.object(PruneService, "_last_generation", None)
+    mocker.patch.object(PruneService, "_next_expiry", 0.0)
+    mocker.patch.object(PruneService, "disk_pressure", return_value=False)
+    mocker.patch("app.services.prune.LauncherService.in_flight", return_value=0)
+    mocker.patch("time.time", return_value=10000.0)
+    return mocker.patch.object(PruneService, "prune")
+
+def test_scheduler_waits_until_due(scheduler):
+    """No scan runs before the scheduled time."""
+    assert PruneService.tick(next_scan=20000.0) == 20000.0
+    scheduler.assert_not_called()
+
+def test_scheduler_runs_when_due(scheduler):
+    assert PruneService.tick(next_scan=9000.0) == 10000.0 + 3600
+    scheduler.assert_called_once_with()
+
+def test_scheduler_defers_during_launch(scheduler, mocker):
+    """A due scan is postponed while a launch is in flight."""
+    mocker.patch("app.services.prune.LauncherService.in_flight", return_value=1)
+    assert PruneService.tick(next_scan=9000.0) == 10000.0 + 60
+    scheduler.assert_not_called()
+
+def test_scheduler_skips_unchanged_inventory(scheduler, mocker):
+    """A due scan is skipped if nothing changed and nothing can have expired."""
+    from app.services.worktree import WorktreeService
+    mocker.patch.object(WorktreeService, "generation", return_value=7)
+    mocker.patch.object(PruneService, "_last_generation", 7)
+    mocker.patch.object(PruneService, "_next_expiry", 50000.0)
+
+    PruneService.tick(next_scan=9000.0)
+    scheduler.assert_not_called()
+
+def test_scheduler_rescans_when_expiry_reached(scheduler, mocker):
+    from app.services.worktree import WorktreeService
+    mocker.patch.object(WorktreeService, "generation", return_value=7)
+    mocker.patch.object(PruneService, "_last_generation", 7)
+    mocker.patch.object(PruneService, "_next_expiry", 9999.0)
+
+    PruneService.tick(next_scan=9000.0)
+    scheduler.assert_called_once_with()
+
+def test_scheduler_disk_pressure_triggers_early_scan(scheduler, mocker):
+    mocker.patch.object(PruneService, "disk_pressure", return_value=True)
+    PruneService.tick(next_scan=20000.0)
+    scheduler.assert_called_once_with()
+
+def test_scheduler_targeted_request(scheduler):
+    """A session-stop event prunes only the matching project, immediately."""
+    PruneService.request("app-feature", reason="test")
+    PruneService.tick(next_scan=20000.0)
+    scheduler.assert_called_once_with(projects={"app-feature"})
+
+def test_scheduler_full_request_bypasses_skip(scheduler, mocker):
+    from app.services.worktree import WorktreeService
+    mocker.patch.object(WorktreeService, "generation", return_value=7)
+    mocker.patch.object(PruneService, "_last_generation", 7)
+    mocker.patch.object(PruneService, "_next_expiry", 50000.0)
+
+    PruneService.request(reason="manual")
+    PruneService.tick(next_scan=20000.0)
+    scheduler.assert_called_once_with()
+
+def test_request_ignored_when_disabled(scheduler, mocker):
+    from app.config import Config
+    mocker.patch.object(Config, "HUB_WORKTREE_PRUNE_ENABLED", False)
+    PruneService.request("app")
+    assert PruneService._targets == set()
+
+def test_disk_pressure_threshold(mocker, tmp_path):
+    from collections import namedtuple
+    from app.config import Config
+    Usage = namedtuple("Usage", "total used free")
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(tmp_path))
+    mocker.patch.object(Config, "HUB_PRUNE_DISK_PRESSURE_PERCENT", 90)
+
+    mocker.patch("shutil.disk_usage", return_value=Usage(100, 95, 5))
+    assert PruneService.disk_pressure() is True
+    mocker.patch("shutil.disk_usage", return_value=Usage(100, 50, 50))
+    assert PruneService.disk_pressure() is False
+
+def test_disk_pressure_disabled(mocker):
+    from app.config import Config
+    mocker.patch.object(Config, "HUB_PRUNE_DISK_PRESSURE_PERCENT", 0)
+    assert PruneService.disk_pressure() is False
+
+def test_prune_targeted_projects_only(mocker, tmp_path):
+    """Targeted prunes leave other projects untouched."""
+    from app.config import Config
+    root = tmp_path / "root"
+    (root / "app" / "old").mkdir(parents=True)
+    (root / "other" / "old").mkdir(parents=True)
+    for p in (root / "app" / "old", root / "other" / "old"):
+        os.utime(p, (0, 0))
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch("subprocess.run", return_value=mocker.Mock(returncode=1, stdout=""))
+    mocker.patch("app.services.prune.SessionIndexService.build", return_value=SessionIndex({}))
+
+    PruneService.prune(projects={"app-feature"})
+    assert not (root / "app" / "old").exists()
+    assert (root / "other" / "old").exists()
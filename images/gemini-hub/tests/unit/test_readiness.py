@@ -0,0 +1,140 @@
+import threading
+import http.server
+import socketserver
+import pytest
+from app.config import Config
+from app.services.readiness import ReadinessService, _Probe
+
+NAME = "gem-proj-cli-abc"
+
+def _container(running=True, port="32768", status="running"):
+    ports = {"3000/tcp": [{"HostIp": "0.0.0.0", "HostPort": port}]} if port else {}
+    return {"State": {"Running": running, "Status": status, "ExitCode": 1}, "NetworkSettings": {"Ports": ports}}
+
+@pytest.fixture(autouse=True)
+def _readiness(mocker):
+    mocker.patch.object(Config, "HUB_NO_VPN", False)
+    mocker.patch.object(Config, "HUB_READINESS_INITIAL_DELAY", 0.25)
+    mocker.patch.object(Config, "HUB_READINESS_MAX_DELAY", 2)
+    mocker.patch.object(Config, "HUB_READINESS_TIMEOUT", 120)
+    mocker.patch("app.services.readiness.TailscaleService.is_available", return_value=True)
+    ReadinessService.clear()
+    yield
+    ReadinessService.clear()
+
+def test_check_progresses_through_all_signals(mocker):
+    inspect = mocker.patch("app.services.readiness.DockerAPI.inspect_container", return_value=None)
+    http_ok = mocker.patch.object(ReadinessService, "_http_ok", return_value=False)
+    status = mocker.patch("app.services.readiness.TailscaleService.get_status", return_value={})
+    probe = _Probe(NAME, vpn=True)
+
+    ReadinessService.check(probe)  # Not created yet
+    assert probe.checks == {"container": False, "port": False, "http": False, "peer": False}
+    assert probe.version == 0
+
+    inspect.return_value = _container()
+    ReadinessService.check(probe)  # Server not listening yet
+    assert probe.checks["container"] and probe.checks["port"] and not probe.checks["http"]
+    assert probe.local_url == "http://localhost:32768"
+    status.assert_not_called()
+
+    http_ok.return_value = True
+    ReadinessService.check(probe)  # Not on the tailnet yet
+    assert probe.checks["http"] and probe.status == "probing"
+
+    status.return_value = {"Peer": {"k": {"HostName": NAME, "Online": True}}}
+    ReadinessService.check(probe)
+    assert probe.status == "ready"
+    assert probe.to_dict()["ready"] is True
+    http_ok.assert_called_with(32768)
+
+def test_peer_check_skipped_without_vpn(mocker):
+    mocker.patch("app.services.readiness.DockerAPI.inspect_container", return_value=_container())
+    mocker.patch.object(ReadinessService, "_http_ok", return_value=True)
+    status = mocker.patch("app.services.readiness.TailscaleService.get_status")
+    probe = _Probe(NAME, vpn=False)
+    ReadinessService.check(probe)
+    assert probe.status == "ready"
+    assert probe.checks["peer"] is None
+    status.assert_not_called()
+
+def test_exited_container_fails_the_probe(mocker):
+    mocker.patch("app.services.readiness.DockerAPI.inspect_container",
+                 return_value=_container(running=False, status="exited"))
+    probe = _Probe(NAME, vpn=False)
+    ReadinessService.check(probe)
+    assert probe.status == "failed"
+    assert "exit code 1" in probe.error
+
+def test_probe_loop_backs_off_until_timeout(mocker):
+    mocker.patch.object(Config, "HUB_READINESS_TIMEOUT", 6)
+    mocker.patch("app.services.readiness.DockerAPI.inspect_container", return_value=None)
+    clock = [1000.0]
+    mocker.patch("app.services.readiness.time.time", side_effect=lambda: clock[0])
+    delays = []
+
+    def sleep(seconds):
+        delays.append(seconds)
+        clock[0] += seconds
+    mocker.patch("app.services.readiness.time.sleep", side_effect=sleep)
+
+    probe = _Probe(NAME, vpn=False)
+    ReadinessService._probe_loop(probe)
+    assert delays == [0.25, 0.5, 1, 2, 2]
+    assert probe.status == "timeout"
+
+def test_track_starts_one_probe_per_session(mocker):
+    loop = mocker.patch.object(ReadinessService, "_probe_loop")
+    first = ReadinessService.track(NAME)
+    second = ReadinessService.track(NAME)
+    assert loop.call_count == 1
+    assert first["status"] == second["status"] == "probing"
+
+def test_track_detects_vpn_outside_the_lock(mocker):
+    """Long-poll waiters are not blocked while Tailscale is detected."""
+    mocker.patch.object(ReadinessService, "_probe_loop")
+    held = []
+    mocker.patch("app.services.readiness.TailscaleService.is_available",
+                 side_effect=lambda: held.append(ReadinessService._cond._is_owned()) or True)
+    ReadinessService.track(NAME)
+    assert held == [False]
+
+def test_wait_returns_on_change(mocker):
+    mocker.patch.object(ReadinessService, "_probe_loop")
+    ReadinessService.track(NAME)
+    probe = ReadinessService._probes[NAME]
+
+    # Nothing new: returns the unchanged state after the timeout
+    assert ReadinessService.wait(NAME, version=0, timeout=0.01)["version"] == 0
+    assert ReadinessService.wait("gem-unknown-cli-x", 0, 0.01) is None
+
+    timer = threading.Timer(0.05, lambda: ReadinessService._update(probe, checks={"container": True}))
+    timer.start()
+    state = ReadinessService.wait(NAME, version=0, timeout=5)
+    timer.join()
+    assert state["version"] == 1
+    assert state["checks"]["container"] is True
+
+    # Re-applying the same state is not a change
+    ReadinessService._update(probe, checks={"container": True})
+    assert probe.version == 1
+
+class _Quiet(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(401)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def test_http_ok_accepts_any_response():
+    server = socketserver.TCPServer(("localhost", 0), _Quiet)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert ReadinessService._http_ok(port) is True
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert ReadinessService._http_ok(port) is False
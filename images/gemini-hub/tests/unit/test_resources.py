@@ -0,0 +1,47 @@
+import json
+import pytest
+from app.config import Config
+from app.services.resources import ResourceService
+
+@pytest.fixture
+def policies(tmp_path, mocker):
+    mocker.patch("app.services.resources.os.cpu_count", return_value=4)
+    path = tmp_path / "hub-resources.json"
+    mocker.patch.object(Config, "HUB_RESOURCE_POLICIES_FILE", str(path))
+    return path
+
+def test_validate_normalizes_fields(policies):
+    assert ResourceService.validate({"cpus": "2.0", "cpuset": "0-1, 3", "memory": "4G", "io_weight": 500}) == {
+        "cpus": "2", "cpuset": "0-1,3", "memory": "4g", "io_weight": "500"}
+
+@pytest.mark.parametrize("resources, message", [
+    ({"cpus": 0}, "cpus must be between"),
+    ({"cpus": 8}, "cpus must be between"),
+    ({"cpus": "many"}, "Invalid cpus"),
+    ({"cpuset": "0-9"}, "host CPUs"),
+    ({"cpuset": "3-1"}, "Invalid cpuset"),
+    ({"cpuset": "a"}, "Invalid cpuset"),
+    ({"memory": "1k"}, "at least 6m"),
+    ({"memory": "lots"}, "Invalid memory size"),
+    ({"io_weight": 5}, "between 10 and 1000"),
+    ({"gpus": 1}, "Unknown resource fields"),
+])
+def test_validate_rejects(policies, resources, message):
+    with pytest.raises(ValueError, match=message):
+        ResourceService.validate(resources)
+
+def test_resolve_merges_default_profile_and_request(policies):
+    policies.write_text(json.dumps({"default": {"memory": "4g", "cpus": 2}, "work": {"memory": "8g", "io_weight": 200}}))
+    assert ResourceService.resolve("work", {"cpus": 1}) == {"memory": "8g", "cpus": "1", "io_weight": "200"}
+    assert ResourceService.resolve("other") == {"memory": "4g", "cpus": "2"}
+    assert ResourceService.to_docker_args(ResourceService.resolve("other")) == ["--cpus", "2", "--memory", "4g"]
+
+def test_resolve_without_or_with_broken_policies(policies):
+    assert ResourceService.resolve("work") == {}
+    policies.write_text("{not json")
+    assert ResourceService.resolve("work", {"cpus": 1}) == {"cpus": "1"}
+
+def test_invalid_policy_is_reported(policies):
+    policies.write_text(json.dumps({"work": {"cpus": 64}}))
+    with pytest.raises(ValueError, match="Invalid resource policy 'work'"):
+        ResourceService.resolve("work")
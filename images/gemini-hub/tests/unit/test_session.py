@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from app.services.session import SessionService
+from app.services.activity import ActivityService
 
 def test_stop_invalid_id():
     with pytest.raises(PermissionError):
@@ -43,3 +44,90 @@ def test_stop_exception(mock_run):
     
     assert result["status"] == "error"
     assert "generic error" in result["error"]
+
+@patch("subprocess.run")
+def test_stop_success_requests_targeted_prune(mock_run):
+    mock_run.return_value = MagicMock(returncode=0, stdout="gem-app-feat-geminicli-1a2b", stderr="")
+    with patch("app.services.session.PruneService.request") as mock_request:
+        SessionService.stop("gem-app-feat-geminicli-1a2b")
+        assert mock_request.call_args[0][0] == "app-feat"
+
+def test_select_filters_by_project_type_and_idle(mocker):
+    containers = [
+        {"Id": "1", "Names": ["/gem-app-cli-a1"]},
+        {"Id": "2", "Names": ["/gem-app-bash-b2"]},
+        {"Id": "3", "Names": ["/gem-other-cli-c3"]},
+    ]
+    mocker.patch("app.services.session.DockerAPI.list_sessions", return_value=containers)
+    sample = mocker.patch("app.services.session.ActivityService.sample",
+                          return_value={"gem-app-cli-a1": 900, "gem-other-cli-c3": 30})
+
+    assert SessionService.select(project="app") == ["gem-app-bash-b2", "gem-app-cli-a1"]
+    assert SessionService.select(session_type="cli") == ["gem-app-cli-a1", "gem-other-cli-c3"]
+    sample.assert_not_called()
+
+    # Unsampled sessions (gem-app-bash-b2) count as active
+    assert SessionService.select(idle=600) == ["gem-app-cli-a1"]
+    sample.assert_called_once_with(containers)
+
+def test_select_idle_skips_busy_session_on_its_first_sample(mocker):
+    """A long-running session first seen by this Hub has no idle history yet."""
+    containers = [{"Id": "1", "Names": ["/gem-app-cli-a1"], "Created": 1}]
+    mocker.patch("app.services.session.DockerAPI.list_sessions", return_value=containers)
+    mocker.patch("app.services.activity.TelemetryService.latest", return_value=None)
+    mocker.patch("app.services.activity.DockerAPI.container_stats", return_value={
+        "cpu_stats": {"cpu_usage": {"total_usage": 10**15}}, "networks": {}})
+    ActivityService.clear()
+
+    assert SessionService.select(idle=600) == []
+    ActivityService.clear()
+
+def test_stop_container_uses_engine_api(mocker):
+    stop = mocker.patch("app.services.session.DockerAPI.stop_container")
+    request = mocker.patch("app.services.session.PruneService.request")
+
+    assert SessionService.stop_container("gem-app-cli-a1", 3) == {"status": "success", "session_id": "gem-app-cli-a1"}
+    stop.assert_called_once_with("gem-app-cli-a1", 3)
+    request.assert_called_once()
+
+    stop.side_effect = RuntimeError("No such container")
+    result = SessionService.stop_container("gem-app-cli-a1", 3)
+    assert result["status"] == "error" and "No such container" in result["error"]
+
+    with pytest.raises(PermissionError):
+        SessionService.stop_container("postgres", 3)
+
+def test_docker_api_stop_waits_for_grace(mocker):
+    from app.services.docker_api import DockerAPI
+    request = mocker.patch.object(DockerAPI, "request", return_value=(204, None))
+    DockerAPI.stop_container("gem-app-cli-a1", 20)
+    request.assert_called_once_with("POST", "/containers/gem-app-cli-a1/stop", query={"t": "20"}, timeout=35)
+
+    request.return_value = (404, {"message": "No such container"})
+    with pytest.raises(RuntimeError, match="No such container"):
+        DockerAPI.stop_container("gem-app-cli-a1", 20)
+
+def test_pause_and_resume(mocker):
+    pause = mocker.patch("app.services.session.DockerAPI.pause_container")
+    unpause = mocker.patch("app.services.session.DockerAPI.unpause_container")
+
+    assert SessionService.pause("gem-app-cli-a1") == {"status": "success", "session_id": "gem-app-cli-a1"}
+    pause.assert_called_once_with("gem-app-cli-a1")
+    assert SessionService.resume("gem-app-cli-a1")["status"] == "success"
+    unpause.assert_called_once_with("gem-app-cli-a1")
+
+    pause.side_effect = RuntimeError("Container is already paused")
+    assert SessionService.pause("gem-app-cli-a1")["error"] == "Container is already paused"
+
+    with pytest.raises(PermissionError):
+        SessionService.resume("postgres")
+
+def test_stop_container_thaws_paused_session(mocker):
+    stop = mocker.patch("app.services.session.DockerAPI.stop_container",
+                        side_effect=[RuntimeError("Container gem-app-cli-a1 is paused. Unpause the container before stopping"), None])
+    unpause = mocker.patch("app.services.session.DockerAPI.unpause_container")
+    mocker.patch("app.services.session.PruneService.request")
+
+    assert SessionService.stop_container("gem-app-cli-a1", 3)["status"] == "success"
+    unpause.assert_called_once_with("gem-app-cli-a1")
+    assert stop.call_count == 2
@@ -0,0 +1,94 @@
+import json
+from unittest.mock import MagicMock
+from app.services.session_index import SessionIndex, SessionIndexService
+
+def inspect_payload(*containers):
+    return json.dumps([
+        {"Name": f"/{name}", "Mounts": [{"Type": "bind", "Source": s} for s in sources]}
+        for name, sources in containers
+    ])
+
+def test_index_exact_mount():
+    index = SessionIndex({"/cache/wt/app/feat": ["gem-app-feat-geminicli-1"]})
+    assert index.sessions_for("/cache/wt/app/feat") == ["gem-app-feat-geminicli-1"]
+
+def test_index_ancestor_mount_covers_children():
+    """A session mounting a parent directory protects every worktree below it."""
+    index = SessionIndex({"/cache/wt/app": ["gem-app-bash-1"]})
+    assert index.is_active("/cache/wt/app/feat") is True
+
+def test_index_descendant_mount_covers_parent():
+    index = SessionIndex({"/cache/wt/app/feat/sub": ["gem-app-bash-1"]})
+    assert index.is_active("/cache/wt/app/feat") is True
+
+def test_index_sibling_is_not_active():
+    index = SessionIndex({"/cache/wt/app/feat": ["gem-app-bash-1"]})
+    assert index.is_active("/cache/wt/app/feat-2") is False
+
+def test_index_sessions_listing():
+    index = SessionIndex({"/a": ["gem-b-cli-1"], "/b": ["gem-a-cli-1", "gem-b-cli-1"]})
+    assert index.sessions == ["gem-a-cli-1", "gem-b-cli-1"]
+
+def test_build_uses_single_bulk_inspect(mocker):
+    run = mocker.patch("subprocess.run", side_effect=[
+        MagicMock(returncode=0, stdout="id1\nid2\n"),
+        MagicMock(returncode=0, stdout=inspect_payload(
+            ("gem-app-feat-geminicli-1", ["/cache/wt/app/feat"]),
+            ("not-gem", ["/cache/wt/app/other"])
+        ))
+    ])
+    index = SessionIndexService.build()
+
+    assert run.call_count == 2
+    assert run.call_args_list[1][0][0] == ["docker", "inspect", "id1", "id2"]
+    assert index.sessions == ["gem-app-feat-geminicli-1"]
+
+def test_build_ignores_named_volumes(mocker):
+    payload = json.dumps([{"Name": "/gem-app-cli-1", "Mounts": [{"Type": "volume", "Source": "/var/lib/docker/volumes/x"}]}])
+    mocker.patch("subprocess.run", side_effect=[
+        MagicMock(returncode=0, stdout="id1"),
+        MagicMock(returncode=0, stdout=payload)
+    ])
+    assert SessionIndexService.build().sessions == []
+
+def test_build_no_containers_skips_inspect(mocker):
+    run = mocker.patch("subprocess.run", return_value=MagicMock(returncode=0, stdout=""))
+    assert SessionIndexService.build().sessions == []
+    assert run.call_count == 1
+
+def test_build_docker_failure_is_none(mocker):
+    mocker.patch("subprocess.run", return_value=MagicMock(returncode=1, stdout="", stderr="daemon down"))
+    assert SessionIndexService.build() is None
+
+def test_build_inspect_failure_is_none(mocker):
+    mocker.patch("subprocess.run", side_effect=[
+        MagicMock(returncode=0, stdout="id1"),
+        MagicMock(returncode=1, stdout="", stderr="gone")
+    ])
+    assert SessionIndexService.build() is None
+
+def test_build_exception_is_none(mocker):
+    mocker.patch("subprocess.run", side_effect=Exception("no docker"))
+    assert SessionIndexService.build() is None
+
+def test_get_caches_within_ttl(mocker):
+    build = mocker.patch.object(SessionIndexService, "build", return_value=SessionIndex({}))
+    mocker.patch.object(SessionIndexService, "_index", None)
+    SessionIndexService.get(max_age=60)
+    SessionIndexService.get(max_age=60)
+    assert build.call_count == 1
+
+def test_invalidate_forces_rebuild(mocker):
+    build = mocker.patch.object(SessionIndexService, "build", return_value=SessionIndex({}))
+    mocker.patch.object(SessionIndexService, "_index", None)
+    SessionIndexService.get(max_age=60)
+    SessionIndexService.invalidate()
+    SessionIndexService.get(max_age=60)
+    assert build.call_count == 2
+
+def test_get_does_not_cache_failed_build(mocker):
+    build = mocker.patch.object(SessionIndexService, "build", return_value=None)
+    mocker.patch.object(SessionIndexService, "_index", None)
+    assert SessionIndexService.get(max_age=60).sessions == []
+    SessionIndexService.get(max_age=60)
+    assert build.call_count == 2
@@ -0,0 +1,80 @@
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from app.services.shutdown import ShutdownService
+from app.services.traffic import TrafficService
+
+@pytest.fixture(autouse=True)
+def clean_shutdown():
+    ShutdownService.clear()
+    TrafficService.clear()
+    with patch("app.services.shutdown.LaunchJobService.pending", return_value=0), \
+         patch("app.services.shutdown.LauncherService.in_flight", return_value=0):
+        yield
+    ShutdownService.clear()
+    TrafficService.clear()
+
+def test_pending_reasons():
+    assert ShutdownService.pending() is None
+
+    TrafficService.begin()
+    assert ShutdownService.pending() == "1 request(s) in flight"
+    TrafficService.end()
+
+    with patch("app.services.shutdown.LaunchJobService.pending", return_value=2):
+        assert ShutdownService.pending() == "2 launch(es) in progress"
+
+    with ShutdownService.guard("prune") as allowed:
+        assert allowed
+        assert ShutdownService.pending() == "prune in progress"
+    assert ShutdownService.pending() is None
+
+def test_guard_refuses_work_once_stopping():
+    ShutdownService.drain(timeout=0)
+    with ShutdownService.guard("prune") as allowed:
+        assert not allowed
+        assert ShutdownService.pending() is None
+
+def test_drain_waits_for_guarded_work_then_flushes():
+    """The drain returns only after the guarded work ends, and flushes afterwards."""
+    order = []
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        with ShutdownService.guard("prune"):
+            started.set()
+            release.wait(5)
+            order.append("work")
+
+    worker = threading.Thread(target=work)
+    worker.start()
+    started.wait(5)
+    hook = MagicMock(side_effect=lambda: order.append("flush"))
+    with patch.object(ShutdownService, "_flush_hooks", [hook]):
+        threading.Timer(0.1, release.set).start()
+        assert ShutdownService.drain(timeout=5) is True
+    worker.join(5)
+    assert order == ["work", "flush"]
+
+def test_drain_gives_up_at_deadline():
+    failing = MagicMock(side_effect=OSError("disk full"))
+    flushed = MagicMock()
+    with patch.object(ShutdownService, "_flush_hooks", [failing, flushed]):
+        TrafficService.begin()
+        assert ShutdownService.drain(timeout=0.1) is False
+    # A failing hook does not prevent the others
+    flushed.assert_called_once()
+
+def test_shutdown_runs_once():
+    with patch("app.services.shutdown.ShutdownService.drain") as mock_drain, \
+         patch("app.services.shutdown.os._exit") as mock_exit:
+        ShutdownService.shutdown("idle")
+        ShutdownService.shutdown("SIGTERM")
+    mock_drain.assert_called_once()
+    mock_exit.assert_called_once_with(0)
+
+def test_requests_rejected_while_draining(client):
+    ShutdownService.drain(timeout=0)
+    response = client.get('/api/launch/metrics')
+    assert response.status_code == 503
+    assert TrafficService.snapshot()["in_flight"] == 0
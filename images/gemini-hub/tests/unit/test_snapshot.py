@@ -0,0 +1,105 @@
+import json
+import threading
+import pytest
+from unittest.mock import patch
+from app.config import Config
+from app.services.snapshot import SnapshotService
+from app.services.worktree import WorktreeService
+from app.services.worktree_pool import WorktreePoolService
+
+@pytest.fixture(autouse=True)
+def snapshot_path(tmp_path, monkeypatch):
+    path = tmp_path / "hub" / "snapshot.json"
+    monkeypatch.setattr(Config, "HUB_SNAPSHOT_PATH", str(path))
+    monkeypatch.setattr(Config, "WORKTREE_ROOT", str(tmp_path / "worktrees"))
+    SnapshotService.clear()
+    monkeypatch.setattr(WorktreeService, "_entries", {})
+    monkeypatch.setattr(WorktreeService, "_root", None)
+    monkeypatch.setattr(WorktreePoolService, "_usage", {})
+    monkeypatch.setattr(WorktreePoolService, "_usage_known", False)
+    yield path
+    SnapshotService.clear()
+
+def test_save_and_load_round_trip(snapshot_path, tmp_path):
+    worktree = {"project": "app", "name": "feat", "path": str(tmp_path / "worktrees/app/feat"),
+                "state": "branch", "branch": "feat", "last_activity": 100.0,
+                "size_bytes": 4096, "sessions": [], "size_checked_at": 90.0}
+    WorktreePoolService._usage["/src/app"] = 4
+    with patch("app.services.snapshot.WorktreeService.dump", return_value=[worktree]):
+        SnapshotService.save([{"name": "gem-app-cli-1", "online": True}])
+    WorktreePoolService._usage.clear()
+
+    data = json.loads(snapshot_path.read_text())
+    assert data["version"] == SnapshotService.VERSION
+    assert data["sessions"] == [{"name": "gem-app-cli-1", "online": True}]
+
+    assert SnapshotService.load()
+    assert SnapshotService.stale_sessions() == [{"name": "gem-app-cli-1", "online": True, "stale": True}]
+    entry = WorktreeService._entries[worktree["path"]]
+    assert (entry.state, entry.branch, entry.mtime, entry.size_bytes) == ("branch", "feat", 100.0, 4096)
+    assert WorktreePoolService._usage == {"/src/app": 4}
+    assert WorktreePoolService._usage_known
+
+def test_load_ignores_missing_corrupt_and_outdated(snapshot_path):
+    assert not SnapshotService.load()
+
+    snapshot_path.parent.mkdir(parents=True)
+    snapshot_path.write_text("{not json")
+    assert not SnapshotService.load()
+
+    snapshot_path.write_text(json.dumps({"version": 0, "sessions": [{"name": "gem-old"}]}))
+    assert not SnapshotService.load()
+    assert SnapshotService.stale_sessions() is None
+
+def test_worktrees_from_another_root_are_not_restored(snapshot_path):
+    snapshot_path.parent.mkdir(parents=True)
+    snapshot_path.write_text(json.dumps({"version": SnapshotService.VERSION, "sessions": [],
+                                         "worktree_root": "/elsewhere",
+                                         "worktrees": [{"project": "a", "name": "b", "path": "/elsewhere/a/b"}]}))
+    assert SnapshotService.load()
+    assert WorktreeService._entries == {}
+
+def test_reconcile_stops_serving_snapshot_and_saves(snapshot_path):
+    SnapshotService._sessions = [{"name": "gem-gone", "stale": True}]
+    live = [{"name": "gem-live"}]
+    with patch("app.services.snapshot.WorktreeService.refresh") as mock_refresh, \
+         patch("app.services.snapshot.DiscoveryService.get_sessions", return_value=live):
+        SnapshotService.reconcile()
+
+    mock_refresh.assert_called_once_with(force=True)
+    assert SnapshotService.stale_sessions() is None
+    assert SnapshotService.status()["stale"] is False
+    assert json.loads(snapshot_path.read_text())["sessions"] == live
+
+def test_reconcile_serves_live_sessions_before_inventory_walk(snapshot_path):
+    """The stale snapshot is dropped before the (slow) worktree size walk starts."""
+    SnapshotService._sessions = [{"name": "gem-gone", "stale": True}]
+    seen = []
+    with patch("app.services.snapshot.WorktreeService.refresh",
+               side_effect=lambda **kw: seen.append(SnapshotService.stale_sessions())), \
+         patch("app.services.snapshot.DiscoveryService.get_sessions", return_value=[]):
+        SnapshotService.reconcile()
+
+    assert seen == [None]
+
+def test_start_loads_without_reconciling(snapshot_path, mocker):
+    """Reconcile is deferred with the background services; start() only loads."""
+    snapshot_path.parent.mkdir(parents=True)
+    snapshot_path.write_text(json.dumps({"version": SnapshotService.VERSION, "sessions": [{"name": "gem-a"}]}))
+    mocker.patch("app.services.snapshot.ShutdownService.register_flush")
+    reconciled = threading.Event()
+    reconcile = mocker.patch.object(SnapshotService, "reconcile", side_effect=reconciled.set)
+
+    SnapshotService.start()
+    assert SnapshotService.stale_sessions() == [{"name": "gem-a", "stale": True}]
+    reconcile.assert_not_called()
+
+    SnapshotService.start_reconcile()
+    assert reconciled.wait(5)
+
+def test_save_failure_is_logged_not_raised(monkeypatch, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(Config, "HUB_SNAPSHOT_PATH", str(blocker / "snapshot.json"))
+    SnapshotService.save([])
+    assert SnapshotService.status()["saved_at"] is None
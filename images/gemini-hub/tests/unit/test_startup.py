@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+import socket
+import threading
+import subprocess
+from unittest.mock import MagicMock
+from app import create_app
+from app.services.startup import StartupService
+
+# Time from process start until the app object exists (imports + create_app).
+# Measured around 0.3s; the margin absorbs slow CI runners, not new eager work.
+BOOT_BUDGET_MS = 1500
+
+HUB_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _boot_report():
+    """Imports run.py in a fresh interpreter with profiling on and returns the startup report."""
+    code = (
+        "import json, runpy; runpy.run_path('run.py', run_name='boot');"
+        "from app.services.startup import StartupService;"
+        "import threading; report = StartupService.report();"
+        "report['threads'] = threading.active_count(); print(json.dumps(report))"
+    )
+    env = dict(os.environ, HUB_STARTUP_PROFILE="true", PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, "-c", code], cwd=HUB_ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_boot_within_budget():
+    """Regression gate for the Hub boot path: no background work, bounded import cost."""
+    report = _boot_report()
+    phases = {p["phase"]: p["at_ms"] for p in report["phases"]}
+    assert phases["create_app"] <= BOOT_BUDGET_MS, report["modules"][:10]
+    # Background services are only started once the server answers, in __main__
+    assert report["threads"] == 1
+
+    modules = {m["module"]: m for m in report["modules"]}
+    assert "app.api.routes" in modules
+    # Self times partition the cumulative time of the top-level hub imports
+    assert sum(m["self_ms"] for m in modules.values()) <= phases["create_app"]
+
+def test_create_app_starts_no_threads():
+    before = threading.active_count()
+    create_app()
+    assert threading.active_count() == before
+
+def test_start_background_waits_for_the_server():
+    StartupService.clear()
+    first = MagicMock()
+    failing = MagicMock(side_effect=RuntimeError("boom"))
+    last = MagicMock()
+
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    thread = StartupService.start_background([first, failing, last], port, delay=0)
+    thread.join(0.3)
+    # Bound but not listening: nothing accepts connections yet
+    first.assert_not_called()
+
+    server.listen()
+    thread.join(5)
+    server.close()
+
+    # A failing service does not keep the others from starting
+    first.assert_called_once()
+    last.assert_called_once()
+    assert [p["phase"] for p in StartupService.report()["phases"]] == ["serving", "background"]
+    StartupService.clear()
+
+def test_start_background_gives_up_waiting():
+    StartupService.clear()
+    service = MagicMock()
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+        StartupService.start_background([service], port, delay=0, timeout=0.1).join(5)
+    service.assert_called_once()
+    assert [p["phase"] for p in StartupService.report()["phases"]] == ["background"]
+    StartupService.clear()
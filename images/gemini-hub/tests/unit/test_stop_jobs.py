@@ -0,0 +1,49 @@
+import threading
+import pytest
+from app.config import Config
+from app.services.stop_jobs import StopJobService
+
+@pytest.fixture(autouse=True)
+def _executor(mocker):
+    mocker.patch.object(Config, "HUB_STOP_CONCURRENCY", 4)
+    StopJobService._executor = None
+    yield
+    StopJobService._executor = None
+
+def test_stops_run_concurrently(mocker):
+    """All stops are in flight at once: each waits for the others at the barrier."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def stop(session_id, grace):
+        barrier.wait()
+        if session_id == "gem-c-cli-3":
+            return {"status": "error", "session_id": session_id, "error": "No such container"}
+        return {"status": "success", "session_id": session_id}
+    mocker.patch("app.services.stop_jobs.SessionService.stop_container", side_effect=stop)
+
+    job = StopJobService.start(["gem-a-cli-1", "gem-b-cli-2", "gem-c-cli-3", "gem-a-cli-1"], grace=5)
+    assert job.wait(5)
+
+    summary = job.to_dict()
+    assert summary["status"] == "done"
+    assert (summary["total"], summary["stopped"], summary["failed"]) == (3, 2, 1)
+    assert summary["results"]["gem-c-cli-3"]["error"] == "No such container"
+    assert StopJobService.get(job.id) is job
+
+def test_grace_is_passed_and_exceptions_are_results(mocker):
+    stop = mocker.patch("app.services.stop_jobs.SessionService.stop_container", side_effect=RuntimeError("boom"))
+    job = StopJobService.start(["gem-a-cli-1"], grace=42)
+    assert job.wait(5)
+    stop.assert_called_once_with("gem-a-cli-1", 42)
+    assert job.to_dict()["results"]["gem-a-cli-1"] == {"status": "error", "session_id": "gem-a-cli-1", "error": "boom"}
+
+def test_invalid_ids_are_rejected_before_stopping(mocker):
+    stop = mocker.patch("app.services.stop_jobs.SessionService.stop_container")
+    with pytest.raises(PermissionError):
+        StopJobService.start(["gem-a-cli-1", "postgres"], grace=5)
+    stop.assert_not_called()
+
+def test_empty_selection_is_done_immediately():
+    job = StopJobService.start([], grace=5)
+    assert job.done
+    assert job.to_dict()["total"] == 0
@@ -57,3 +57,43 @@ def test_get_status_generic_exception(mocker):
     mocker.patch("subprocess.run", side_effect=Exception("Status failed"))
     service = TailscaleService()
     assert service.get_sessions() == {}
+
+def test_local_status_falls_back_to_cli(mocker):
+    """A LocalAPI failure falls back to `tailscale status --json`."""
+    mocker.patch("os.path.exists", return_value=True)
+    conn = mocker.patch("app.services.tailscale.UnixHTTPConnection").return_value
+    conn.request.side_effect = OSError("refused")
+    mock_cli = mocker.patch("app.services.tailscale.TailscaleService.get_status", return_value={"Peer": {}})
+    assert TailscaleService.local_status() == {"Peer": {}}
+    mock_cli.assert_called_once()
+    conn.close.assert_called_once()
+
+def test_count_online_sessions(mocker):
+    mocker.patch("app.services.tailscale.TailscaleService.local_status", return_value={"Peer": {
+        "a": {"HostName": "gem-proj-cli-1", "Online": True},
+        "b": {"HostName": "gem-proj-cli-2", "Online": False},
+        "c": {"HostName": "laptop", "Online": True},
+    }})
+    assert TailscaleService.count_online_sessions() == 1
+
+def test_state_reports_bring_up(mocker, tmp_path):
+    """initialising until the backend runs, error if `tailscale up` failed, then ready for good."""
+    mocker.patch.object(TailscaleService, "_ready", False)
+    mocker.patch.object(TailscaleService, "UP_FAILED_PATH", str(tmp_path / "up-failed"))
+
+    mocker.patch("os.path.exists", return_value=False)
+    assert TailscaleService.state() == {"state": "disabled"}
+
+    mocker.patch("os.path.exists", return_value=True)
+    mock_status = mocker.patch("app.services.tailscale.TailscaleService.local_status",
+                               return_value={"BackendState": "Starting"})
+    assert TailscaleService.state() == {"state": "initialising"}
+
+    (tmp_path / "up-failed").write_text("invalid key\n")
+    assert TailscaleService.state() == {"state": "error", "error": "invalid key"}
+
+    mock_status.return_value = {"BackendState": "Running"}
+    assert TailscaleService.state() == {"state": "ready"}
+    mock_status.reset_mock()
+    assert TailscaleService.state() == {"state": "ready"}
+    mock_status.assert_not_called()
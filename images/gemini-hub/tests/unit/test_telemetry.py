@@ -0,0 +1,98 @@
+import json
+import time
+import threading
+import http.server
+import socketserver
+import pytest
+from app.config import Config
+from app.models.session import GeminiSession
+from app.services.telemetry import TelemetryService
+
+def _sample(cpu, system, rx=0, usage=300 * 2**20, inactive=100 * 2**20):
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": cpu}, "system_cpu_usage": system, "online_cpus": 4},
+        "precpu_stats": {"cpu_usage": {"total_usage": 0}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": usage, "limit": 2**30, "stats": {"inactive_file": inactive}},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": 10}, "tailscale0": {"rx_bytes": 5, "tx_bytes": 5}},
+    }
+
+class _FakeStatsDaemon(http.server.BaseHTTPRequestHandler):
+    """Lists one session and streams two stats samples for it, then the container 'stops'."""
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        if self.path.startswith("/containers/json"):
+            self.wfile.write(json.dumps([{"Id": "c1", "Names": ["/gem-app-cli-a1"], "Created": time.time() - 90}]).encode())
+            return
+        for rx in (100, 200):
+            self.wfile.write((json.dumps(_sample(50, 1000, rx=rx)) + "\n").encode())
+            self.wfile.flush()
+        # Hold the stream until the test has read the snapshot
+        _FakeStatsDaemon.release.wait(5)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(autouse=True)
+def _clear():
+    TelemetryService.clear()
+    yield
+    TelemetryService.clear()
+
+@pytest.fixture
+def daemon(tmp_path, mocker):
+    _FakeStatsDaemon.release = threading.Event()
+    sock = str(tmp_path / "docker.sock")
+    server = socketserver.ThreadingUnixStreamServer(sock, _FakeStatsDaemon)
+    server.get_request = lambda: (server.socket.accept()[0], ("local", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mocker.patch.object(Config, "DOCKER_SOCKET", sock)
+    yield _FakeStatsDaemon
+    _FakeStatsDaemon.release.set()
+    server.shutdown()
+    server.server_close()
+
+def test_summarize_matches_docker_stats_formula():
+    summary = TelemetryService.summarize(_sample(cpu=50, system=1000, rx=100))
+    assert summary == {
+        "cpu_percent": 20.0,  # 50/1000 of the host * 4 CPUs
+        "memory_usage": 200 * 2**20,  # usage minus reclaimable page cache
+        "memory_limit": 2**30,
+        "net_rx_bytes": 105,
+        "net_tx_bytes": 15,
+    }
+    # First sample of a stream has no previous CPU reading
+    assert TelemetryService.summarize({})["cpu_percent"] == 0.0
+
+def test_one_stream_per_session_feeds_the_model(daemon):
+    TelemetryService.sync()
+    TelemetryService.sync()  # Already subscribed: no second stream
+    assert [t.name for t in threading.enumerate()].count("telemetry-gem-app-cli-a1") == 1
+
+    deadline = time.time() + 5
+    while (TelemetryService.snapshot("gem-app-cli-a1") or {}).get("net_rx_bytes") != 205:
+        assert time.time() < deadline, "no stats sample received"
+        time.sleep(0.01)
+
+    session = GeminiSession.from_name("gem-app-cli-a1")
+    TelemetryService.apply(session)
+    data = session.to_dict()
+    assert data["cpu_percent"] == 20.0
+    assert data["memory_usage"] == 200 * 2**20
+    assert 89 <= data["uptime"] <= 91
+    assert TelemetryService.latest("gem-app-cli-a1")["networks"]["eth0"]["rx_bytes"] == 200
+    assert TelemetryService.latest("gem-app-cli-a1", max_age=-1) is None
+
+    # The stream ends with the container: the subscription is dropped
+    daemon.release.set()
+    deadline = time.time() + 5
+    while TelemetryService.snapshot("gem-app-cli-a1") is not None:
+        assert time.time() < deadline, "subscription not dropped"
+        time.sleep(0.01)
+
+def test_apply_without_sample_leaves_fields_empty():
+    session = GeminiSession.from_name("gem-app-cli-a1")
+    TelemetryService.apply(session)
+    assert session.to_dict()["cpu_percent"] is None
@@ -0,0 +1,39 @@
+import pytest
+from app.services.toolbox_args import parse
+
+ENV = {"HOME": "/home/me", "GEMINI_REMOTE_KEY": "tskey-env"}
+
+def run(argv, cwd="/src"):
+    return parse(argv, cwd, ENV, lambda name, compute: compute())
+
+def test_parses_launch_options():
+    opts = run(["--detached", "--bash", "--no-docker", "--remote", "tskey-1", "--worktree", "--name", "feat/x",
+                "-v", "/a:/a", "--docker-args", "--init -m 1g\nignored", "--", "--preview", "-p", "task"])
+
+    assert opts.use_bash and opts.worktree and opts.remote_mode and not opts.enable_docker
+    assert opts.tailscale_key == "tskey-1"
+    assert opts.worktree_name == "feat/x"
+    assert opts.extra == ["--volume", "/a:/a", "--init", "-m", "1g"]
+    assert opts.args == ["--preview", "-p", "task"]
+    assert opts.project_dir == "/src"
+    assert opts.host_conf_dir == "/home/me/.gemini"
+
+def test_profile_extra_args_come_first(tmp_path):
+    (tmp_path / "extra-args").write_text("# defaults\n--preview --image 'my img'\n")
+    opts = run(["--profile", str(tmp_path), "--detached"])
+
+    assert opts.variant == "preview"
+    assert opts.override_image == "my img"
+    assert opts.profile_mode
+    assert opts.logs == [f">> Loading profile args from {tmp_path}/extra-args"]
+
+@pytest.mark.parametrize("argv, error, message", [
+    (["--config", "a", "--profile", "b", "--detached"], ValueError, "simultaneously"),
+    (["--detached", "--name"], ValueError, "requires a value"),
+    (["--detached", "--remote", "--no-tmux"], ValueError, "incompatible"),
+    (["--bash"], NotImplementedError, "terminal"),
+    (["--detached", "stop"], NotImplementedError, "not a launch"),
+])
+def test_errors(argv, error, message):
+    with pytest.raises(error, match=message):
+        run(argv)
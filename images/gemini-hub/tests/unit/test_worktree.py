@@ -0,0 +1,138 @@
+import os
+import shutil
+import pytest
+from unittest.mock import MagicMock
+from app.services.worktree import WorktreeService
+from app.config import Config
+
+@pytest.fixture
+def worktree_root(tmp_path, mocker):
+    """Creates a real root/{project}/{worktree} layout and points Config at it."""
+    root = tmp_path / "worktrees"
+    (root / "proj" / "feature").mkdir(parents=True)
+    (root / "proj" / "exploration-1").mkdir(parents=True)
+    (root / "proj" / "feature" / "file.txt").write_text("x" * 4096)
+    (root / "stray.txt").write_text("not a project")
+    for name in ("feature", "exploration-1"):
+        admin = tmp_path / "repo" / ".git" / "worktrees" / name
+        admin.mkdir(parents=True)
+        (admin / "HEAD").write_text("ref: refs/heads/feature\n")
+        (root / "proj" / name / ".git").write_text(f"gitdir: {admin}\n")
+
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch.object(Config, "HUB_WORKTREE_INVENTORY_TTL", 30)
+    mocker.patch.object(Config, "HUB_WORKTREE_SIZE_TTL", 900)
+    return root
+
+def mock_git(cmd, **kwargs):
+    """Classifies 'feature' as a branch worktree and anything else as headless."""
+    if cmd[2].endswith("feature"):
+        return MagicMock(returncode=0, stdout="refs/heads/feature\n")
+    return MagicMock(returncode=1, stdout="")
+
+def test_iter_worktrees_layout(worktree_root):
+    """Only directories two levels deep are reported as worktrees."""
+    found = [(p, n) for p, n, _ in WorktreeService.iter_worktrees(str(worktree_root))]
+    assert found == [("proj", "exploration-1"), ("proj", "feature")]
+
+def test_iter_worktrees_missing_root(tmp_path):
+    assert list(WorktreeService.iter_worktrees(str(tmp_path / "missing"))) == []
+
+def test_classify_states(mocker):
+    run = mocker.patch("subprocess.run")
+    run.return_value = MagicMock(returncode=0, stdout="refs/heads/feat/x\n")
+    assert WorktreeService.classify("/wt") == ("branch", "feat/x")
+
+    run.return_value = MagicMock(returncode=1, stdout="")
+    assert WorktreeService.classify("/wt") == ("headless", None)
+
+    run.return_value = MagicMock(returncode=128, stdout="")
+    assert WorktreeService.classify("/wt") == ("orphan", None)
+
+def test_classify_exception_is_orphan(mocker):
+    mocker.patch("subprocess.run", side_effect=Exception("git missing"))
+    assert WorktreeService.classify("/wt") == ("orphan", None)
+
+def test_dir_size_counts_hardlinks_once(tmp_path):
+    data = tmp_path / "data.bin"
+    data.write_bytes(b"x" * 8192)
+    single = WorktreeService.dir_size(str(tmp_path))
+    os.link(data, tmp_path / "link.bin")
+    assert WorktreeService.dir_size(str(tmp_path)) == single
+
+def test_refresh_builds_entries(worktree_root, mocker):
+    mocker.patch("subprocess.run", side_effect=mock_git)
+    entries = WorktreeService.refresh(force=True)
+
+    feature = entries[str(worktree_root / "proj" / "feature")]
+    assert (feature.state, feature.branch) == ("branch", "feature")
+    assert feature.size_bytes >= 4096
+
+def test_refresh_is_incremental(worktree_root, mocker):
+    """Unchanged worktrees are not re-classified on the next refresh."""
+    run = mocker.patch("subprocess.run", side_effect=mock_git)
+    WorktreeService.refresh(force=True)
+    first_calls = run.call_count
+
+    WorktreeService.refresh(force=True)
+    assert run.call_count == first_calls
+
+def test_refresh_reclassifies_on_checkout(worktree_root, tmp_path, mocker):
+    """A checkout rewrites the gitdir HEAD but not the worktree folder."""
+    run = mocker.patch("subprocess.run", side_effect=mock_git)
+    WorktreeService.refresh(force=True)
+    calls = run.call_count
+    target = worktree_root / "proj" / "feature"
+
+    os.utime(target, (1000, 1000))
+    WorktreeService.refresh(force=True)
+    assert run.call_count == calls
+
+    generation = WorktreeService.generation()
+    os.utime(tmp_path / "repo" / ".git" / "worktrees" / "feature" / "HEAD", (2000, 2000))
+    WorktreeService.refresh(force=True)
+    assert run.call_count == calls + 1
+    assert run.call_args[0][0][2] == str(target)
+    assert WorktreeService.generation() == generation + 1
+
+def test_refresh_served_from_cache_within_ttl(worktree_root, mocker):
+    mocker.patch("subprocess.run", side_effect=mock_git)
+    WorktreeService.refresh(force=True)
+    (worktree_root / "proj" / "new-one").mkdir()
+
+    assert str(worktree_root / "proj" / "new-one") not in WorktreeService.refresh()
+
+def test_refresh_drops_removed_worktrees(worktree_root, mocker):
+    mocker.patch("subprocess.run", side_effect=mock_git)
+    WorktreeService.refresh(force=True)
+    shutil.rmtree(worktree_root / "proj" / "exploration-1")
+
+    assert str(worktree_root / "proj" / "exploration-1") not in WorktreeService.refresh(force=True)
+
+def test_forget_bumps_generation(worktree_root, mocker):
+    mocker.patch("subprocess.run", side_effect=mock_git)
+    WorktreeService.refresh(force=True)
+    generation = WorktreeService.generation()
+
+    WorktreeService.forget(str(worktree_root / "proj" / "feature"))
+    assert WorktreeService.generation() == generation + 1
+
+def test_get_inventory_links_sessions(worktree_root, mocker):
+    from app.services.session_index import SessionIndex
+    feature = str(worktree_root / "proj" / "feature")
+    index = SessionIndex({feature: ["gem-proj-feature-geminicli-1"], "/home/u/.gemini": ["gem-proj-feature-geminicli-1"]})
+
+    mocker.patch("subprocess.run", side_effect=mock_git)
+    mocker.patch("app.services.worktree.SessionIndexService.get", return_value=index)
+    inventory = WorktreeService.get_inventory(force=True)
+
+    by_name = {w["name"]: w for w in inventory}
+    assert by_name["feature"]["sessions"] == ["gem-proj-feature-geminicli-1"]
+    assert by_name["exploration-1"]["sessions"] == []
+
+def test_get_inventory_skips_index_when_empty(tmp_path, mocker):
+    """No Docker calls are made when there are no worktrees to link."""
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(tmp_path))
+    mock_get = mocker.patch("app.services.worktree.SessionIndexService.get")
+    assert WorktreeService.get_inventory(force=True) == []
+    mock_get.assert_not_called()
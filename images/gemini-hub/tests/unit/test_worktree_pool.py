@@ -0,0 +1,148 @@
+import os
+import subprocess
+import pytest
+from app.services.worktree_pool import WorktreePoolService
+from app.services.worktree import WorktreeService
+from app.config import Config
+
+def git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+@pytest.fixture
+def pool(tmp_path, mocker):
+    """A real repository 'My_App' with a pool of 2 entries rooted in tmp_path."""
+    repo = tmp_path / "My_App"
+    repo.mkdir()
+    git("init", "-q", cwd=repo)
+    (repo / "README.md").write_text("v1")
+    git("add", ".", cwd=repo)
+    git("-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "init", cwd=repo)
+
+    root = tmp_path / "worktrees"
+    mocker.patch.object(Config, "WORKTREE_ROOT", str(root))
+    mocker.patch.object(Config, "HUB_WORKTREE_POOL_SIZE", 2)
+    mocker.patch.object(Config, "HUB_WORKTREE_POOL_PROJECTS", 3)
+    mocker.patch.object(Config, "HUB_WORKTREE_PROVISION", "off")
+    mocker.patch.object(WorktreePoolService, "_usage", {str(repo): 1})
+    mocker.patch.object(WorktreePoolService, "_usage_known", True)
+    return repo, root
+
+def test_project_folder_matches_toolbox():
+    assert WorktreeService.project_folder("/src/My_App.v2") == "my-app-v2"
+    assert WorktreeService.branch_folder("feat/new ui") == "feat-newui"
+
+def test_refill_creates_hidden_entries(pool):
+    repo, root = pool
+    assert WorktreePoolService.refill() == 2
+
+    entries = WorktreePoolService.entries(str(repo), str(repo))
+    assert len(entries) == 2
+    assert all(os.path.basename(e).startswith(".pool-") for e in entries)
+    # Pool entries are not reported as regular worktrees
+    assert list(WorktreeService.iter_worktrees(str(root))) == []
+
+    # A full pool is not rebuilt
+    assert WorktreePoolService.refill() == 0
+
+def test_claim_anonymous_moves_entry(pool):
+    repo, root = pool
+    WorktreePoolService.refill()
+
+    path = WorktreePoolService.claim(str(repo))
+    assert os.path.basename(path).startswith("exploration-")
+    assert os.path.dirname(path) == str(root / "my-app")
+    assert open(os.path.join(path, "README.md")).read() == "v1"
+    assert len(WorktreePoolService.entries(str(repo), str(repo))) == 1
+
+def test_claim_syncs_to_latest_head(pool):
+    repo, _ = pool
+    WorktreePoolService.refill()
+    (repo / "README.md").write_text("v2")
+    git("-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qam", "v2", cwd=repo)
+
+    path = WorktreePoolService.claim(str(repo))
+    assert open(os.path.join(path, "README.md")).read() == "v2"
+
+def test_claim_runs_git_outside_the_lock(pool, mocker):
+    """Claims only hold the lock to reserve an entry; other pool users skip it meanwhile."""
+    repo, _ = pool
+    WorktreePoolService.refill()
+    git_run = WorktreePoolService._git
+    seen = []
+
+    def git(args, timeout=10):
+        if "move" in args:
+            seen.append((WorktreePoolService._lock.locked(), len(WorktreePoolService.entries(str(repo), str(repo)))))
+        return git_run(args, timeout)
+
+    mocker.patch.object(WorktreePoolService, "_git", side_effect=git)
+    assert WorktreePoolService.claim(str(repo))
+    assert seen == [(False, 1)]
+    assert WorktreePoolService._busy == set()
+
+def test_claim_named_creates_branch(pool):
+    repo, _ = pool
+    WorktreePoolService.refill()
+
+    path = WorktreePoolService.claim(str(repo), "feat/pool")
+    assert os.path.basename(path) == "feat-pool"
+    head = subprocess.run(["git", "-C", path, "symbolic-ref", "HEAD"], capture_output=True, text=True)
+    assert head.stdout.strip() == "refs/heads/feat/pool"
+
+def test_claim_named_skips_existing_branch(pool):
+    repo, _ = pool
+    WorktreePoolService.refill()
+    git("branch", "taken", cwd=repo)
+
+    assert WorktreePoolService.claim(str(repo), "taken") is None
+    assert len(WorktreePoolService.entries(str(repo), str(repo))) == 2
+
+def test_claim_empty_or_disabled(pool, mocker):
+    repo, _ = pool
+    assert WorktreePoolService.claim(str(repo)) is None
+
+    mocker.patch.object(Config, "HUB_WORKTREE_POOL_SIZE", 0)
+    assert WorktreePoolService.claim(str(repo)) is None
+
+def test_reclaim_removes_unwanted_entries(pool, mocker):
+    repo, root = pool
+    WorktreePoolService.refill()
+    leftover = root / "my-app" / ".pool-tmp-dead"
+    leftover.mkdir()
+
+    # Staging leftovers go, wanted entries stay
+    assert WorktreePoolService.reclaim(str(root)) == 1
+    assert len(WorktreePoolService.entries(str(repo), str(repo))) == 2
+
+    # Project dropped out of the pool: everything is reclaimed
+    mocker.patch.object(WorktreePoolService, "_usage", {})
+    assert WorktreePoolService.reclaim(str(root)) == 2
+    assert os.listdir(root / "my-app") == []
+
+def test_reclaim_keeps_ready_entries_until_usage_is_known(pool, mocker):
+    """After a restart without a snapshot, ready entries survive until a claim ranks projects."""
+    repo, root = pool
+    WorktreePoolService.refill()
+    (root / "my-app" / ".pool-tmp-dead").mkdir()
+    mocker.patch.object(WorktreePoolService, "_usage", {})
+    mocker.patch.object(WorktreePoolService, "_usage_known", False)
+
+    assert WorktreePoolService.reclaim(str(root)) == 1
+    assert len(WorktreePoolService.entries(str(repo), str(repo))) == 2
+
+    WorktreePoolService.restore({str(repo): 3})
+    assert WorktreePoolService.reclaim(str(root)) == 0
+
+def test_reclaim_spares_entry_built_during_the_pass(pool, mocker):
+    """An entry renamed to its final path after `keep` was computed is not reclaimed."""
+    repo, root = pool
+    mocker.patch.object(WorktreePoolService, "_built", set())
+
+    def build_during_keep():
+        # A refill lands while reclaim computes `keep` (seen as empty)
+        WorktreePoolService._build(str(repo), str(repo))
+        return []
+
+    mocker.patch.object(WorktreePoolService, "_projects", side_effect=build_during_keep)
+    assert WorktreePoolService.reclaim(str(root)) == 0
+    assert len(WorktreePoolService.entries(str(repo), str(repo))) == 1
@@ -95,6 +95,118 @@ EOF
     assert_success
 }
 
+@test "Hub main: worktree provisioning env propagation" {
+    source_hub
+    export GEMINI_WORKTREE_PROVISION=reflink
+    export GEMINI_WORKTREE_PROVISION_DIRS="node_modules .venv"
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "GEMINI_WORKTREE_PROVISION=reflink" "$MOCK_DOCKER_LOG"
+    assert_success
+    run grep "GEMINI_WORKTREE_PROVISION_DIRS=node_modules .venv" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: worktree pool size env propagation" {
+    source_hub
+    export HUB_WORKTREE_POOL_SIZE=2
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "HUB_WORKTREE_POOL_SIZE=2" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: launch engine env propagation" {
+    source_hub
+    export HUB_LAUNCH_ENGINE=native
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "HUB_LAUNCH_ENGINE=native" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: image pre-pull env propagation" {
+    source_hub
+    export HUB_IMAGE_PREPULL=false
+    export HUB_IMAGE_PREPULL_PREVIEW=false
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "HUB_IMAGE_PREPULL=false" "$MOCK_DOCKER_LOG"
+    assert_success
+    run grep "HUB_IMAGE_PREPULL_PREVIEW=false" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: admission limits env propagation" {
+    source_hub
+    export HUB_MAX_SESSIONS=4
+    export HUB_SESSION_MEMORY_MB=2048
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "HUB_MAX_SESSIONS=4" "$MOCK_DOCKER_LOG"
+    assert_success
+    run grep "HUB_SESSION_MEMORY_MB=2048" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: idle session policy env propagation" {
+    source_hub
+    export HUB_IDLE_STOP_CLI=7200
+    export HUB_IDLE_STOP_BASH=3600
+    export HUB_IDLE_STOP_TASK=1800
+    export HUB_IDLE_ACTION=pause
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "HUB_IDLE_STOP_CLI=7200" "$MOCK_DOCKER_LOG"
+    assert_success
+    run grep "HUB_IDLE_STOP_BASH=3600" "$MOCK_DOCKER_LOG"
+    assert_success
+    run grep "HUB_IDLE_STOP_TASK=1800" "$MOCK_DOCKER_LOG"
+    assert_success
+    run grep "HUB_IDLE_ACTION=pause" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: shutdown timeout env propagation" {
+    source_hub
+    export HUB_SHUTDOWN_TIMEOUT=600
+
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep "HUB_SHUTDOWN_TIMEOUT=600" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
+@test "Hub main: stop timeout covers the shutdown drain" {
+    source_hub
+    mock_docker
+    run main --key tskey-123
+    assert_success
+
+    run grep -- "--stop-timeout 40" "$MOCK_DOCKER_LOG"
+    assert_success
+}
+
 @test "Hub main: dynamic branch tagging" {
     source_hub
     # Mock git to return a feature branch
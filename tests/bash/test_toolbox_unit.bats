@@ -297,6 +297,14 @@ EOF
     assert_success
 }
 
+@test "setup_worktree: anonymous exploration honors GEMINI_WORKTREE_ID" {
+    source_toolbox
+    mock_git
+    GEMINI_WORKTREE_ID="ab12cd34" run setup_worktree "myproj" "" "."
+    assert_success
+    assert_output --partial "myproj/exploration-ab12cd34"
+}
+
 @test "setup_worktree: existing branch detection" {
     source_toolbox
     # Mock git to return success for show-ref
@@ -416,6 +424,25 @@ EOF
     assert_success
 }
 
+@test "main: trace file records launch phases" {
+    source_toolbox
+    mock_docker
+    export GEMINI_TOOLBOX_TRACE_FILE="$TEST_TEMP_DIR/launch.trace"
+    run main --detached --bash
+    assert_success
+
+    run cut -d' ' -f1 "$GEMINI_TOOLBOX_TRACE_FILE"
+    assert_output "$(printf 'start\nimage\nrun\nports')"
+}
+
+@test "trace_phase: no-op without a trace file" {
+    source_toolbox
+    unset GEMINI_TOOLBOX_TRACE_FILE
+    run trace_phase "start"
+    assert_success
+    assert_output ""
+}
+
 @test "setup_worktree: reuse existing worktree directory" {
     source_toolbox
     mock_git
@@ -659,3 +686,70 @@ EOF
     run grep "gem-.*-fix-my-bug-bash-" "$MOCK_DOCKER_LOG"
     assert_success
 }
+
+# Mock git where only node_modules is ignored
+mock_git_ignored() {
+    cat <<EOF2 > "$TEST_TEMP_DIR/bin/git"
+#!/bin/bash
+if [[ "\$*" == *"check-ignore -q node_modules"* ]]; then exit 0; fi
+if [[ "\$*" == *"check-ignore"* ]]; then exit 1; fi
+exit 0
+EOF2
+    chmod +x "$TEST_TEMP_DIR/bin/git"
+    hash -r
+}
+
+@test "provision_worktree: clones ignored dependency folders" {
+    source_toolbox
+    mock_git_ignored
+    local template="$TEST_TEMP_DIR/main" wt="$TEST_TEMP_DIR/wt"
+    mkdir -p "$template/node_modules/pkg" "$template/build" "$wt"
+    echo "dep" > "$template/node_modules/pkg/index.js"
+
+    GEMINI_WORKTREE_PROVISION=copy GEMINI_WORKTREE_PROVISION_DIRS="node_modules build" \
+        run provision_worktree "$template" "$wt"
+    assert_success
+
+    # Ignored folder is cloned, tracked (non-ignored) folder is left to the checkout
+    assert [ -f "$wt/node_modules/pkg/index.js" ]
+    assert [ ! -e "$wt/build" ]
+    run ls -a "$wt"
+    refute_output --partial ".provisioning"
+}
+
+@test "provision_worktree: hardlink mode shares inodes" {
+    source_toolbox
+    mock_git_ignored
+    local template="$TEST_TEMP_DIR/main" wt="$TEST_TEMP_DIR/wt"
+    mkdir -p "$template/node_modules" "$wt"
+    echo "dep" > "$template/node_modules/index.js"
+
+    GEMINI_WORKTREE_PROVISION=hardlink GEMINI_WORKTREE_PROVISION_DIRS="node_modules" \
+        run provision_worktree "$template" "$wt"
+    assert_success
+    assert [ "$template/node_modules/index.js" -ef "$wt/node_modules/index.js" ]
+}
+
+@test "provision_worktree: disabled by default and keeps existing folders" {
+    source_toolbox
+    mock_git_ignored
+    local template="$TEST_TEMP_DIR/main" wt="$TEST_TEMP_DIR/wt"
+    mkdir -p "$template/node_modules" "$wt"
+
+    run provision_worktree "$template" "$wt"
+    assert_success
+    assert [ ! -e "$wt/node_modules" ]
+
+    mkdir -p "$wt/node_modules"
+    echo "local" > "$wt/node_modules/own.js"
+    GEMINI_WORKTREE_PROVISION=copy GEMINI_WORKTREE_PROVISION_DIRS="node_modules" \
+        run provision_worktree "$template" "$wt"
+    assert [ -f "$wt/node_modules/own.js" ]
+}
+
+@test "provision_worktree: unknown mode warns and skips" {
+    source_toolbox
+    GEMINI_WORKTREE_PROVISION=magic run provision_worktree "$TEST_TEMP_DIR" "$TEST_TEMP_DIR/wt"
+    assert_success
+    assert_output --partial "Unknown GEMINI_WORKTREE_PROVISION mode 'magic'"
+}